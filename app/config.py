@@ -17,10 +17,127 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
 
+    # Number of codex app-server processes in the pool
+    pool_size: int = 1
+
     # Timeouts (in seconds)
     request_timeout: float = 300.0
     initialization_timeout: float = 30.0
 
+    # Crash recovery: backoff between respawns of a crash-looping process
+    restart_backoff_initial: float = 0.1
+    restart_backoff_max: float = 30.0
+    # Spawned, initialized processes kept ready to replace a failed one
+    standby_processes: int = 0
+
+    # Watchdog: liveness probes and recycling of long-lived processes
+    watchdog_interval: float = 15.0  # seconds between probes; 0 = disabled
+    watchdog_probe_timeout: float = 5.0  # slower probe round trips count as failed
+    watchdog_max_failures: int = 3  # consecutive failed probes before recycling
+    recycle_max_rss_mb: int = 0  # 0 = no memory limit
+    recycle_max_turns: int = 0  # turns served per process; 0 = no limit
+    recycle_drain_timeout: float = 300.0  # wait for running turns before recycling
+
+    # Turns queued per thread behind the running one; 0 = answer 409 while busy
+    thread_turn_queue_depth: int = 4
+
+    # Tenant scheduling of turn/start (tenant = mapped API key, else tenant header, else "default")
+    tenant_header: str = "X-Tenant-Id"  # "" = only API keys name tenants
+    tenant_api_keys: dict[str, str] = {}  # X-API-Key or Bearer token -> tenant
+    tenant_policies: dict[str, dict] = {}  # tenant -> overrides of the tenant_* defaults below
+    tenant_weight: float = 1.0  # share of admissions under contention
+    tenant_rate: float = 0.0  # turn/start per second; 0 = unlimited
+    tenant_burst: int = 10  # turn/start calls allowed at once above the rate
+    tenant_max_running: int = 0  # running turns per tenant; 0 = unlimited
+    tenant_max_queued: int = 100  # turns waiting for admission per tenant
+    max_concurrent_turns: int = 0  # turns admitted at once across tenants; 0 = unlimited
+
+    # Asynchronous turn jobs
+    max_running_turns: int = 16  # concurrently running submitted turns
+    max_turn_jobs: int = 10000  # queued + running + retained jobs
+    turn_job_ttl: float = 3600.0  # seconds a finished job is kept
+    turn_job_max_wait: float = 60.0  # longest long-poll on GET /api/turn/jobs/{id}
+
+    # Approval requests from the app-server
+    approval_default: str = "decline"  # "accept", "decline" or "ask" (interactive stream client)
+    approval_command_allowlist: list[str] = []  # command prefixes accepted, e.g. "git status"
+    approval_command_denylist: list[str] = []  # command prefixes always declined
+    approval_writable_roots: list[str] = []  # file changes inside these are accepted
+    approval_timeout: float = 60.0  # seconds to wait for an interactive answer before declining
+
+    # thread/read cache (0 disables)
+    thread_cache_size: int = 1024
+
+    # GET /api/threads index, seeded once from thread/list
+    thread_index_page_size: int = 200  # thread/list page size while seeding
+    thread_index_wait: float = 2.0  # seconds a request waits for the seed before calling thread/list
+
+    # TTLs (seconds) for memoized read-mostly app-server methods
+    method_cache_ttls: dict[str, float] = {
+        "skills/list": 300.0,
+        "model/list": 600.0,
+        "config/read": 60.0,
+    }
+
+    # Raw JSON-RPC passthrough (/api/rpc/batch and /ws); "*" allows any method
+    rpc_allowed_methods: list[str] = [
+        "thread/start",
+        "thread/resume",
+        "thread/fork",
+        "thread/read",
+        "thread/list",
+        "thread/loaded/list",
+        "thread/archive",
+        "thread/unarchive",
+        "thread/rollback",
+        "turn/start",
+        "turn/interrupt",
+        "model/list",
+        "skills/list",
+        "config/read",
+    ]
+    rpc_batch_max_calls: int = 1000
+
+    # Memory budget for items collected into turn/start results; 0 max chars disables
+    item_field_max_chars: int = 256 * 1024  # longer string fields are moved to the blob store
+    turn_item_budget: int = 64 * 1024 * 1024  # characters kept inline per turn before smaller fields move too
+    item_preview_chars: int = 4096  # head of a moved field kept inline
+    blob_dir: str = ""  # "" = private temp directory removed at shutdown
+    blob_ttl: float = 3600.0  # seconds a blob stays readable
+    blob_max_disk_mb: int = 2048  # oldest blobs dropped above this; 0 = truncate without storing
+
+    # SQLite history of completed turns and items; empty = disabled
+    event_store_path: str = ""
+    event_store_batch_size: int = 500  # rows per write transaction
+    event_store_flush_interval: float = 0.5  # seconds between writes of a partial batch
+
+    # Routes answering with the raw app-server result instead of a validated model,
+    # by method (e.g. "thread/read"); ?passthrough=true|false overrides per request
+    passthrough_methods: list[str] = []
+    passthrough_validate: bool = False  # debug: still check passthrough results against the model
+
+    # Merging of small delta notifications on outbound streams (SSE and /ws)
+    delta_coalesce_ms: float = 20.0  # per-stream default; 0 = forward every delta
+    delta_coalesce_bytes: int = 4096  # flush a merged delta once it reaches this many UTF-8 bytes
+
+    # WebSocket gateway (/ws)
+    ws_max_inflight: int = 64  # concurrent calls per connection before reads pause
+    ws_send_queue: int = 4096  # queued outbound frames before a slow client is closed
+
+    # SSE turn streams (/api/turn/stream)
+    sse_send_queue: int = 4096  # queued events before a slow client's stream is ended
+
+    # stdio transport
+    json_codec: str = "auto"  # "auto" (orjson when installed), "orjson" or "json"
+    max_message_bytes: int = 0  # 0 = unbounded line length
+    read_chunk_bytes: int = 256 * 1024
+    stdin_queue_size: int = 1024  # frames buffered for the stdin writer
+    stdin_enqueue_timeout: float = 5.0  # wait for queue space; 0 = reject at once
+
+    # app-server stderr
+    stderr_buffer_lines: int = 1000  # lines kept per process for /api/debug/stderr
+    stderr_log_rate: float = 20.0  # lines per second forwarded to the log; 0 = none
+
     # Logging
     log_level: str = "INFO"
 
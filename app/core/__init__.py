@@ -1,4 +1,19 @@
-from .process_manager import ProcessManager
+from .process_manager import (
+    ProcessManager,
+    ProcessUnavailableError,
+    ProcessCrashedError,
+    StdinQueueFullError,
+)
 from .jsonrpc_client import JsonRpcClient
+from .process_pool import ProcessPool
+from . import metrics
 
-__all__ = ["ProcessManager", "JsonRpcClient"]
+__all__ = [
+    "ProcessManager",
+    "ProcessUnavailableError",
+    "ProcessCrashedError",
+    "StdinQueueFullError",
+    "JsonRpcClient",
+    "ProcessPool",
+    "metrics",
+]
@@ -0,0 +1,223 @@
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+import structlog
+
+from . import metrics
+
+logger = structlog.get_logger(__name__)
+
+
+class TurnAdmission:
+    """Bounded number of concurrently running turns with FIFO admission."""
+
+    def __init__(self, max_running: int):
+        if max_running < 1:
+            raise ValueError("max_running must be at least 1")
+        self._max_running = max_running
+        self._running = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def position(self, waiter: asyncio.Future) -> Optional[int]:
+        """Zero-based queue position of a waiter, or None once admitted."""
+        try:
+            return self._waiters.index(waiter)
+        except ValueError:
+            return None
+
+    def enqueue(self) -> asyncio.Future:
+        """Join the queue; the returned future resolves on admission."""
+        waiter = asyncio.get_event_loop().create_future()
+        if self._running < self._max_running and not self._waiters:
+            self._running += 1
+            waiter.set_result(None)
+        else:
+            self._waiters.append(waiter)
+        return waiter
+
+    async def acquire(self, waiter: Optional[asyncio.Future] = None) -> None:
+        """Wait for a running slot (optionally for an already enqueued waiter)."""
+        if waiter is None:
+            waiter = self.enqueue()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Admitted just as we were cancelled; hand the slot on
+                self.release()
+            else:
+                self._remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Free a running slot and admit the next waiter."""
+        self._running -= 1
+        while self._waiters and self._running < self._max_running:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._running += 1
+                waiter.set_result(None)
+
+    def _remove(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "max_running": self._max_running,
+            "running": self._running,
+            "queued": len(self._waiters),
+        }
+
+
+class ThreadBusyError(RuntimeError):
+    """A turn is already running on the thread and its queue is full."""
+
+
+class _ThreadSlot:
+    """The running turn of one thread and the callers queued behind it."""
+
+    def __init__(self):
+        self.turn_id: Optional[str] = None
+        self.completed_turn_id: Optional[str] = None
+        self.since = time.monotonic()
+        self.waiters: deque[tuple[asyncio.Future, float]] = deque()
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+
+class ThreadTurnQueue:
+    """Per-thread FIFO of ``turn/start`` callers.
+
+    One turn runs per thread at a time; up to ``max_queued`` more callers
+    wait in arrival order and the rest are rejected. A slot is held from
+    ``turn/start`` until the matching ``turn/completed``, or at most
+    ``hold_timeout`` seconds if that never arrives.
+    """
+
+    def __init__(self, max_queued: int, hold_timeout: float):
+        self._max_queued = max(max_queued, 0)
+        self._hold_timeout = hold_timeout
+        self._slots: dict[str, _ThreadSlot] = {}
+        self.rejected = 0
+
+    async def acquire(self, thread_id: str, timeout: Optional[float] = None) -> float:
+        """Wait until the thread is free; returns the seconds spent queued.
+
+        Raises:
+            ThreadBusyError: If the queue is full or ``timeout`` passes first.
+        """
+        slot = self._slots.get(thread_id)
+        if slot is None:
+            self._slots[thread_id] = _ThreadSlot()
+            metrics.turn_queue_wait.observe(0.0)
+            return 0.0
+
+        if len(slot.waiters) >= self._max_queued:
+            self.rejected += 1
+            raise ThreadBusyError(
+                f"Thread {thread_id} already has a running turn and {len(slot.waiters)} queued"
+            )
+
+        enqueued = time.monotonic()
+        waiter = asyncio.get_event_loop().create_future()
+        entry = (waiter, enqueued)
+        slot.waiters.append(entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done():
+                # Handed the slot just as we gave up; pass it on
+                self.release(thread_id)
+            else:
+                waiter.cancel()
+                slot.waiters.remove(entry)
+            if isinstance(e, asyncio.TimeoutError):
+                self.rejected += 1
+                raise ThreadBusyError(f"Timed out waiting for thread {thread_id} to finish its turn")
+            raise
+
+        waited = time.monotonic() - enqueued
+        metrics.turn_queue_wait.observe(waited)
+        return waited
+
+    def bind(self, thread_id: str, turn_id: str) -> None:
+        """Record the turn now holding the thread's slot."""
+        slot = self._slots.get(thread_id)
+        if slot is None:
+            return
+        if slot.completed_turn_id == turn_id:
+            # turn/completed overtook the turn/start response
+            self.release(thread_id)
+            return
+
+        slot.turn_id = turn_id
+        slot.expiry = asyncio.get_event_loop().call_later(
+            self._hold_timeout, self._expire, thread_id, turn_id
+        )
+
+    def turn_completed(self, thread_id: str, turn_id: str) -> None:
+        """Free the thread if ``turn_id`` is the turn holding it."""
+        slot = self._slots.get(thread_id)
+        if slot is None:
+            return
+        if slot.turn_id is None:
+            slot.completed_turn_id = turn_id
+        elif slot.turn_id == turn_id:
+            self.release(thread_id)
+
+    def release(self, thread_id: str) -> None:
+        """Hand the thread to the next queued caller, or free it."""
+        slot = self._slots.get(thread_id)
+        if slot is None:
+            return
+        if slot.expiry is not None:
+            slot.expiry.cancel()
+            slot.expiry = None
+        slot.turn_id = None
+        slot.completed_turn_id = None
+
+        while slot.waiters:
+            waiter, _ = slot.waiters.popleft()
+            if not waiter.done():
+                slot.since = time.monotonic()
+                waiter.set_result(None)
+                return
+        del self._slots[thread_id]
+
+    def _expire(self, thread_id: str, turn_id: str) -> None:
+        slot = self._slots.get(thread_id)
+        if slot is not None and slot.turn_id == turn_id:
+            logger.warning("Releasing thread held past the turn timeout", thread_id=thread_id, turn_id=turn_id)
+            slot.expiry = None
+            self.release(thread_id)
+
+    def state(self, thread_id: str) -> Optional[dict]:
+        """Running turn and queued callers of a thread, or None if it is idle."""
+        slot = self._slots.get(thread_id)
+        if slot is None:
+            return None
+        now = time.monotonic()
+        return {
+            "turn_id": slot.turn_id,
+            "running_for": now - slot.since,
+            "queued": [now - enqueued for _, enqueued in slot.waiters],
+        }
+
+    def stats(self) -> dict:
+        return {
+            "max_queued": self._max_queued,
+            "busy_threads": len(self._slots),
+            "queued": sum(len(slot.waiters) for slot in self._slots.values()),
+            "rejected": self.rejected,
+        }
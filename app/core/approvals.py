@@ -0,0 +1,472 @@
+import asyncio
+import functools
+import os
+import shlex
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional
+import structlog
+
+from . import metrics
+from .jsonrpc_client import JsonRpcError
+
+logger = structlog.get_logger(__name__)
+
+COMMAND_APPROVAL = "item/commandExecution/requestApproval"
+FILE_CHANGE_APPROVAL = "item/fileChange/requestApproval"
+USER_INPUT_REQUEST = "tool/requestUserInput"
+
+DEFAULTS = ("accept", "decline", "ask")
+
+# Shell wrappers whose script argument is checked instead of the wrapper
+_SHELLS = ("bash", "sh", "zsh")
+_SHELL_SCRIPT_FLAGS = ("-c", "-lc")
+# Characters the shell splits words on besides whitespace
+_PUNCTUATION = ";&|<>()\n"
+# Constructs whose effect cannot be judged from the words of a command
+_OPAQUE = ("$(", "`", "<(", ">(")
+# Options taking a value that may come before a program's subcommand
+_GLOBAL_OPTIONS = {
+    "git": ("-C", "-c", "--git-dir", "--work-tree", "--namespace", "--super-prefix", "--config-env", "--exec-path"),
+    "docker": ("-H", "--host", "-c", "--context", "--config", "-l", "--log-level"),
+    "kubectl": ("-n", "--namespace", "--context", "--cluster", "--kubeconfig", "-s", "--server", "--user"),
+    "cargo": ("-C", "--config", "-Z"),
+    "make": ("-C", "-f", "--directory", "--file"),
+    "sudo": ("-u", "-g", "-C", "-D", "-h", "-p", "-r", "-t", "-U"),
+}
+_MAX_SHELL_NESTING = 4
+
+# Option labels of tool/requestUserInput questions that approve or reject a tool call
+_ACCEPT_LABELS = ("accept", "allow", "approve", "yes")
+_DECLINE_LABELS = ("decline", "deny", "cancel", "no")
+
+
+def _parse_prefixes(prefixes: Iterable[str]) -> tuple[tuple[str, ...], ...]:
+    parsed = []
+    for prefix in prefixes:
+        try:
+            tokens = tuple(shlex.split(prefix))
+        except ValueError:
+            tokens = tuple(prefix.split())
+        if tokens:
+            parsed.append(tokens)
+    return tuple(parsed)
+
+
+def command_tokens(command: Any) -> Optional[tuple[str, ...]]:
+    """Split a command into argv, unwrapping ``bash -lc '...'``.
+
+    Returns None for commands that chain, pipe or redirect, since a
+    prefix match on those says nothing about what else runs.
+    """
+    parsed = parse_command(command)
+    if parsed is None:
+        return None
+    segments, simple = parsed
+    return segments[0] if simple else None
+
+
+def parse_command(command: Any) -> Optional[tuple[tuple[tuple[str, ...], ...], bool]]:
+    """Split a command into the argv of each simple command it runs.
+
+    ``bash -lc '...'`` wrappers are replaced by the commands of their
+    script. The flag is True for a single command with no chaining,
+    piping or redirection. Returns None for commands that cannot be
+    judged from their words: unbalanced quotes, command or process
+    substitution, subshells.
+    """
+    if isinstance(command, list):
+        argv = tuple(str(token) for token in command)
+        # Run without a shell, but a token that would chain in one is suspect
+        simple = not any(char in token for token in argv for char in _PUNCTUATION)
+        return _unwrap_shells((argv,), simple, 0)
+    if isinstance(command, str):
+        return _split_script(command, 0)
+    return None
+
+
+@functools.lru_cache(maxsize=1024)
+def _split_script(script: str, depth: int) -> Optional[tuple[tuple[tuple[str, ...], ...], bool]]:
+    # Agents repeat the same commands; caching keeps shlex off the hot path
+    if any(marker in script for marker in _OPAQUE):
+        return None
+    lexer = shlex.shlex(script, posix=True, punctuation_chars=_PUNCTUATION)
+    lexer.whitespace = lexer.whitespace.replace("\n", "")
+    lexer.whitespace_split = True
+    # A '#' inside a word is not a comment; reading on only ever sees more
+    lexer.commenters = ""
+    try:
+        words = list(lexer)
+    except ValueError:
+        return None
+
+    segments: list[tuple[str, ...]] = []
+    argv: list[str] = []
+    simple = True
+    redirect = False
+    for word in words:
+        if word and all(char in _PUNCTUATION for char in word):
+            if "(" in word or ")" in word:
+                return None
+            if "<" in word or ">" in word:
+                simple = False
+                redirect = True
+                continue
+            # ; & | and newlines end a command
+            if argv:
+                segments.append(tuple(argv))
+            argv = []
+            simple = False
+            continue
+        if redirect:
+            # The redirection target is not an argument
+            redirect = False
+            continue
+        argv.append(word)
+    if argv:
+        segments.append(tuple(argv))
+    return _unwrap_shells(tuple(segments), simple, depth)
+
+
+def _unwrap_shells(
+    segments: tuple[tuple[str, ...], ...], simple: bool, depth: int
+) -> Optional[tuple[tuple[tuple[str, ...], ...], bool]]:
+    unwrapped: list[tuple[str, ...]] = []
+    for argv in segments:
+        if len(argv) >= 3 and os.path.basename(argv[0]) in _SHELLS and argv[1] in _SHELL_SCRIPT_FLAGS:
+            if depth >= _MAX_SHELL_NESTING:
+                return None
+            inner = _split_script(argv[2], depth + 1)
+            if inner is None:
+                return None
+            unwrapped.extend(inner[0])
+            # Extra arguments become the script's $0, $1, ...
+            simple = simple and inner[1] and len(argv) == 3
+            continue
+        if argv:
+            unwrapped.append((os.path.basename(argv[0]),) + argv[1:])
+    return tuple(unwrapped), simple and len(unwrapped) == 1
+
+
+def _strip_global_options(argv: tuple[str, ...]) -> tuple[str, ...]:
+    """``git -C /x push`` -> ``git push``: drop options before the subcommand."""
+    takes_value = _GLOBAL_OPTIONS.get(argv[0], ())
+    index = 1
+    while index < len(argv) and argv[index].startswith("-"):
+        index += 2 if argv[index] in takes_value else 1
+    return argv[:1] + argv[index:]
+
+
+def _matches_prefix(tokens: tuple[str, ...], prefixes: tuple[tuple[str, ...], ...]) -> bool:
+    return any(tokens[: len(prefix)] == prefix for prefix in prefixes)
+
+
+def _matches_anywhere(argv: tuple[str, ...], prefixes: tuple[tuple[str, ...], ...]) -> bool:
+    """Whether a prefix matches from any word naming its program.
+
+    Catches wrappers such as ``sudo``, ``env`` or ``xargs`` and global
+    options, at the cost of also matching the program name as an argument.
+    """
+    programs = {prefix[0] for prefix in prefixes}
+    for index, word in enumerate(argv):
+        program = os.path.basename(word)
+        if program not in programs:
+            continue
+        tail = (program,) + argv[index + 1:]
+        if _matches_prefix(tail, prefixes) or _matches_prefix(_strip_global_options(tail), prefixes):
+            return True
+    return False
+
+
+def _within(path: str, roots: tuple[str, ...]) -> bool:
+    return any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in roots)
+
+
+class ApprovalPolicy:
+    """Rules for answering approval requests without a human.
+
+    Commands whose argv starts with an allow-listed prefix are accepted,
+    commands running a deny-listed prefix anywhere are declined, and file
+    changes entirely inside ``writable_roots`` are accepted. Commands
+    that chain, redirect or cannot be parsed are never accepted by rule
+    or default; they are asked of an interactive client or declined.
+    Anything else falls back to ``default``: ``accept``, ``decline`` or
+    ``ask`` (hand the request to an interactive client, declining if none
+    is attached).
+    """
+
+    def __init__(
+        self,
+        default: str = "decline",
+        command_allowlist: Iterable[str] = (),
+        command_denylist: Iterable[str] = (),
+        writable_roots: Iterable[str] = (),
+    ):
+        if default not in DEFAULTS:
+            raise ValueError(f"Approval default must be one of {', '.join(DEFAULTS)}")
+        self.default = default
+        self.command_allowlist = tuple(command_allowlist)
+        self.command_denylist = tuple(command_denylist)
+        self.writable_roots = tuple(os.path.normpath(root) for root in writable_roots)
+        self._allow = _parse_prefixes(self.command_allowlist)
+        self._deny = _parse_prefixes(self.command_denylist)
+
+    def merged(self, **overrides: Any) -> "ApprovalPolicy":
+        """Copy of this policy with the given non-None fields replaced."""
+        fields = self.to_dict()
+        fields.update({name: value for name, value in overrides.items() if value is not None})
+        return ApprovalPolicy(**fields)
+
+    def decide_command(self, command: Any) -> Optional[str]:
+        """``decline`` if any command it runs is deny-listed, ``accept`` if it
+        is one allow-listed command, ``ask`` if it chains, redirects or cannot
+        be parsed, and None otherwise.
+        """
+        if not command:
+            return None
+        parsed = parse_command(command)
+        if parsed is None:
+            return "ask"
+        segments, simple = parsed
+        if any(_matches_anywhere(argv, self._deny) for argv in segments):
+            return "decline"
+        if not simple:
+            return "ask" if segments else None
+        if _matches_prefix(segments[0], self._allow):
+            return "accept"
+        return None
+
+    def decide_file_change(self, paths: list[str], cwd: Optional[str]) -> Optional[str]:
+        if not self.writable_roots or not paths:
+            return None
+        base = cwd or os.sep
+        resolved = [os.path.normpath(os.path.join(base, path)) for path in paths]
+        if all(_within(path, self.writable_roots) for path in resolved):
+            return "accept"
+        return None
+
+    def to_dict(self) -> dict:
+        return {
+            "default": self.default,
+            "command_allowlist": list(self.command_allowlist),
+            "command_denylist": list(self.command_denylist),
+            "writable_roots": list(self.writable_roots),
+        }
+
+
+class PendingApproval:
+    """A request handed to an interactive client and awaiting its answer."""
+
+    def __init__(self, kind: str, method: str, params: dict, asker: Callable):
+        self.id = f"appr_{uuid.uuid4().hex}"
+        self.kind = kind
+        self.method = method
+        self.params = params
+        self.asker = asker
+        self.thread_id = params.get("threadId")
+        self.created_at = time.time()
+        self.future: asyncio.Future = asyncio.get_event_loop().create_future()
+
+    def to_event(self) -> dict:
+        return {
+            "approvalId": self.id,
+            "kind": self.kind,
+            "method": self.method,
+            "threadId": self.thread_id,
+            "turnId": self.params.get("turnId"),
+            "itemId": self.params.get("itemId"),
+            "createdAt": self.created_at,
+            "params": self.params,
+        }
+
+
+class ApprovalEngine:
+    """Answers app-server approval requests from policy, or asks a client.
+
+    Rule-based answers are computed synchronously in the reader loop.
+    Requests that no rule decides go to the interactive client attached to
+    the thread (a streaming turn) and fall back to ``decline`` after
+    ``ask_timeout`` seconds or when the client goes away.
+    """
+
+    def __init__(self, policy: ApprovalPolicy, ask_timeout: float = 60.0, max_tracked_items: int = 4096):
+        self.policy = policy
+        self._ask_timeout = ask_timeout
+        self._max_tracked_items = max_tracked_items
+        self._thread_policies: dict[str, ApprovalPolicy] = {}
+        self._askers: dict[str, list[Callable[[dict], None]]] = {}
+        self._pending: dict[str, PendingApproval] = {}
+        # itemId -> started commandExecution / fileChange item, for command and paths
+        self._items: OrderedDict[str, dict] = OrderedDict()
+
+    def attach(self, client) -> None:
+        """Answer approval requests and track pending items on the client."""
+        client.on_request(COMMAND_APPROVAL, self._on_command_approval)
+        client.on_request(FILE_CHANGE_APPROVAL, self._on_file_change_approval)
+        client.on_request(USER_INPUT_REQUEST, self._on_user_input)
+        client.on_notification("item/started", self._on_item_started)
+        client.on_notification("item/completed", self._on_item_completed)
+
+    def policy_for(self, thread_id: Optional[str]) -> ApprovalPolicy:
+        if thread_id is not None:
+            return self._thread_policies.get(thread_id, self.policy)
+        return self.policy
+
+    def set_thread_policy(self, thread_id: str, **overrides: Any) -> ApprovalPolicy:
+        """Override global policy fields for one thread."""
+        policy = self.policy.merged(**overrides)
+        self._thread_policies[thread_id] = policy
+        return policy
+
+    def clear_thread_policy(self, thread_id: str) -> bool:
+        return self._thread_policies.pop(thread_id, None) is not None
+
+    def add_asker(self, thread_id: str, asker: Callable[[dict], None]) -> None:
+        """Route undecided requests of a thread to ``asker(event)``."""
+        self._askers.setdefault(thread_id, []).append(asker)
+
+    def remove_asker(self, thread_id: str, asker: Callable[[dict], None]) -> None:
+        """Detach a client and decline what it was asked but did not answer."""
+        askers = self._askers.get(thread_id)
+        if askers is not None:
+            askers[:] = [a for a in askers if a != asker]
+            if not askers:
+                del self._askers[thread_id]
+
+        for approval in list(self._pending.values()):
+            if approval.asker == asker and not approval.future.done():
+                approval.future.set_result(({"decision": "decline"}, "client_gone"))
+
+    def resolve(self, approval_id: str, answer: dict) -> bool:
+        """Answer a pending approval; False if it is unknown or already answered."""
+        approval = self._pending.get(approval_id)
+        if approval is None or approval.future.done():
+            return False
+        approval.future.set_result((answer, "client"))
+        return True
+
+    def pending(self, thread_id: Optional[str] = None) -> list[PendingApproval]:
+        return [
+            approval
+            for approval in self._pending.values()
+            if thread_id is None or approval.thread_id == thread_id
+        ]
+
+    def _on_item_started(self, params: dict) -> None:
+        item = params.get("item") or {}
+        if item.get("type") in ("commandExecution", "fileChange") and item.get("id"):
+            self._items[item["id"]] = item
+            while len(self._items) > self._max_tracked_items:
+                self._items.popitem(last=False)
+
+    def _on_item_completed(self, params: dict) -> None:
+        item = params.get("item") or {}
+        if item.get("id"):
+            self._items.pop(item["id"], None)
+
+    def _on_command_approval(self, params: dict) -> Any:
+        item = self._items.get(params.get("itemId"), {})
+        policy = self.policy_for(params.get("threadId"))
+        decision = policy.decide_command(item.get("command") or params.get("command"))
+        return self._answer("command", COMMAND_APPROVAL, params, policy, decision)
+
+    def _on_file_change_approval(self, params: dict) -> Any:
+        item = self._items.get(params.get("itemId"), {})
+        paths = [change.get("path") for change in item.get("changes") or () if change.get("path")]
+        policy = self.policy_for(params.get("threadId"))
+        decision = policy.decide_file_change(paths, item.get("cwd") or params.get("cwd"))
+        return self._answer("fileChange", FILE_CHANGE_APPROVAL, params, policy, decision)
+
+    def _on_user_input(self, params: dict) -> Any:
+        policy = self.policy_for(params.get("threadId"))
+        return self._answer("userInput", USER_INPUT_REQUEST, params, policy, None)
+
+    def _answer(
+        self,
+        kind: str,
+        method: str,
+        params: dict,
+        policy: ApprovalPolicy,
+        decision: Optional[str],
+    ) -> Any:
+        if decision in ("accept", "decline"):
+            return self._result(kind, params, {"decision": decision}, "rule")
+
+        askers = self._askers.get(params.get("threadId"))
+        if askers:
+            return self._ask(kind, method, params, askers[-1])
+
+        # "ask" from a rule: too risky for an unattended default
+        if decision == "ask" or policy.default == "ask":
+            return self._result(kind, params, {"decision": "decline"}, "no_client")
+        return self._result(kind, params, {"decision": policy.default}, "default")
+
+    async def _ask(self, kind: str, method: str, params: dict, asker: Callable[[dict], None]) -> dict:
+        approval = PendingApproval(kind, method, params, asker)
+        self._pending[approval.id] = approval
+        try:
+            asker(approval.to_event())
+            try:
+                answer, source = await asyncio.wait_for(
+                    asyncio.shield(approval.future), timeout=self._ask_timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning("Approval not answered in time", approval_id=approval.id, kind=kind)
+                answer, source = {"decision": "decline"}, "timeout"
+        finally:
+            self._pending.pop(approval.id, None)
+
+        return self._result(kind, params, answer, source)
+
+    def _result(self, kind: str, params: dict, answer: dict, source: str) -> dict:
+        decision = answer.get("decision")
+        metrics.approval_decisions.inc(kind=kind, decision=decision or "answers", source=source)
+        logger.info(
+            "Approval answered",
+            kind=kind,
+            decision=decision,
+            source=source,
+            thread_id=params.get("threadId"),
+            item_id=params.get("itemId"),
+        )
+
+        if kind != "userInput":
+            result = {"decision": decision}
+            if decision == "accept" and answer.get("acceptSettings") is not None:
+                result["acceptSettings"] = answer["acceptSettings"]
+            return result
+
+        if answer.get("answers") is not None:
+            return {"answers": answer["answers"]}
+        return _user_input_answers(params, decision)
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy.to_dict(),
+            "thread_policies": len(self._thread_policies),
+            "interactive_threads": len(self._askers),
+            "pending": len(self._pending),
+        }
+
+
+def _user_input_answers(params: dict, decision: Optional[str]) -> dict:
+    """Answer every question by picking its accept or decline option."""
+    labels = _ACCEPT_LABELS if decision == "accept" else _DECLINE_LABELS
+    answers = {}
+    for question in params.get("questions") or ():
+        chosen = next(
+            (
+                option.get("label")
+                for option in question.get("options") or ()
+                if str(option.get("label", "")).strip().lower() in labels
+            ),
+            None,
+        )
+        if chosen is None:
+            raise JsonRpcError(
+                code=-32000,
+                message=f"No client attached to answer question {question.get('id')!r}",
+            )
+        answers[question.get("id")] = {"answers": [chosen]}
+    return {"answers": answers}
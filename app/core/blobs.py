@@ -0,0 +1,242 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+import structlog
+
+from . import metrics
+
+logger = structlog.get_logger(__name__)
+
+BLOB_URL = "/api/blobs/{}"
+
+SWEEP_INTERVAL = 60.0
+
+
+class Blob:
+    """A stored field value; ``size`` is known once the write has finished."""
+
+    __slots__ = ("id", "path", "size", "created_at", "written")
+
+    def __init__(self, blob_id: str, path: str, written: asyncio.Future):
+        self.id = blob_id
+        self.path = path
+        self.size: Optional[int] = None
+        self.created_at = time.time()
+        self.written = written
+
+
+class BlobStore:
+    """Temp-file store for item fields too large to keep in memory.
+
+    ``put`` hands the text to a single writer thread and returns an id at
+    once; reads wait for that write. Blobs expire after ``ttl`` seconds,
+    and the oldest are dropped while the store holds more than
+    ``max_bytes``.
+    """
+
+    def __init__(self, directory: str = "", ttl: float = 3600.0, max_bytes: int = 0):
+        self._directory = directory
+        self._owns_directory = not directory
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._blobs: dict[str, Blob] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="blob-writer")
+        self._sweeper_task: Optional[asyncio.Task] = None
+        self.bytes = 0
+        self.stored = 0
+        self.evicted = 0
+        self.write_errors = 0
+
+    async def start(self) -> None:
+        if self._owns_directory:
+            self._directory = tempfile.mkdtemp(prefix="codex-blobs-")
+        else:
+            os.makedirs(self._directory, exist_ok=True)
+        self._sweeper_task = asyncio.create_task(self._sweeper_loop())
+        logger.info("Blob store opened", directory=self._directory)
+
+    async def stop(self) -> None:
+        if self._sweeper_task is not None:
+            self._sweeper_task.cancel()
+            await asyncio.gather(self._sweeper_task, return_exceptions=True)
+            self._sweeper_task = None
+        self._executor.shutdown(wait=True)
+        for blob in list(self._blobs.values()):
+            self._remove(blob)
+        if self._owns_directory:
+            shutil.rmtree(self._directory, ignore_errors=True)
+
+    def put(self, text: str) -> str:
+        """Store ``text`` as UTF-8 and return its blob id."""
+        blob_id = uuid.uuid4().hex
+        path = os.path.join(self._directory, blob_id)
+        written = asyncio.get_running_loop().run_in_executor(self._executor, self._write, path, text)
+        blob = Blob(blob_id, path, written)
+        self._blobs[blob_id] = blob
+        written.add_done_callback(lambda future: self._on_written(blob, future))
+        return blob_id
+
+    @staticmethod
+    def _write(path: str, text: str) -> int:
+        data = text.encode("utf-8", errors="surrogatepass")
+        with open(path, "wb") as f:
+            f.write(data)
+        return len(data)
+
+    def _on_written(self, blob: Blob, future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            self.write_errors += 1
+            logger.error("Blob write failed", blob_id=blob.id, error=str(future.exception()))
+            self._blobs.pop(blob.id, None)
+            return
+        blob.size = future.result()
+        if self._blobs.get(blob.id) is not blob:
+            # Evicted before the write finished
+            self._unlink(blob.path)
+            return
+        self.bytes += blob.size
+        self.stored += 1
+        self._enforce_limit()
+
+    async def get(self, blob_id: str) -> Optional[Blob]:
+        """The written blob, or None when unknown, expired or failed."""
+        blob = self._blobs.get(blob_id)
+        if blob is None:
+            return None
+        try:
+            await asyncio.shield(blob.written)
+        except Exception:
+            return None
+        return blob if blob.id in self._blobs else None
+
+    def _remove(self, blob: Blob) -> None:
+        if self._blobs.pop(blob.id, None) is None:
+            return
+        if blob.size is not None:
+            self.bytes -= blob.size
+            # Readers that already opened the file keep it until they finish
+            self._unlink(blob.path)
+
+    @staticmethod
+    def _unlink(path: str) -> None:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Blob removal failed", path=path, error=str(e))
+
+    def _enforce_limit(self) -> None:
+        if self._max_bytes <= 0:
+            return
+        # Insertion order is creation order
+        for blob in list(self._blobs.values()):
+            if self.bytes <= self._max_bytes:
+                break
+            if blob.size is not None:
+                self._remove(blob)
+                self.evicted += 1
+
+    def evict_expired(self) -> int:
+        cutoff = time.time() - self._ttl
+        expired = [blob for blob in self._blobs.values() if blob.created_at < cutoff and blob.size is not None]
+        for blob in expired:
+            self._remove(blob)
+        self.evicted += len(expired)
+        return len(expired)
+
+    async def _sweeper_loop(self) -> None:
+        while True:
+            await asyncio.sleep(min(SWEEP_INTERVAL, self._ttl))
+            evicted = self.evict_expired()
+            if evicted:
+                logger.debug("Evicted expired blobs", count=evicted)
+
+    def stats(self) -> dict:
+        return {
+            "blobs": len(self._blobs),
+            "bytes": self.bytes,
+            "max_bytes": self._max_bytes,
+            "stored": self.stored,
+            "evicted": self.evicted,
+            "write_errors": self.write_errors,
+        }
+
+
+class ItemSpiller:
+    """Per-turn memory budget for collected items.
+
+    String fields longer than ``max_chars`` are cut to a ``preview_chars``
+    head; once the turn has kept ``budget`` characters inline, every field
+    longer than the preview is cut too. The full value goes to ``blobs``
+    when there is a store, and the item lists what was cut under
+    ``spilled``, keyed by dotted field path. Items are copied, never
+    changed in place, since other handlers share the notification.
+    """
+
+    def __init__(self, blobs: Optional[BlobStore], max_chars: int, budget: int, preview_chars: int):
+        self._blobs = blobs
+        self._max_chars = max_chars
+        self._budget = budget
+        self._preview_chars = preview_chars
+        self.kept = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_chars > 0
+
+    def apply(self, item: Any) -> Any:
+        if not self.enabled or not isinstance(item, dict):
+            return item
+        spilled: dict[str, dict] = {}
+        result = self._walk(item, "", spilled)
+        if spilled:
+            result = dict(result)
+            result["spilled"] = spilled
+        return result
+
+    def _walk(self, value: Any, path: str, spilled: dict) -> Any:
+        if isinstance(value, str):
+            return self._field(value, path, spilled)
+        if isinstance(value, dict):
+            changed = None
+            for key, child in value.items():
+                new = self._walk(child, f"{path}.{key}" if path else key, spilled)
+                if new is not child:
+                    if changed is None:
+                        changed = dict(value)
+                    changed[key] = new
+            return value if changed is None else changed
+        if isinstance(value, list):
+            changed = None
+            for index, child in enumerate(value):
+                new = self._walk(child, f"{path}.{index}" if path else str(index), spilled)
+                if new is not child:
+                    if changed is None:
+                        changed = list(value)
+                    changed[index] = new
+            return value if changed is None else changed
+        return value
+
+    def _field(self, text: str, path: str, spilled: dict) -> str:
+        length = len(text)
+        limit = self._max_chars if self.kept + length <= self._budget else self._preview_chars
+        if length <= limit:
+            self.kept += length
+            return text
+
+        reference: dict = {"length": length, "blobId": None, "url": None}
+        if self._blobs is not None:
+            reference["blobId"] = self._blobs.put(text)
+            reference["url"] = BLOB_URL.format(reference["blobId"])
+        metrics.item_fields_spilled.inc(action="stored" if self._blobs is not None else "truncated")
+        spilled[path] = reference
+
+        preview = text[: self._preview_chars]
+        self.kept += len(preview)
+        return preview
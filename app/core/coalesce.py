@@ -0,0 +1,110 @@
+import asyncio
+from typing import Callable, Optional
+
+from . import metrics
+
+# Notifications carrying an incremental ``delta`` string for one item
+DELTA_METHODS = frozenset(
+    {
+        "item/agentMessage/delta",
+        "item/commandExecution/outputDelta",
+        "item/fileChange/outputDelta",
+        "item/plan/delta",
+        "item/reasoning/textDelta",
+        "item/reasoning/summaryTextDelta",
+    }
+)
+
+
+class DeltaCoalescer:
+    """Merge runs of small delta notifications before they go out on a stream.
+
+    Consecutive deltas of the same method and item (and reasoning part)
+    are joined into one notification, emitted when ``window`` seconds
+    have passed since the first, when ``max_bytes`` of UTF-8 text are
+    buffered, or as soon as any other notification arrives, so event
+    order is preserved.
+    A ``window`` of 0 passes everything through.
+    """
+
+    def __init__(self, emit: Callable[[str, dict], None], window: float, max_bytes: int = 4096):
+        self._emit = emit
+        self._window = window
+        self._max_bytes = max_bytes
+        self._key: Optional[tuple] = None
+        self._params: Optional[dict] = None
+        self._parts: list[str] = []
+        self._size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.deltas_in = 0
+        self.deltas_out = 0
+
+    def push(self, method: str, params: dict) -> None:
+        """Emit or buffer one notification."""
+        if method not in DELTA_METHODS or self._window <= 0:
+            self.flush()
+            if method in DELTA_METHODS:
+                self._count(1, 1)
+            self._emit(method, params)
+            return
+
+        delta = params.get("delta")
+        if not isinstance(delta, str):
+            self.flush()
+            self._emit(method, params)
+            return
+
+        key = (method, params.get("itemId"), params.get("summaryIndex"), params.get("contentIndex"))
+        if key != self._key:
+            self.flush()
+            self._key = key
+            self._params = params
+            self._timer = asyncio.get_event_loop().call_later(self._window, self.flush)
+
+        self._parts.append(delta)
+        # UTF-8 size; ASCII-only strings are told apart without encoding
+        self._size += len(delta) if delta.isascii() else len(delta.encode("utf-8"))
+        if self._size >= self._max_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Emit the buffered run, if any."""
+        if self._key is None:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        method, params, parts = self._key[0], self._params, self._parts
+        self._key = None
+        self._params = None
+        self._parts = []
+        self._size = 0
+
+        if len(parts) > 1:
+            params = {**params, "delta": "".join(parts)}
+        self._count(len(parts), 1)
+        self._emit(method, params)
+
+    def close(self) -> None:
+        """Drop anything buffered and stop the flush timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._key = None
+        self._params = None
+        self._parts = []
+        self._size = 0
+
+    def _count(self, received: int, sent: int) -> None:
+        self.deltas_in += received
+        self.deltas_out += sent
+        metrics.stream_deltas.inc(received, stage="received")
+        metrics.stream_deltas.inc(sent, stage="sent")
+
+    def stats(self) -> dict:
+        return {
+            "deltas_in": self.deltas_in,
+            "deltas_out": self.deltas_out,
+            "ratio": round(self.deltas_in / self.deltas_out, 2) if self.deltas_out else None,
+        }
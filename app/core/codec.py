@@ -0,0 +1,59 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Reused encoder: json.dumps() builds a new encoder whenever options are passed
+_json_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+class StdlibJsonCodec:
+    """JSON codec backed by the standard library."""
+
+    name = "json"
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return _json_encoder.encode(obj).encode()
+
+    @staticmethod
+    def dumps_line(obj: Any) -> bytes:
+        return (_json_encoder.encode(obj) + "\n").encode()
+
+    @staticmethod
+    def loads(data: bytes | bytearray) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    """JSON codec backed by orjson (bytes in, bytes out)."""
+
+    name = "orjson"
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    @staticmethod
+    def dumps_line(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+
+    @staticmethod
+    def loads(data: bytes | bytearray) -> Any:
+        return orjson.loads(data)
+
+
+def get_codec(name: str = "auto"):
+    """Resolve a codec by name: ``auto`` prefers orjson when installed."""
+    if name == "json":
+        return StdlibJsonCodec
+    if name == "orjson":
+        if orjson is None:
+            raise RuntimeError("orjson codec requested but orjson is not installed")
+        return OrjsonCodec
+    if name == "auto":
+        return OrjsonCodec if orjson is not None else StdlibJsonCodec
+    raise ValueError(f"Unknown JSON codec: {name}")
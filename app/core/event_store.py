@@ -0,0 +1,412 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import structlog
+
+from .codec import get_codec
+from ..config import settings
+
+logger = structlog.get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    thread_id TEXT NOT NULL,
+    turn_id TEXT NOT NULL UNIQUE,
+    status TEXT,
+    completed_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS turns_thread ON turns (thread_id, seq);
+CREATE INDEX IF NOT EXISTS turns_status ON turns (status, completed_at);
+CREATE INDEX IF NOT EXISTS turns_completed ON turns (completed_at);
+
+CREATE TABLE IF NOT EXISTS items (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    thread_id TEXT NOT NULL,
+    turn_id TEXT,
+    item_id TEXT,
+    type TEXT,
+    status TEXT,
+    text TEXT,
+    completed_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (thread_id, turn_id, item_id)
+);
+CREATE INDEX IF NOT EXISTS items_thread ON items (thread_id, seq);
+CREATE INDEX IF NOT EXISTS items_thread_type ON items (thread_id, type, seq);
+CREATE INDEX IF NOT EXISTS items_turn ON items (turn_id, seq);
+CREATE INDEX IF NOT EXISTS items_type_status ON items (type, status);
+CREATE INDEX IF NOT EXISTS items_completed ON items (completed_at);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5 (text, content='items', content_rowid='seq', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items WHEN new.text IS NOT NULL BEGIN
+    INSERT INTO items_fts (rowid, text) VALUES (new.seq, new.text);
+END;
+"""
+
+# The trigram tokenizer cannot match shorter search words
+MIN_FTS_WORD = 3
+
+_ITEM_COLUMNS = "seq, thread_id, turn_id, item_id, type, status, completed_at, data"
+
+
+def _item_text(item: dict) -> Optional[str]:
+    """Searchable text of an item: agent and user messages, reasoning summaries."""
+    text = item.get("text")
+    if isinstance(text, str):
+        return text
+    parts = item.get("content") or item.get("summary")
+    if isinstance(parts, list):
+        texts = [
+            part if isinstance(part, str) else part.get("text")
+            for part in parts
+            if isinstance(part, (str, dict))
+        ]
+        joined = "\n".join(t for t in texts if isinstance(t, str))
+        return joined or None
+    return None
+
+
+def _fts_query(words: list[str]) -> str:
+    """Match every word literally, whatever FTS5 syntax it contains."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in words)
+
+
+def _like_pattern(word: str) -> str:
+    """Substring pattern for ``LIKE ? ESCAPE '\\'`` matching ``%`` and ``_`` literally."""
+    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class EventStore:
+    """SQLite history of completed turns and items seen on the app-server connections.
+
+    Notification handlers only append to an in-memory batch; a background
+    task hands batches to a single writer thread that inserts them in one
+    transaction on a WAL-mode database. Queries run on a small reader pool
+    with their own connections, so neither blocks the event loop.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 0.5, max_queued: int = 100_000):
+        self._path = path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_queued = max_queued
+        self._codec = get_codec(settings.json_codec)
+        self._pending: list[tuple[str, tuple]] = []
+        self._wakeup = asyncio.Event()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-store-writer")
+        self._read_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="event-store-reader")
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self.fts = False
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.write_errors = 0
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._write_executor, self._open)
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        logger.info("Event store opened", path=self._path, fts=self.fts)
+
+    async def stop(self) -> None:
+        """Write what is still queued and close the database."""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            await asyncio.gather(self._writer_task, return_exceptions=True)
+            self._writer_task = None
+        await self._flush()
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._write_executor, self._close)
+        self._write_executor.shutdown(wait=True)
+        self._read_executor.shutdown(wait=True)
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+
+    def attach(self, client) -> None:
+        """Record turn/completed and item/completed from every connection."""
+        client.on_notification("turn/completed", self._on_turn_completed)
+        client.on_notification("item/completed", self._on_item_completed)
+
+    # -- writes -------------------------------------------------------------
+
+    def _on_turn_completed(self, params: dict) -> None:
+        turn = params.get("turn") or {}
+        thread_id = params.get("threadId") or turn.get("threadId")
+        turn_id = turn.get("id")
+        if thread_id is None or turn_id is None:
+            return
+        # Items are stored on their own; the turn dict may be extended later by runners
+        summary = {key: value for key, value in turn.items() if key != "items"}
+        self._enqueue("turn", (thread_id, turn_id, turn.get("status"), time.time(), summary))
+
+    def _on_item_completed(self, params: dict) -> None:
+        item = params.get("item") or {}
+        thread_id = params.get("threadId")
+        if thread_id is None:
+            return
+        self._enqueue("item", (thread_id, params.get("turnId"), item, time.time()))
+
+    def _enqueue(self, kind: str, row: tuple) -> None:
+        if len(self._pending) >= self._max_queued:
+            self.dropped += 1
+            return
+        self._pending.append((kind, row))
+        if len(self._pending) >= self._batch_size:
+            self._wakeup.set()
+
+    async def _writer_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._flush()
+
+    async def _flush(self) -> None:
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._write_executor, self._write, batch)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.write_errors += 1
+            logger.error("Event store write failed", rows=len(batch), error=str(e))
+
+    def _open(self) -> None:
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self._path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        try:
+            self._open_fts(conn)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning("SQLite FTS5 trigram tokenizer unavailable, search falls back to LIKE", error=str(e))
+        conn.commit()
+        self._write_conn = conn
+
+    @staticmethod
+    def _open_fts(conn: sqlite3.Connection) -> None:
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'items_fts'").fetchone()
+        if row is None or "trigram" in row[0]:
+            conn.executescript(_FTS_SCHEMA)
+            return
+        # Indexed by word tokens, which only match whole words; rebuild for substrings
+        logger.info("Rebuilding search index with the trigram tokenizer")
+        conn.execute("DROP TABLE items_fts")
+        conn.executescript(_FTS_SCHEMA)
+        conn.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+
+    def _close(self) -> None:
+        if self._write_conn is not None:
+            self._write_conn.close()
+            self._write_conn = None
+
+    def _write(self, batch: list[tuple[str, tuple]]) -> None:
+        dumps = self._codec.dumps
+        turns = []
+        items = []
+        for kind, row in batch:
+            if kind == "turn":
+                thread_id, turn_id, status, completed_at, turn = row
+                turns.append((thread_id, turn_id, status, completed_at, dumps(turn).decode()))
+            else:
+                thread_id, turn_id, item, completed_at = row
+                items.append(
+                    (
+                        thread_id,
+                        turn_id,
+                        item.get("id"),
+                        item.get("type"),
+                        item.get("status"),
+                        _item_text(item),
+                        completed_at,
+                        dumps(item).decode(),
+                    )
+                )
+
+        with self._write_conn:
+            self._write_conn.executemany(
+                "INSERT INTO items (thread_id, turn_id, item_id, type, status, text, completed_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING",
+                items,
+            )
+            self._write_conn.executemany(
+                "INSERT INTO turns (thread_id, turn_id, status, completed_at, data) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (turn_id) DO UPDATE SET status = excluded.status, "
+                "completed_at = excluded.completed_at, data = excluded.data",
+                turns,
+            )
+
+    # -- reads --------------------------------------------------------------
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Closed from the event loop thread in stop()
+            conn = sqlite3.connect(f"file:{self._path}?mode=ro", uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    async def _read(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._read_executor, lambda: fn(self._reader()))
+
+    async def turns(
+        self,
+        thread_id: str,
+        after: int = 0,
+        limit: int = 50,
+        status: Optional[str] = None,
+    ) -> list[dict]:
+        """Completed turns of a thread in completion order, after cursor ``after``."""
+        sql = "SELECT seq, thread_id, turn_id, status, completed_at, data FROM turns WHERE thread_id = ? AND seq > ?"
+        args: list = [thread_id, after]
+        if status is not None:
+            sql += " AND status = ?"
+            args.append(status)
+        sql += " ORDER BY seq LIMIT ?"
+        args.append(limit)
+
+        def query(conn: sqlite3.Connection) -> list[dict]:
+            return [
+                {
+                    "seq": row["seq"],
+                    "threadId": row["thread_id"],
+                    "turnId": row["turn_id"],
+                    "status": row["status"],
+                    "completedAt": row["completed_at"],
+                    "turn": self._codec.loads(row["data"]),
+                }
+                for row in conn.execute(sql, args)
+            ]
+
+        return await self._read(query)
+
+    async def items(
+        self,
+        thread_id: str,
+        after: int = 0,
+        limit: int = 50,
+        item_type: Optional[str] = None,
+        turn_id: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> list[dict]:
+        """Completed items of a thread in completion order, after cursor ``after``."""
+        sql = f"SELECT {_ITEM_COLUMNS} FROM items WHERE thread_id = ? AND seq > ?"
+        args: list = [thread_id, after]
+        for column, value in (("type", item_type), ("turn_id", turn_id), ("status", status)):
+            if value is not None:
+                sql += f" AND {column} = ?"
+                args.append(value)
+        sql += " ORDER BY seq LIMIT ?"
+        args.append(limit)
+        return await self._read(lambda conn: [self._item_row(row) for row in conn.execute(sql, args)])
+
+    async def search(
+        self,
+        query: str,
+        thread_id: Optional[str] = None,
+        item_type: Optional[str] = None,
+        limit: int = 50,
+    ) -> list[dict]:
+        """Items whose text contains every word of ``query`` as a substring,
+        ignoring case, newest first.
+
+        Words of at least MIN_FTS_WORD characters are looked up in the
+        trigram index; shorter ones, and all words without FTS5, are
+        matched with LIKE, which folds ASCII case only.
+
+        Raises:
+            ValueError: If ``query`` has no words or FTS5 rejects it.
+        """
+        words = query.split()
+        if not words:
+            raise ValueError("Search query is empty")
+        indexed = [word for word in words if len(word) >= MIN_FTS_WORD] if self.fts else []
+        scanned = [word for word in words if not self.fts or len(word) < MIN_FTS_WORD]
+
+        columns = ", ".join(f"items.{column.strip()}" for column in _ITEM_COLUMNS.split(","))
+        conditions: list[str] = []
+        args: list = []
+        if indexed:
+            sql = (
+                f"SELECT {columns}, snippet(items_fts, 0, '[', ']', '...', 12) AS snippet "
+                "FROM items_fts JOIN items ON items.seq = items_fts.rowid WHERE "
+            )
+            conditions.append("items_fts MATCH ?")
+            args.append(_fts_query(indexed))
+        else:
+            sql = f"SELECT {columns}, NULL AS snippet FROM items WHERE "
+        for word in scanned:
+            conditions.append("items.text LIKE ? ESCAPE '\\'")
+            args.append(_like_pattern(word))
+        sql += " AND ".join(conditions)
+        if thread_id is not None:
+            sql += " AND items.thread_id = ?"
+            args.append(thread_id)
+        if item_type is not None:
+            sql += " AND items.type = ?"
+            args.append(item_type)
+        sql += " ORDER BY items.seq DESC LIMIT ?"
+        args.append(limit)
+
+        def run(conn: sqlite3.Connection) -> list[dict]:
+            try:
+                rows = conn.execute(sql, args).fetchall()
+            except sqlite3.OperationalError as e:
+                if not indexed:
+                    raise
+                raise ValueError(f"Invalid search query: {e}") from e
+            return [{**self._item_row(row), "snippet": row["snippet"]} for row in rows]
+
+        return await self._read(run)
+
+    def _item_row(self, row: sqlite3.Row) -> dict:
+        return {
+            "seq": row["seq"],
+            "threadId": row["thread_id"],
+            "turnId": row["turn_id"],
+            "itemId": row["item_id"],
+            "type": row["type"],
+            "status": row["status"],
+            "completedAt": row["completed_at"],
+            "item": self._codec.loads(row["data"]),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "path": self._path,
+            "fts": self.fts,
+            "queued": len(self._pending),
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors,
+        }
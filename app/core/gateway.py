@@ -0,0 +1,186 @@
+import asyncio
+from typing import Any, Callable, Optional
+import structlog
+
+from .admission import ThreadBusyError
+from .coalesce import DeltaCoalescer
+from .jsonrpc_client import INTERNAL_ERROR, METHOD_NOT_FOUND, JsonRpcError, notification_scope
+from .process_manager import ProcessUnavailableError
+from .process_pool import THREAD_OWNING_METHODS, ProcessPool
+from .tenants import TenantLimitError
+from ..config import settings
+
+logger = structlog.get_logger(__name__)
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+# Implementation-defined server errors for bridge-side failures
+SERVER_UNAVAILABLE = -32001
+THREAD_BUSY = -32002
+TENANT_LIMITED = -32003
+
+# Notification namespaces forwarded to subscribed connections
+FORWARDED_PREFIXES = ("thread/", "turn/", "item/")
+
+# Methods answered by the gateway itself
+SUBSCRIBE = "bridge/subscribe"
+UNSUBSCRIBE = "bridge/unsubscribe"
+
+# The bridge owns the connection handshake
+BLOCKED_METHODS = frozenset({"initialize", "initialized"})
+
+
+def method_allowed(method: str) -> bool:
+    """Whether clients may call ``method`` through a passthrough endpoint."""
+    if method in BLOCKED_METHODS:
+        return False
+    allowed = settings.rpc_allowed_methods
+    return method in allowed or "*" in allowed
+
+
+def method_not_allowed(request_id: Any, method: str) -> dict:
+    return {"id": request_id, "error": {"code": METHOD_NOT_FOUND, "message": f"Method not allowed: {method}"}}
+
+
+def error_response(request_id: Any, e: BaseException) -> dict:
+    """JSON-RPC error response for a failed bridged call."""
+    if isinstance(e, JsonRpcError):
+        error = e.to_dict()
+    elif isinstance(e, ThreadBusyError):
+        error = {"code": THREAD_BUSY, "message": str(e)}
+    elif isinstance(e, TenantLimitError):
+        error = {"code": TENANT_LIMITED, "message": str(e)}
+        if e.retry_after is not None:
+            error["data"] = {"retryAfter": round(e.retry_after, 3)}
+    elif isinstance(e, ProcessUnavailableError):
+        error = {"code": SERVER_UNAVAILABLE, "message": str(e)}
+    elif isinstance(e, asyncio.TimeoutError):
+        error = {"code": INTERNAL_ERROR, "message": "Request timed out"}
+    else:
+        error = {"code": INTERNAL_ERROR, "message": str(e)}
+    return {"id": request_id, "error": error}
+
+
+class GatewaySession:
+    """JSON-RPC calls and notification subscriptions of one client connection.
+
+    Calls go through the pool, so each gets an ID from the owning
+    JsonRpcClient and the reply carries the client's own ``id`` back.
+    The session subscribes to a thread when a call names or creates it,
+    or on ``bridge/subscribe``; it then receives that thread's
+    ``thread/*``, ``turn/*`` and ``item/*`` notifications through one
+    thread-scoped handler, however many calls it makes.
+    """
+
+    def __init__(
+        self,
+        client: ProcessPool,
+        send: Callable[[dict], None],
+        coalesce_window: float = 0.0,
+    ):
+        self._client = client
+        self._send = send
+        self._coalescer = DeltaCoalescer(
+            lambda method, params: send({"method": method, "params": params}),
+            window=coalesce_window,
+            max_bytes=settings.delta_coalesce_bytes,
+        )
+        self._threads: set[str] = set()
+        self._turns: set[str] = set()
+        self.calls = 0
+
+    @property
+    def threads(self) -> list[str]:
+        return sorted(self._threads)
+
+    async def handle(self, message: Any) -> Optional[dict]:
+        """Run one client message; returns the response, or None for notifications."""
+        if not isinstance(message, dict):
+            return {"id": None, "error": {"code": INVALID_REQUEST, "message": "Expected a JSON object"}}
+
+        request_id = message.get("id")
+        method = message.get("method")
+        params = message.get("params")
+        if params is None:
+            params = {}
+        if not isinstance(method, str) or not isinstance(params, dict):
+            return {"id": request_id, "error": {"code": INVALID_REQUEST, "message": "Invalid request"}}
+        if request_id is None:
+            # Client notifications have no meaning for the app-server connection
+            return None
+
+        if method in (SUBSCRIBE, UNSUBSCRIBE):
+            thread_id = params.get("threadId")
+            if not isinstance(thread_id, str):
+                return {"id": request_id, "error": {"code": INVALID_REQUEST, "message": "threadId is required"}}
+            if method == SUBSCRIBE:
+                self.subscribe(thread_id)
+            else:
+                self.unsubscribe(thread_id)
+            return {"id": request_id, "result": {"threadIds": self.threads}}
+
+        if not method_allowed(method):
+            return method_not_allowed(request_id, method)
+
+        thread_id = params.get("threadId")
+        if isinstance(thread_id, str):
+            # Before the call, so no event of a starting turn is missed
+            self.subscribe(thread_id)
+
+        self.calls += 1
+        try:
+            result = await self._client.call(method, params, timeout=settings.request_timeout)
+        except Exception as e:
+            return error_response(request_id, e)
+
+        if method in THREAD_OWNING_METHODS:
+            new_thread_id = result.get("thread", {}).get("id")
+            if new_thread_id:
+                self.subscribe(new_thread_id)
+        elif method == "turn/start":
+            turn_id = result.get("turn", {}).get("id")
+            if turn_id and turn_id not in self._turns:
+                # Some turn notifications (e.g. turn/plan/updated) only carry a turnId
+                self._turns.add(turn_id)
+                self._client.on_notification("*", self._on_turn_event, turn_id=turn_id)
+
+        return {"id": request_id, "result": result}
+
+    def subscribe(self, thread_id: str) -> None:
+        if thread_id not in self._threads:
+            self._threads.add(thread_id)
+            self._client.on_notification("*", self._on_thread_event, thread_id=thread_id)
+
+    def unsubscribe(self, thread_id: str) -> None:
+        if thread_id in self._threads:
+            self._threads.discard(thread_id)
+            self._client.remove_notification_handler("*", self._on_thread_event, thread_id=thread_id)
+
+    @property
+    def coalescer(self) -> DeltaCoalescer:
+        return self._coalescer
+
+    def close(self) -> None:
+        """Drop every subscription of the connection."""
+        self._coalescer.close()
+        for thread_id in list(self._threads):
+            self.unsubscribe(thread_id)
+        for turn_id in self._turns:
+            self._client.remove_notification_handler("*", self._on_turn_event, turn_id=turn_id)
+        self._turns.clear()
+
+    def _on_thread_event(self, method: str, params: dict) -> None:
+        if not method.startswith(FORWARDED_PREFIXES):
+            return
+        self._coalescer.push(method, params)
+
+        if method == "turn/completed":
+            turn_id = params.get("turn", {}).get("id")
+            if turn_id in self._turns:
+                self._turns.discard(turn_id)
+                self._client.remove_notification_handler("*", self._on_turn_event, turn_id=turn_id)
+
+    def _on_turn_event(self, method: str, params: dict) -> None:
+        # The thread-scoped handler already sees notifications carrying a threadId
+        if notification_scope(params)[0] is None:
+            self._on_thread_event(method, params)
@@ -1,12 +1,42 @@
 import asyncio
+import inspect
+import time
 from typing import Any, Callable, Optional
 import structlog
 
-from .process_manager import ProcessManager
+from . import metrics
+from .process_manager import ProcessCrashedError, ProcessManager, ProcessUnavailableError
 from ..config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Method name matching every notification
+WILDCARD = "*"
+
+# Error codes for answering server-initiated requests
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+
+
+def notification_scope(params: dict) -> tuple[Optional[str], Optional[str]]:
+    """Extract the (threadId, turnId) a notification belongs to."""
+    thread_id = params.get("threadId")
+    turn_id = params.get("turnId")
+
+    turn = params.get("turn")
+    if isinstance(turn, dict):
+        if turn_id is None:
+            turn_id = turn.get("id")
+        if thread_id is None:
+            thread_id = turn.get("threadId")
+
+    if thread_id is None:
+        thread = params.get("thread")
+        if isinstance(thread, dict):
+            thread_id = thread.get("id")
+
+    return thread_id, turn_id
+
 
 class JsonRpcClient:
     """Handles JSON-RPC 2.0 protocol communication with codex app-server."""
@@ -15,15 +45,25 @@ class JsonRpcClient:
         self._process = process_manager
         self._next_id = 1
         self._pending_requests: dict[int, asyncio.Future] = {}
+        # Global tier: method (or WILDCARD) -> handlers
         self._notification_handlers: dict[str, list[Callable]] = {}
+        # Scoped tiers: (method or WILDCARD, threadId/turnId) -> handlers
+        self._thread_handlers: dict[tuple[str, str], list[Callable]] = {}
+        self._turn_handlers: dict[tuple[str, str], list[Callable]] = {}
+        # Server-initiated request method -> handler returning the result
+        self._request_handlers: dict[str, Callable[[dict], Any]] = {}
+        self._request_tasks: set[asyncio.Task] = set()
         self._reader_task: Optional[asyncio.Task] = None
         self._id_lock = asyncio.Lock()
+        self._closed = False
+        self._close_callbacks: list[Callable[[str], None]] = []
 
     async def start(self) -> None:
         """Start the background message reader task."""
         if self._reader_task is not None:
             return
 
+        self._closed = False
         self._reader_task = asyncio.create_task(self._message_reader_loop())
         logger.info("JSON-RPC client started")
 
@@ -32,6 +72,7 @@ class JsonRpcClient:
         if self._reader_task is None:
             return
 
+        self._closed = True
         self._reader_task.cancel()
         try:
             await self._reader_task
@@ -40,6 +81,9 @@ class JsonRpcClient:
 
         self._reader_task = None
 
+        for task in list(self._request_tasks):
+            task.cancel()
+
         # Cancel all pending requests
         for future in self._pending_requests.values():
             if not future.done():
@@ -48,6 +92,46 @@ class JsonRpcClient:
 
         logger.info("JSON-RPC client stopped")
 
+    def use_process(self, process_manager: ProcessManager) -> None:
+        """Talk to another, already initialized process; only while stopped."""
+        if self._reader_task is not None:
+            raise RuntimeError("Stop the client before switching processes")
+        self._process = process_manager
+
+    @property
+    def is_closed(self) -> bool:
+        """True once the connection was lost or the client was stopped."""
+        return self._closed
+
+    def on_close(self, callback: Callable[[str], None]) -> None:
+        """Register ``callback(reason)`` for when the app-server connection is lost.
+
+        Not called for a deliberate stop().
+        """
+        self._close_callbacks.append(callback)
+
+    def connection_lost(self, reason: str) -> None:
+        """Fail every pending request at once and notify close callbacks.
+
+        Called when the reader hits EOF or the subprocess exits; later
+        calls are ignored until the client is started again.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        pending = list(self._pending_requests.values())
+        for future in pending:
+            if not future.done():
+                future.set_exception(ProcessCrashedError(f"App-server process {reason}"))
+        logger.error("App-server connection lost", reason=reason, failed_requests=len(pending))
+
+        for callback in self._close_callbacks:
+            try:
+                callback(reason)
+            except Exception as e:
+                logger.error("Close callback error", error=str(e))
+
     async def _get_next_id(self) -> int:
         """Generate unique request ID."""
         async with self._id_lock:
@@ -73,8 +157,12 @@ class JsonRpcClient:
         # Create future for response
         future: asyncio.Future = asyncio.get_event_loop().create_future()
         self._pending_requests[request_id] = future
+        started = time.perf_counter()
 
         try:
+            if self._closed:
+                raise ProcessCrashedError("App-server connection is closed")
+
             # Send request
             await self._process.send_message(request)
 
@@ -93,22 +181,103 @@ class JsonRpcClient:
 
         except asyncio.TimeoutError:
             logger.error("Request timeout", method=method, id=request_id)
+            metrics.rpc_errors.inc(method=method, error="timeout")
+            raise
+        except Exception as e:
+            metrics.rpc_errors.inc(method=method, error=type(e).__name__)
             raise
         finally:
             self._pending_requests.pop(request_id, None)
+            metrics.rpc_latency.observe(time.perf_counter() - started, method=method)
 
-    def on_notification(self, method: str, handler: Callable) -> None:
-        """Register a handler for a notification type."""
-        if method not in self._notification_handlers:
-            self._notification_handlers[method] = []
-        self._notification_handlers[method].append(handler)
+    def _handler_table(
+        self,
+        method: str,
+        thread_id: Optional[str],
+        turn_id: Optional[str],
+    ) -> tuple[dict, Any]:
+        if thread_id is not None and turn_id is not None:
+            raise ValueError("Scope a handler by thread_id or turn_id, not both")
+        if turn_id is not None:
+            return self._turn_handlers, (method, turn_id)
+        if thread_id is not None:
+            return self._thread_handlers, (method, thread_id)
+        return self._notification_handlers, method
+
+    def on_notification(
+        self,
+        method: str,
+        handler: Callable,
+        thread_id: Optional[str] = None,
+        turn_id: Optional[str] = None,
+    ) -> None:
+        """Register a handler for a notification type.
+
+        Handlers scoped by ``thread_id`` or ``turn_id`` only receive
+        notifications for that thread or turn; unscoped handlers receive
+        every notification of the method. Handlers registered for ``"*"``
+        match all methods and are called as ``handler(method, params)``.
+        """
+        table, key = self._handler_table(method, thread_id, turn_id)
+        table.setdefault(key, []).append(handler)
 
-    def remove_notification_handler(self, method: str, handler: Callable) -> None:
+    def remove_notification_handler(
+        self,
+        method: str,
+        handler: Callable,
+        thread_id: Optional[str] = None,
+        turn_id: Optional[str] = None,
+    ) -> None:
         """Remove a notification handler."""
-        if method in self._notification_handlers:
-            self._notification_handlers[method] = [
-                h for h in self._notification_handlers[method] if h != handler
-            ]
+        table, key = self._handler_table(method, thread_id, turn_id)
+        handlers = table.get(key)
+        if handlers is None:
+            return
+        handlers[:] = [h for h in handlers if h != handler]
+        if not handlers:
+            del table[key]
+
+    def on_request(self, method: str, handler: Callable[[dict], Any]) -> None:
+        """Answer server-initiated requests of ``method`` with ``handler(params)``.
+
+        The handler returns the result dict, or an awaitable of it, and may
+        raise JsonRpcError to answer with an error. Synchronous handlers are
+        answered inline from the reader loop; awaitables run in a task so a
+        slow answer does not hold up other messages.
+        """
+        self._request_handlers[method] = handler
+
+    def remove_request_handler(self, method: str) -> None:
+        """Stop answering a server-initiated request method."""
+        self._request_handlers.pop(method, None)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of requests awaiting a response."""
+        return len(self._pending_requests)
+
+    @property
+    def handler_count(self) -> int:
+        """Number of registered notification handlers across all tiers."""
+        return sum(
+            len(handlers)
+            for table in (self._notification_handlers, self._thread_handlers, self._turn_handlers)
+            for handlers in table.values()
+        )
+
+    def _matching_handlers(self, method: str, params: dict) -> tuple[list, list]:
+        """Collect method and wildcard handlers with O(1) lookups per tier."""
+        thread_id, turn_id = notification_scope(params)
+        matched: tuple[list, list] = ([], [])
+
+        for key, handlers in zip((method, WILDCARD), matched):
+            handlers.extend(self._notification_handlers.get(key, ()))
+            if thread_id is not None:
+                handlers.extend(self._thread_handlers.get((key, thread_id), ()))
+            if turn_id is not None:
+                handlers.extend(self._turn_handlers.get((key, turn_id), ()))
+
+        return matched
 
     async def wait_for_notification(
         self,
@@ -154,13 +323,25 @@ class JsonRpcClient:
             raise
         except Exception as e:
             logger.error("Message reader loop error", error=str(e))
-            raise
+            self.connection_lost(f"reader failed: {e}")
+            return
+
+        returncode = self._process.returncode
+        if returncode is None:
+            self.connection_lost("closed stdout")
+        else:
+            self.connection_lost(f"exited with code {returncode}")
 
     async def _handle_message(self, message: dict) -> None:
         """Route a message to the appropriate handler."""
-        # Check if this is a response (has id)
-        if "id" in message and message["id"] is not None:
-            request_id = message["id"]
+        request_id = message.get("id")
+
+        # Server-initiated request (has id and method)
+        if request_id is not None and "method" in message:
+            await self._handle_server_request(request_id, message["method"], message.get("params") or {})
+
+        # Response to one of our requests (has id)
+        elif request_id is not None:
             future = self._pending_requests.get(request_id)
 
             if future is not None and not future.done():
@@ -170,22 +351,88 @@ class JsonRpcClient:
 
         # Check if this is a notification (has method, no id)
         elif "method" in message:
-            method = message["method"]
-            params = message.get("params", {})
-
-            handlers = self._notification_handlers.get(method, [])
-            for handler in handlers:
-                try:
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(params)
-                    else:
-                        handler(params)
-                except Exception as e:
-                    logger.error(
-                        "Notification handler error",
-                        method=method,
-                        error=str(e),
-                    )
+            await self.dispatch_notification(message["method"], message.get("params") or {})
+
+    async def _handle_server_request(self, request_id: Any, method: str, params: dict) -> None:
+        """Answer a request the app-server sent to the bridge."""
+        handler = self._request_handlers.get(method)
+        if handler is None:
+            logger.warning("Unhandled server request", method=method, id=request_id)
+            self._respond(
+                request_id,
+                error={"code": METHOD_NOT_FOUND, "message": f"Bridge does not handle {method}"},
+            )
+            return
+
+        try:
+            result = handler(params)
+        except JsonRpcError as e:
+            self._respond(request_id, error=e.to_dict())
+            return
+        except Exception as e:
+            logger.error("Server request handler error", method=method, error=str(e))
+            self._respond(request_id, error={"code": INTERNAL_ERROR, "message": str(e)})
+            return
+
+        if inspect.isawaitable(result):
+            task = asyncio.create_task(self._respond_later(request_id, method, result))
+            self._request_tasks.add(task)
+            task.add_done_callback(self._request_tasks.discard)
+        else:
+            self._respond(request_id, result=result)
+
+    async def _respond_later(self, request_id: Any, method: str, pending: Any) -> None:
+        try:
+            result = await pending
+        except JsonRpcError as e:
+            self._respond(request_id, error=e.to_dict())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Server request handler error", method=method, error=str(e))
+            self._respond(request_id, error={"code": INTERNAL_ERROR, "message": str(e)})
+        else:
+            self._respond(request_id, result=result)
+
+    def _respond(self, request_id: Any, result: Optional[dict] = None, error: Optional[dict] = None) -> None:
+        """Send the response to a server-initiated request.
+
+        Never waits for stdin queue space, so the reader loop calling this
+        keeps reading stdout. Fails only when the process is gone, and the
+        request with it.
+        """
+        message: dict = {"id": request_id}
+        if error is not None:
+            message["error"] = error
+        else:
+            message["result"] = result if result is not None else {}
+        try:
+            self._process.send_reply(message)
+        except ProcessUnavailableError as e:
+            metrics.rpc_errors.inc(method="reply", error=type(e).__name__)
+            logger.error("Could not answer server request", id=request_id, error=str(e))
+
+    async def dispatch_notification(self, method: str, params: dict) -> None:
+        """Deliver a notification to every matching handler."""
+        method_handlers, wildcard_handlers = self._matching_handlers(method, params)
+        for handler in method_handlers:
+            await self._invoke_handler(handler, method, params)
+        for handler in wildcard_handlers:
+            await self._invoke_handler(handler, method, method, params)
+
+    async def _invoke_handler(self, handler: Callable, method: str, *args: Any) -> None:
+        """Run a notification handler, logging instead of raising errors."""
+        try:
+            if asyncio.iscoroutinefunction(handler):
+                await handler(*args)
+            else:
+                handler(*args)
+        except Exception as e:
+            logger.error(
+                "Notification handler error",
+                method=method,
+                error=str(e),
+            )
 
 
 class JsonRpcError(Exception):
@@ -0,0 +1,157 @@
+import asyncio
+import copy
+import json
+import time
+from typing import Awaitable, Callable
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Writes that make cached results of other methods stale
+INVALIDATED_BY = {
+    "skills/config/write": ("skills/list",),
+    "config/value/write": ("config/read", "skills/list", "model/list"),
+    "config/batchWrite": ("config/read", "skills/list", "model/list"),
+    "config/mcpServer/reload": ("config/read",),
+}
+
+# Params that force a fresh call and are not part of the cache key
+BYPASS_PARAMS = ("forceReload",)
+
+
+class MethodCache:
+    """TTL memoization for idempotent read methods of the app-server.
+
+    Entries are keyed by method and canonical params (so ``cwd``/``cwds``
+    get separate entries). Concurrent misses for the same key share one
+    app-server call, and writes listed in INVALIDATED_BY bust the methods
+    they affect. Every caller gets its own copy of the result, so one
+    caller changing it cannot alter what the others see.
+    """
+
+    def __init__(self, ttls: dict[str, float], max_entries_per_method: int = 256):
+        self._ttls = {method: ttl for method, ttl in ttls.items() if ttl > 0}
+        self._max_entries = max_entries_per_method
+        self._entries: dict[str, dict[str, tuple[float, dict]]] = {}
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+        self._generation: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.invalidations = 0
+
+    def is_cached(self, method: str) -> bool:
+        return method in self._ttls
+
+    def attach(self, client) -> None:
+        """Bust cached methods after successful writes through the client."""
+        for write_method in INVALIDATED_BY:
+            client.on_result(write_method, self._make_write_observer(write_method))
+
+    def _make_write_observer(self, write_method: str) -> Callable[[dict, dict], None]:
+        def on_write(params: dict, result: dict) -> None:
+            for method in INVALIDATED_BY[write_method]:
+                self.invalidate(method)
+
+        return on_write
+
+    @staticmethod
+    def _key(params: dict) -> str:
+        keyed = {k: v for k, v in params.items() if k not in BYPASS_PARAMS}
+        return json.dumps(keyed, sort_keys=True, separators=(",", ":"))
+
+    async def call(
+        self,
+        method: str,
+        params: dict,
+        fetch: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        """Return a cached result for ``method`` or call ``fetch`` and cache it."""
+        ttl = self._ttls.get(method)
+        if ttl is None:
+            return await fetch()
+        return copy.deepcopy(await self._lookup(method, params, ttl, fetch))
+
+    async def _lookup(
+        self,
+        method: str,
+        params: dict,
+        ttl: float,
+        fetch: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        key = self._key(params)
+        bypass = any(params.get(name) for name in BYPASS_PARAMS)
+
+        if bypass:
+            self.bypasses += 1
+        else:
+            entry = self._entries.get(method, {}).get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+
+            inflight = self._inflight.get((method, key))
+            if inflight is not None:
+                self.hits += 1
+                return await asyncio.shield(inflight)
+
+            self.misses += 1
+
+        generation = self._generation.get(method, 0)
+        if bypass:
+            result = await fetch()
+            self._store(method, key, ttl, generation, result)
+            return result
+
+        # The fetch runs in its own task so that a caller being cancelled
+        # does not cancel it for the others waiting on the same key
+        task = asyncio.ensure_future(self._fetch(method, key, ttl, generation, fetch))
+        self._inflight[(method, key)] = task
+        task.add_done_callback(lambda done: self._fetched(method, key, done))
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        method: str,
+        key: str,
+        ttl: float,
+        generation: int,
+        fetch: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        result = await fetch()
+        self._store(method, key, ttl, generation, result)
+        return result
+
+    def _fetched(self, method: str, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get((method, key)) is task:
+            del self._inflight[(method, key)]
+        if not task.cancelled():
+            # Mark retrieved so a failure nobody waited for is not logged as unhandled
+            task.exception()
+
+    def _store(self, method: str, key: str, ttl: float, generation: int, result: dict) -> None:
+        # Skip storing if a write busted the method while we were fetching
+        if self._generation.get(method, 0) != generation:
+            return
+        entries = self._entries.setdefault(method, {})
+        entries.pop(key, None)
+        entries[key] = (time.monotonic() + ttl, result)
+        while len(entries) > self._max_entries:
+            del entries[next(iter(entries))]
+
+    def invalidate(self, method: str) -> None:
+        """Drop all cached results of a method."""
+        self._generation[method] = self._generation.get(method, 0) + 1
+        if self._entries.pop(method, None):
+            self.invalidations += 1
+            logger.debug("Method cache invalidated", method=method)
+
+    def stats(self) -> dict:
+        return {
+            "methods": dict(self._ttls),
+            "entries": sum(len(entries) for entries in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "invalidations": self.invalidations,
+        }
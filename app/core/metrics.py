@@ -0,0 +1,249 @@
+import asyncio
+import math
+from typing import Callable, Iterable, Optional
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# (label values, value) pairs produced by a collect callback
+Samples = Iterable[tuple[tuple[str, ...], float]]
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TURN_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        collect: Optional[Callable[[], Samples]] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._collect = collect
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Samples:
+        if self._collect is not None:
+            return self._collect()
+        return self._values.items()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for labels, value in self.samples():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic counter, optionally read from a collect callback at scrape time."""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Point-in-time value, optionally read from a collect callback at scrape time."""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            # [bucket counts..., sum, count]
+            series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, series in self._series.items():
+            cumulative = 0
+            for index, bound in enumerate(self.buckets):
+                cumulative += series[index]
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{label_str} {series[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ordered set of metrics rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                logger.error("Metric collection failed", metric=metric.name, error=str(e))
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+rpc_latency = registry.register(
+    Histogram(
+        "codex_rpc_latency_seconds",
+        "JSON-RPC call latency by method, measured in JsonRpcClient.call",
+        ("method",),
+    )
+)
+rpc_errors = registry.register(
+    Counter(
+        "codex_rpc_errors_total",
+        "JSON-RPC calls that failed, by method and error type",
+        ("method", "error"),
+    )
+)
+turn_duration = registry.register(
+    Histogram(
+        "codex_turn_duration_seconds",
+        "Time from turn/start to turn/completed",
+        ("status",),
+        buckets=TURN_BUCKETS,
+    )
+)
+turn_first_item = registry.register(
+    Histogram(
+        "codex_turn_time_to_first_item_seconds",
+        "Time from turn/start to the first item notification of the turn",
+        buckets=LATENCY_BUCKETS + TURN_BUCKETS[3:],
+    )
+)
+turn_queue_wait = registry.register(
+    Histogram(
+        "codex_turn_queue_wait_seconds",
+        "Time a turn/start waited for an earlier turn on the same thread",
+        buckets=LATENCY_BUCKETS + TURN_BUCKETS[-3:],
+    )
+)
+turn_interrupts = registry.register(
+    Counter(
+        "codex_turn_interrupts_total",
+        "turn/interrupt sent for turns whose caller gave up, by reason",
+        ("reason",),
+    )
+)
+tenant_queue_wait = registry.register(
+    Histogram(
+        "codex_tenant_queue_wait_seconds",
+        "Time a turn/start waited for admission by the tenant scheduler",
+        ("tenant",),
+        buckets=LATENCY_BUCKETS + TURN_BUCKETS[-3:],
+    )
+)
+tenant_rejections = registry.register(
+    Counter(
+        "codex_tenant_rejections_total",
+        "turn/start calls refused by the tenant scheduler, by tenant and reason",
+        ("tenant", "reason"),
+    )
+)
+approval_decisions = registry.register(
+    Counter(
+        "codex_approval_decisions_total",
+        "Answered app-server approval requests by kind, decision and source",
+        ("kind", "decision", "source"),
+    )
+)
+stream_deltas = registry.register(
+    Counter(
+        "codex_stream_deltas_total",
+        "Delta notifications received for outbound streams and frames sent after coalescing",
+        ("stage",),
+    )
+)
+item_fields_spilled = registry.register(
+    Counter(
+        "codex_item_fields_spilled_total",
+        "Item fields cut from turn results, by whether the full value went to the blob store",
+        ("action",),
+    )
+)
+ws_connections = registry.register(
+    Gauge("codex_ws_connections", "Open WebSocket gateway connections")
+)
+event_loop_lag = registry.register(
+    Histogram(
+        "codex_event_loop_lag_seconds",
+        "Delay of a periodic event-loop wakeup past its scheduled time",
+        buckets=LAG_BUCKETS,
+    )
+)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Record how late the event loop wakes up from a fixed sleep."""
+    loop = asyncio.get_event_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(0.0, loop.time() - scheduled))
@@ -1,11 +1,52 @@
 import asyncio
-import json
+import os
+from collections import deque
 import structlog
 from typing import Optional, AsyncIterator
 
+from .codec import get_codec
+from .stderr_log import StderrBuffer
+from .transport import LineReader
+from ..config import settings
+
 logger = structlog.get_logger(__name__)
 
 
+def _read_rss(pid: int) -> int:
+    """VmRSS of ``pid`` in bytes, 0 if it is gone."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def _child_pids(pid: int) -> list[int]:
+    children = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+class ProcessUnavailableError(RuntimeError):
+    """The app-server process cannot accept work right now."""
+
+
+class StdinQueueFullError(ProcessUnavailableError):
+    """The outbound stdin queue stayed full past the enqueue timeout."""
+
+
+class ProcessCrashedError(ProcessUnavailableError):
+    """The app-server process exited while the request was in flight."""
+
+
 class ProcessManager:
     """Manages the lifecycle of the codex app-server subprocess."""
 
@@ -23,14 +64,43 @@ class ProcessManager:
             "version": client_version,
         }
         self._process: Optional[asyncio.subprocess.Process] = None
-        self._stdin_lock = asyncio.Lock()
+        self._reader: Optional[LineReader] = None
+        self._outbound: Optional[asyncio.Queue] = None
+        # Replies to server requests, written ahead of the bounded queue
+        self._replies: deque[bytes] = deque()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+        self.stderr = StderrBuffer(settings.stderr_buffer_lines, settings.stderr_log_rate)
+        self._codec = get_codec(settings.json_codec)
         self._initialized = False
 
+        self.starts = 0
+        self._bytes_read_base = 0
+
+        # stdin writer counters
+        self.bytes_written = 0
+        self.frames_written = 0
+        self.flushes = 0
+        self.last_flush_bytes = 0
+        self.max_flush_bytes = 0
+        self.rejected_frames = 0
+
     @property
     def is_alive(self) -> bool:
         """Check if the subprocess is running."""
         return self._process is not None and self._process.returncode is None
 
+    @property
+    def returncode(self) -> Optional[int]:
+        """Exit status of the last spawned subprocess, None while it runs."""
+        return self._process.returncode if self._process is not None else None
+
+    async def wait(self) -> Optional[int]:
+        """Wait for the current subprocess to exit and return its exit status."""
+        if self._process is None:
+            return None
+        return await self._process.wait()
+
     async def start(self) -> None:
         """Spawn the codex app-server subprocess."""
         if self.is_alive:
@@ -47,12 +117,31 @@ class ProcessManager:
             stderr=asyncio.subprocess.PIPE,
         )
 
-        logger.info("Codex app-server started", pid=self._process.pid)
+        self.starts += 1
+        if self._reader is not None:
+            self._bytes_read_base += self._reader.bytes_read
+        self._reader = LineReader(
+            self._process.stdout,
+            max_line_bytes=settings.max_message_bytes,
+            chunk_size=settings.read_chunk_bytes,
+        )
+
+        self._outbound = asyncio.Queue(maxsize=settings.stdin_queue_size)
+        self._replies.clear()
+        self._writer_task = asyncio.create_task(self._stdin_writer_loop(self._process.stdin))
+        self._stderr_task = asyncio.create_task(
+            self.stderr.pump(self._process.stderr, self._process.pid)
+        )
+
+        logger.info("Codex app-server started", pid=self._process.pid, codec=self._codec.name)
         self._initialized = False
 
     async def stop(self) -> None:
         """Gracefully terminate the subprocess."""
+        await self._stop_writer()
+
         if not self.is_alive:
+            await self._stop_stderr()
             return
 
         logger.info("Stopping codex app-server")
@@ -65,33 +154,197 @@ class ProcessManager:
             self._process.kill()
             await self._process.wait()
 
+        await self._stop_stderr()
         self._process = None
         self._initialized = False
         logger.info("Codex app-server stopped")
 
+    async def _stop_stderr(self) -> None:
+        """Let the stderr pump read the remaining output, then cancel it."""
+        if self._stderr_task is None:
+            return
+
+        try:
+            await asyncio.wait_for(asyncio.shield(self._stderr_task), timeout=1.0)
+        except (asyncio.TimeoutError, Exception):
+            self._stderr_task.cancel()
+            try:
+                await self._stderr_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._stderr_task = None
+
+    async def _stop_writer(self) -> None:
+        """Cancel the stdin writer task."""
+        if self._writer_task is None:
+            return
+
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._writer_task = None
+
+    async def _stdin_writer_loop(self, stdin: asyncio.StreamWriter) -> None:
+        """Coalesce all queued frames into one write and drain per tick."""
+        queue = self._outbound
+        while True:
+            frames = [await queue.get()]
+            while not queue.empty():
+                frames.append(queue.get_nowait())
+            if self._replies:
+                frames[:0] = self._replies
+                self._replies.clear()
+            # Drop the empty frames send_reply() wakes the writer with
+            frames = [frame for frame in frames if frame]
+            if not frames:
+                continue
+
+            data = b"".join(frames) if len(frames) > 1 else frames[0]
+            try:
+                stdin.write(data)
+                await stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as e:
+                logger.error("stdin write failed", error=str(e))
+                return
+
+            self.flushes += 1
+            self.frames_written += len(frames)
+            self.bytes_written += len(data)
+            self.last_flush_bytes = len(data)
+            self.max_flush_bytes = max(self.max_flush_bytes, len(data))
+
+    def rss_bytes(self) -> Optional[int]:
+        """Resident memory of the subprocess and its descendants.
+
+        Read from ``/proc``; None where that is unavailable.
+        """
+        if self._process is None or not os.path.isdir("/proc"):
+            return None
+
+        total = 0
+        pending = [self._process.pid]
+        while pending:
+            pid = pending.pop()
+            total += _read_rss(pid)
+            pending.extend(_child_pids(pid))
+        return total
+
+    @property
+    def queue_depth(self) -> int:
+        """Frames waiting for the stdin writer."""
+        return self._outbound.qsize() if self._outbound is not None else 0
+
+    def stdin_stats(self) -> dict:
+        """Outbound queue and write-coalescing counters."""
+        return {
+            "queue_depth": self.queue_depth,
+            "queue_capacity": settings.stdin_queue_size,
+            "frames_written": self.frames_written,
+            "bytes_written": self.bytes_written,
+            "flushes": self.flushes,
+            "avg_flush_bytes": self.bytes_written // self.flushes if self.flushes else 0,
+            "last_flush_bytes": self.last_flush_bytes,
+            "max_flush_bytes": self.max_flush_bytes,
+            "rejected_frames": self.rejected_frames,
+        }
+
     async def send_message(self, message: dict) -> None:
-        """Write a JSON message to subprocess stdin."""
-        if not self.is_alive or self._process.stdin is None:
-            raise RuntimeError("Process not running")
+        """Queue a JSON message for the subprocess stdin writer.
 
-        line = json.dumps(message) + "\n"
-        async with self._stdin_lock:
-            self._process.stdin.write(line.encode())
-            await self._process.stdin.drain()
+        Waits up to ``settings.stdin_enqueue_timeout`` for queue space and
+        raises StdinQueueFullError if none frees up (0 rejects immediately).
+        """
+        if (
+            not self.is_alive
+            or self._outbound is None
+            or self._writer_task is None
+            or self._writer_task.done()
+        ):
+            raise ProcessUnavailableError("Process not running")
+
+        frame = self._codec.dumps_line(message)
+        try:
+            if settings.stdin_enqueue_timeout > 0:
+                await asyncio.wait_for(
+                    self._outbound.put(frame),
+                    timeout=settings.stdin_enqueue_timeout,
+                )
+            else:
+                self._outbound.put_nowait(frame)
+        except (asyncio.QueueFull, asyncio.TimeoutError):
+            self.rejected_frames += 1
+            logger.warning("stdin queue full", depth=self.queue_depth, method=message.get("method"))
+            raise StdinQueueFullError("App-server stdin queue is full")
 
         logger.debug("Sent message", method=message.get("method"), id=message.get("id"))
 
+    def send_reply(self, message: dict) -> None:
+        """Queue the response to a server-initiated request without waiting.
+
+        Replies skip the ``stdin_queue_size`` bound: the app-server waits
+        for them, and the caller is the stdout reader, which must not block.
+
+        Raises:
+            ProcessUnavailableError: If the process is not running.
+        """
+        if (
+            not self.is_alive
+            or self._outbound is None
+            or self._writer_task is None
+            or self._writer_task.done()
+        ):
+            raise ProcessUnavailableError("Process not running")
+
+        self._replies.append(self._codec.dumps_line(message))
+        try:
+            # Wake the writer; a full queue means it has frames to get anyway
+            self._outbound.put_nowait(b"")
+        except asyncio.QueueFull:
+            pass
+        logger.debug("Sent reply", id=message.get("id"))
+
+    @property
+    def bytes_read(self) -> int:
+        """Total bytes read from subprocess stdout across restarts."""
+        current = self._reader.bytes_read if self._reader is not None else 0
+        return self._bytes_read_base + current
+
+    def take_over(self, previous: "ProcessManager") -> None:
+        """Continue the counters of a process this one replaces."""
+        self.starts += previous.starts
+        self._bytes_read_base += previous.bytes_read
+        self.bytes_written += previous.bytes_written
+        self.frames_written += previous.frames_written
+        self.flushes += previous.flushes
+        self.max_flush_bytes = max(self.max_flush_bytes, previous.max_flush_bytes)
+        self.rejected_frames += previous.rejected_frames
+
+    @property
+    def restarts(self) -> int:
+        """Number of times the subprocess was spawned again after the first start."""
+        return max(self.starts - 1, 0)
+
     async def read_line(self) -> Optional[dict]:
-        """Read a single JSON line from subprocess stdout."""
-        if not self.is_alive or self._process.stdout is None:
+        """Read a single JSON line from subprocess stdout.
+
+        Frames that fail to parse are logged and skipped.
+        """
+        if not self.is_alive or self._reader is None:
             return None
 
-        try:
-            line = await self._process.stdout.readline()
-            if not line:
+        while True:
+            frame = await self._reader.read_frame()
+            if frame is None:
                 return None
 
-            data = json.loads(line.decode().strip())
+            try:
+                data = self._codec.loads(frame)
+            except ValueError as e:
+                logger.error("Failed to parse JSON", error=str(e), line=frame[:200])
+                continue
+
             logger.debug(
                 "Received message",
                 method=data.get("method"),
@@ -100,9 +353,6 @@ class ProcessManager:
                 has_error="error" in data,
             )
             return data
-        except json.JSONDecodeError as e:
-            logger.error("Failed to parse JSON", error=str(e), line=line)
-            return None
 
     async def read_messages(self) -> AsyncIterator[dict]:
         """Yield parsed JSON messages from subprocess stdout."""
@@ -119,7 +369,7 @@ class ProcessManager:
             return {}
 
         if not self.is_alive:
-            raise RuntimeError("Process not running")
+            raise ProcessUnavailableError("Process not running")
 
         # Send initialize request
         init_request = {
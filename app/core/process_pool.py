@@ -0,0 +1,732 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Optional
+import structlog
+
+from .process_manager import ProcessManager, ProcessUnavailableError
+from . import metrics
+from .admission import ThreadTurnQueue
+from .jsonrpc_client import JsonRpcClient
+from .method_cache import MethodCache
+from .tenants import TenantScheduler, current_tenant
+from .turn_runner import interrupt_turn
+from ..config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Methods whose result carries a thread that becomes loaded in the serving process
+THREAD_OWNING_METHODS = ("thread/start", "thread/resume", "thread/fork")
+
+# turn/completed notifications remembered until their turn/start response arrives
+MAX_EARLY_COMPLETIONS = 1024
+
+
+class PoolMember:
+    """A single initialized codex app-server process and its JSON-RPC client."""
+
+    def __init__(self, index: int, process_manager: ProcessManager, client: JsonRpcClient):
+        self.index = index
+        self.process = process_manager
+        self.client = client
+        self.inflight = 0
+        self.threads: set[str] = set()
+        # turnId -> threadId of turns started through this member
+        self.active_turns: dict[str, str] = {}
+        # Turns whose turn/completed overtook the turn/start response
+        self._completed_early: OrderedDict[str, None] = OrderedDict()
+        self.restarting = False
+        # Excluded from new threads while waiting to be recycled
+        self.draining = False
+        self.crashes = 0
+        self.recycles = 0
+        # Turns started on the current subprocess
+        self.turns_served = 0
+        # Last watchdog readings
+        self.probe_rtt: Optional[float] = None
+        self.probe_failures = 0
+        self.rss_bytes: Optional[int] = None
+        self.started_at = 0.0
+        self.restart_delay = 0.0
+        self.supervisor: Optional[asyncio.Task] = None
+        self._exit_watch: Optional[asyncio.Task] = None
+
+    @property
+    def load(self) -> int:
+        """In-flight requests plus turns still running on this process."""
+        return self.inflight + len(self.active_turns)
+
+    def turn_started(self, turn_id: str, thread_id: Optional[str]) -> None:
+        """Count a turn as running until turn_completed(), unless it already completed."""
+        if turn_id in self._completed_early:
+            del self._completed_early[turn_id]
+            return
+        self.active_turns[turn_id] = thread_id
+
+    def turn_completed(self, turn_id: str) -> None:
+        if self.active_turns.pop(turn_id, None) is None:
+            self._completed_early[turn_id] = None
+            while len(self._completed_early) > MAX_EARLY_COMPLETIONS:
+                self._completed_early.popitem(last=False)
+
+    async def start(self, timeout: float) -> None:
+        """Spawn, initialize and attach the reader for this member."""
+        await self.process.start()
+        await self.process.initialize(timeout=timeout)
+        await self.client.start()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.started_at = time.monotonic()
+        self.turns_served = 0
+        self.probe_failures = 0
+        self._exit_watch = asyncio.create_task(self._watch_exit())
+
+    async def stop(self) -> None:
+        """Stop the reader and terminate the subprocess."""
+        if self._exit_watch is not None:
+            self._exit_watch.cancel()
+            self._exit_watch = None
+        await self.client.stop()
+        await self.process.stop()
+
+    async def swap_process(self, process: ProcessManager) -> ProcessManager:
+        """Serve from an already initialized process; returns the replaced one.
+
+        Handler registrations live on the client, so they carry over as is.
+        """
+        if self._exit_watch is not None:
+            self._exit_watch.cancel()
+            self._exit_watch = None
+        await self.client.stop()
+
+        previous = self.process
+        process.take_over(previous)
+        self.process = process
+        self.client.use_process(process)
+        await self.client.start()
+        self._reset()
+        return previous
+
+    async def _watch_exit(self) -> None:
+        """Fail the connection as soon as the subprocess exits.
+
+        Covers exits the reader does not see as EOF, e.g. when a child of
+        the app-server keeps its stdout open.
+        """
+        returncode = await self.process.wait()
+        self.client.connection_lost(f"exited with code {returncode}")
+
+    def stats(self) -> dict:
+        return {
+            "index": self.index,
+            "alive": self.process.is_alive,
+            "restarting": self.restarting,
+            "draining": self.draining,
+            "crashes": self.crashes,
+            "recycles": self.recycles,
+            "restarts": self.process.restarts,
+            "turns_served": self.turns_served,
+            "probe_rtt_ms": round(self.probe_rtt * 1000, 2) if self.probe_rtt is not None else None,
+            "probe_failures": self.probe_failures,
+            "rss_bytes": self.rss_bytes,
+            "inflight": self.inflight,
+            "active_turns": len(self.active_turns),
+            "threads": len(self.threads),
+            "stdin": self.process.stdin_stats(),
+            "stderr": self.process.stderr.stats(),
+        }
+
+
+class ProcessPool:
+    """Pool of codex app-server processes with thread-affinity routing.
+
+    Exposes the same call/notification surface as JsonRpcClient. Requests
+    carrying a ``threadId`` go to the process that owns the thread; new
+    threads and thread-less requests go to the least-loaded member.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        codex_path: str = "codex",
+        client_name: str = "codex-bridge-server",
+        client_title: str = "Codex Bridge Server",
+        client_version: str = "0.1.0",
+        standby: int = 0,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self._process_kwargs = {
+            "codex_path": codex_path,
+            "client_name": client_name,
+            "client_title": client_title,
+            "client_version": client_version,
+        }
+        self._members = [self._create_member(index, **self._process_kwargs) for index in range(size)]
+        # Spawned and initialized processes waiting to replace a failed member
+        self._standby_target = standby
+        self._standbys: deque[ProcessManager] = deque()
+        self._standby_watches: dict[ProcessManager, asyncio.Task] = {}
+        self._standby_task: Optional[asyncio.Task] = None
+        self._thread_owner: dict[str, PoolMember] = {}
+        self._result_observers: dict[str, list[Callable]] = {}
+        self._method_cache: Optional[MethodCache] = None
+        self._turn_queue: Optional[ThreadTurnQueue] = None
+        self._scheduler: Optional[TenantScheduler] = None
+        self._stopping = False
+
+        for member in self._members:
+            member.client.on_close(self._make_close_handler(member))
+
+    @staticmethod
+    def _create_member(index: int, **process_kwargs: Any) -> PoolMember:
+        process_manager = ProcessManager(**process_kwargs)
+        return PoolMember(index, process_manager, JsonRpcClient(process_manager))
+
+    @property
+    def members(self) -> list[PoolMember]:
+        return list(self._members)
+
+    @property
+    def is_alive(self) -> bool:
+        """Check if every pooled subprocess is running."""
+        return all(member.process.is_alive for member in self._members)
+
+    @property
+    def standby_count(self) -> int:
+        """Initialized standby processes ready to take over."""
+        return len(self._standbys)
+
+    async def start(self) -> None:
+        """Spawn and initialize all members concurrently.
+
+        Standbys are spawned alongside but do not delay readiness.
+        """
+        logger.info("Starting process pool", size=len(self._members), standby=self._standby_target)
+
+        self._ensure_standbys()
+        await asyncio.gather(
+            *(member.start(settings.initialization_timeout) for member in self._members)
+        )
+
+        for member in self._members:
+            member.client.on_notification(
+                "turn/completed", self._make_turn_completed_handler(member)
+            )
+
+        logger.info("Process pool ready", size=len(self._members))
+
+    async def stop(self) -> None:
+        """Stop all members."""
+        self._stopping = True
+        for member in self._members:
+            if member.supervisor is not None:
+                member.supervisor.cancel()
+        if self._standby_task is not None:
+            self._standby_task.cancel()
+        for watch in self._standby_watches.values():
+            watch.cancel()
+        self._standby_watches.clear()
+
+        standbys = list(self._standbys)
+        self._standbys.clear()
+        await asyncio.gather(
+            *(member.stop() for member in self._members),
+            *(process.stop() for process in standbys),
+            return_exceptions=True,
+        )
+        self._thread_owner.clear()
+        logger.info("Process pool stopped")
+
+    def _make_turn_completed_handler(self, member: PoolMember) -> Callable:
+        def on_turn_completed(params: dict) -> None:
+            turn_id = params.get("turn", {}).get("id")
+            if turn_id is not None:
+                member.turn_completed(turn_id)
+                thread_id = params.get("threadId")
+                if self._turn_queue is not None and thread_id is not None:
+                    self._turn_queue.turn_completed(thread_id, turn_id)
+                if self._scheduler is not None:
+                    self._scheduler.turn_completed(turn_id)
+
+        return on_turn_completed
+
+    def _make_close_handler(self, member: PoolMember) -> Callable[[str], None]:
+        def on_close(reason: str) -> None:
+            self._on_member_closed(member, reason)
+
+        return on_close
+
+    def _on_member_closed(self, member: PoolMember, reason: str) -> None:
+        if self._stopping or member.restarting:
+            return
+        logger.error("App-server process crashed", process=member.index, reason=reason)
+        member.crashes += 1
+        member.restarting = True
+        member.supervisor = asyncio.create_task(self._restart_member(member, reason))
+
+    def _ensure_standbys(self) -> None:
+        """Start refilling standbys in the background if any are missing."""
+        if self._stopping or len(self._standbys) >= self._standby_target:
+            return
+        if self._standby_task is None or self._standby_task.done():
+            self._standby_task = asyncio.create_task(self._fill_standbys())
+
+    async def _fill_standbys(self) -> None:
+        delay = 0.0
+        while not self._stopping and len(self._standbys) < self._standby_target:
+            if delay:
+                await asyncio.sleep(delay)
+
+            process = ProcessManager(**self._process_kwargs)
+            try:
+                await process.start()
+                await process.initialize(timeout=settings.initialization_timeout)
+            except Exception as e:
+                delay = min(max(delay * 2, settings.restart_backoff_initial), settings.restart_backoff_max)
+                logger.error("Standby app-server failed to start", error=str(e), retry_in=delay)
+                await process.stop()
+                continue
+
+            delay = 0.0
+            self._standbys.append(process)
+            self._standby_watches[process] = asyncio.create_task(self._watch_standby(process))
+            logger.info("Standby app-server ready", standbys=len(self._standbys))
+
+    async def _watch_standby(self, process: ProcessManager) -> None:
+        returncode = await process.wait()
+        self._standby_watches.pop(process, None)
+        if process in self._standbys:
+            self._standbys.remove(process)
+            logger.warning("Standby app-server exited", returncode=returncode)
+            await process.stop()
+            self._ensure_standbys()
+
+    def _take_standby(self) -> Optional[ProcessManager]:
+        """Pop a live standby in O(1), discarding any that died unnoticed."""
+        while self._standbys:
+            process = self._standbys.popleft()
+            watch = self._standby_watches.pop(process, None)
+            if watch is not None:
+                watch.cancel()
+            if process.is_alive:
+                return process
+            asyncio.create_task(process.stop())
+        return None
+
+    async def _failover(self, member: PoolMember) -> bool:
+        """Swap a standby in for the member's process; False if none is ready."""
+        standby = self._take_standby()
+        if standby is None:
+            return False
+
+        previous = await member.swap_process(standby)
+        self._ensure_standbys()
+        logger.info("Swapped in standby app-server", process=member.index, standbys=len(self._standbys))
+
+        async def retire() -> None:
+            await previous.stop()
+            standby.stderr.merge_older(previous.stderr)
+
+        asyncio.create_task(retire())
+        return True
+
+    async def recycle(self, member: PoolMember, reason: str, drain_timeout: float = 0.0) -> None:
+        """Replace a live member's process once its work has drained.
+
+        New threads avoid the member meanwhile; threads it owns keep being
+        served and are resumed on the replacement. After ``drain_timeout``
+        seconds, remaining turns fail as they would on a crash.
+        """
+        if self._stopping or member.restarting or member.draining:
+            return
+
+        member.draining = True
+        try:
+            deadline = time.monotonic() + drain_timeout
+            while (member.active_turns or member.inflight) and time.monotonic() < deadline:
+                await asyncio.sleep(0.1)
+            if self._stopping or member.restarting:
+                return
+
+            logger.warning("Recycling app-server process", process=member.index, reason=reason)
+            member.recycles += 1
+            member.restarting = True
+            reason = f"recycled ({reason})"
+            member.client.connection_lost(reason)
+            member.supervisor = asyncio.create_task(self._restart_member(member, reason))
+        finally:
+            member.draining = False
+
+    async def _restart_member(self, member: PoolMember, reason: str) -> None:
+        """Fail the member's running turns, replace its process and resume its threads.
+
+        A ready standby is swapped in without waiting for a spawn. Otherwise
+        the process is respawned: the first restart after a stable run is
+        immediate; a member that crashes again within ``restart_backoff_max``
+        seconds of starting waits with exponential backoff between attempts.
+        """
+        # Complete waiting turns now instead of leaving them to time out
+        failed_turns = list(member.active_turns.items())
+        member.active_turns.clear()
+        for turn_id, thread_id in failed_turns:
+            await member.client.dispatch_notification(
+                "turn/completed",
+                {
+                    "threadId": thread_id,
+                    "turn": {
+                        "id": turn_id,
+                        "status": "failed",
+                        "items": [],
+                        "error": {"message": f"App-server process {reason}"},
+                    },
+                },
+            )
+
+        if time.monotonic() - member.started_at >= settings.restart_backoff_max:
+            member.restart_delay = 0.0
+
+        try:
+            while not await self._failover(member):
+                if member.restart_delay:
+                    await asyncio.sleep(member.restart_delay)
+                member.restart_delay = min(
+                    max(member.restart_delay * 2, settings.restart_backoff_initial),
+                    settings.restart_backoff_max,
+                )
+
+                await member.stop()
+                try:
+                    await member.start(settings.initialization_timeout)
+                    break
+                except Exception as e:
+                    logger.error(
+                        "App-server restart failed",
+                        process=member.index,
+                        error=str(e),
+                        retry_in=member.restart_delay,
+                    )
+
+            await self._resume_threads(member)
+        finally:
+            member.restarting = False
+            member.supervisor = None
+
+        logger.info(
+            "App-server process restarted",
+            process=member.index,
+            restarts=member.process.restarts,
+            threads=len(member.threads),
+        )
+
+        # The replacement may have died while we were resuming threads
+        if member.client.is_closed:
+            self._on_member_closed(member, "exited during restart")
+
+    async def _resume_threads(self, member: PoolMember) -> None:
+        """Load the member's threads into its new process again."""
+        thread_ids = list(member.threads)
+        results = await asyncio.gather(
+            *(
+                member.client.call(
+                    "thread/resume",
+                    {"threadId": thread_id},
+                    timeout=settings.initialization_timeout,
+                )
+                for thread_id in thread_ids
+            ),
+            return_exceptions=True,
+        )
+
+        for thread_id, result in zip(thread_ids, results):
+            if isinstance(result, BaseException):
+                logger.warning("Thread resume after restart failed", thread_id=thread_id, error=str(result))
+                member.threads.discard(thread_id)
+                if self._thread_owner.get(thread_id) is member:
+                    del self._thread_owner[thread_id]
+            else:
+                self._notify_result("thread/resume", {"threadId": thread_id}, result)
+
+    def member_for_thread(self, thread_id: str) -> Optional[PoolMember]:
+        """Return the member that owns a thread, if known."""
+        return self._thread_owner.get(thread_id)
+
+    async def loaded_threads(self, timeout: float = 30.0) -> list[str]:
+        """Thread ids loaded in any live member (``thread/loaded/list`` on each)."""
+        members = [member for member in self._members if not member.restarting]
+        if not members:
+            raise ProcessUnavailableError("No app-server process is available")
+
+        results = await asyncio.gather(
+            *(member.client.call("thread/loaded/list", {}, timeout=timeout) for member in members)
+        )
+        return sorted({thread_id for result in results for thread_id in result.get("data") or []})
+
+    def least_loaded(self) -> PoolMember:
+        """Pick the member with the fewest in-flight requests and running turns."""
+        return min(
+            self._members,
+            key=lambda m: (m.restarting, m.draining, m.load, len(m.threads), m.index),
+        )
+
+    def _select(self, method: str, params: dict) -> PoolMember:
+        if method != "thread/start":
+            thread_id = params.get("threadId")
+            if thread_id is not None:
+                owner = self._thread_owner.get(thread_id)
+                if owner is not None:
+                    return owner
+        return self.least_loaded()
+
+    def _assign_thread(self, thread_id: str, member: PoolMember) -> None:
+        previous = self._thread_owner.get(thread_id)
+        if previous is not None and previous is not member:
+            previous.threads.discard(thread_id)
+        self._thread_owner[thread_id] = member
+        member.threads.add(thread_id)
+
+    def set_method_cache(self, cache: MethodCache) -> None:
+        """Serve read-mostly methods through a TTL cache."""
+        self._method_cache = cache
+        cache.attach(self)
+
+    def set_turn_queue(self, queue: ThreadTurnQueue) -> None:
+        """Run at most one turn per thread, queueing later ``turn/start`` calls."""
+        self._turn_queue = queue
+
+    @property
+    def turn_queue(self) -> Optional[ThreadTurnQueue]:
+        return self._turn_queue
+
+    def set_tenant_scheduler(self, scheduler: TenantScheduler) -> None:
+        """Admit ``turn/start`` calls by tenant limits and weighted fair queueing."""
+        self._scheduler = scheduler
+
+    async def call(
+        self,
+        method: str,
+        params: Optional[dict] = None,
+        timeout: float = 300.0,
+    ) -> dict:
+        """Route a JSON-RPC request to the owning or least-loaded member."""
+        params = params or {}
+        if self._method_cache is not None and self._method_cache.is_cached(method):
+            return await self._method_cache.call(
+                method, params, lambda: self._call(method, params, timeout)
+            )
+        if method == "turn/start" and params.get("threadId") and (
+            self._turn_queue is not None or self._scheduler is not None
+        ):
+            return await self._start_turn(params, timeout)
+        return await self._call(method, params, timeout)
+
+    async def _start_turn(self, params: dict, timeout: float) -> dict:
+        """Send ``turn/start`` once earlier turns on the thread have completed
+        and the tenant scheduler admits it, all within ``timeout``.
+
+        The thread is acquired first so a turn stuck behind its own thread
+        does not hold one of the tenant's running slots. Once sent, the
+        request is left to finish even if the caller gives up, since the
+        turn may already be running; its slots are bound to the turn or
+        released only when the call itself fails, and a turn nobody waits
+        for any more is interrupted.
+        """
+        thread_id = params["threadId"]
+        queue, scheduler = self._turn_queue, self._scheduler
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        if queue is not None:
+            waited = await queue.acquire(thread_id, timeout)
+            if waited:
+                logger.info("Turn waited for thread", thread_id=thread_id, waited=round(waited, 3))
+
+        tenant = None
+        try:
+            if scheduler is not None:
+                name = scheduler.key(current_tenant.get())
+                waited = await scheduler.acquire(name, max(deadline - loop.time(), 0))
+                tenant = name
+                if waited:
+                    logger.info("Turn waited for tenant admission", tenant=tenant, waited=round(waited, 3))
+        except BaseException:
+            if queue is not None:
+                queue.release(thread_id)
+            raise
+
+        start = asyncio.ensure_future(self._call("turn/start", params, settings.request_timeout))
+        start.add_done_callback(
+            lambda future: self._settle_turn_start(future, thread_id, queue, scheduler, tenant)
+        )
+        try:
+            return await asyncio.wait_for(asyncio.shield(start), max(deadline - loop.time(), 0))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if not start.done():
+                reason = "timeout" if isinstance(e, asyncio.TimeoutError) else "cancelled"
+                start.add_done_callback(lambda future: self._interrupt_started(future, thread_id, reason))
+            raise
+
+    def _interrupt_started(self, start: asyncio.Future, thread_id: str, reason: str) -> None:
+        if start.cancelled() or start.exception() is not None:
+            return
+        turn_id = start.result().get("turn", {}).get("id")
+        if turn_id:
+            interrupt_turn(self, thread_id, turn_id, reason)
+
+    @staticmethod
+    def _settle_turn_start(
+        start: asyncio.Future,
+        thread_id: str,
+        queue: Optional[ThreadTurnQueue],
+        scheduler: Optional[TenantScheduler],
+        tenant: Optional[str],
+    ) -> None:
+        turn_id = None
+        if not start.cancelled() and start.exception() is None:
+            turn_id = start.result().get("turn", {}).get("id")
+        if queue is not None:
+            if turn_id:
+                queue.bind(thread_id, turn_id)
+            else:
+                queue.release(thread_id)
+        if tenant is not None:
+            if turn_id:
+                scheduler.bind(tenant, turn_id)
+            else:
+                scheduler.release(tenant)
+
+    async def _call(self, method: str, params: dict, timeout: float) -> dict:
+        member = self._select(method, params)
+        if member.restarting:
+            raise ProcessUnavailableError("App-server process is restarting")
+
+        member.inflight += 1
+        try:
+            result = await member.client.call(method, params, timeout=timeout)
+        finally:
+            member.inflight -= 1
+
+        if method in THREAD_OWNING_METHODS:
+            thread_id = result.get("thread", {}).get("id")
+            if thread_id:
+                self._assign_thread(thread_id, member)
+        elif method == "turn/start":
+            turn_id = result.get("turn", {}).get("id")
+            if turn_id:
+                member.turn_started(turn_id, params.get("threadId"))
+                member.turns_served += 1
+
+        self._notify_result(method, params, result)
+        return result
+
+    def _notify_result(self, method: str, params: dict, result: dict) -> None:
+        for observer in self._result_observers.get(method, ()):
+            try:
+                observer(params, result)
+            except Exception as e:
+                logger.error("Result observer error", method=method, error=str(e))
+
+    def on_result(self, method: str, observer: Callable[[dict, dict], None]) -> None:
+        """Register ``observer(params, result)`` for successful calls of a method."""
+        self._result_observers.setdefault(method, []).append(observer)
+
+    def on_request(self, method: str, handler: Callable[[dict], Any]) -> None:
+        """Answer server-initiated requests of ``method`` from every member."""
+        for member in self._members:
+            member.client.on_request(method, handler)
+
+    def on_notification(
+        self,
+        method: str,
+        handler: Callable,
+        thread_id: Optional[str] = None,
+        turn_id: Optional[str] = None,
+    ) -> None:
+        """Register a notification handler on every member."""
+        for member in self._members:
+            member.client.on_notification(method, handler, thread_id=thread_id, turn_id=turn_id)
+
+    def remove_notification_handler(
+        self,
+        method: str,
+        handler: Callable,
+        thread_id: Optional[str] = None,
+        turn_id: Optional[str] = None,
+    ) -> None:
+        """Remove a notification handler from every member."""
+        for member in self._members:
+            member.client.remove_notification_handler(
+                method, handler, thread_id=thread_id, turn_id=turn_id
+            )
+
+    async def wait_for_notification(
+        self,
+        method: str,
+        predicate: Optional[Callable[[dict], bool]] = None,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """Wait for a notification from any member matching the predicate."""
+        if timeout is None:
+            timeout = settings.request_timeout
+
+        future: asyncio.Future = asyncio.get_event_loop().create_future()
+
+        def handler(params: dict) -> None:
+            if predicate is None or predicate(params):
+                if not future.done():
+                    future.set_result(params)
+
+        self.on_notification(method, handler)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self.remove_notification_handler(method, handler)
+
+    def register_metrics(self, registry: metrics.MetricsRegistry = metrics.registry) -> None:
+        """Expose per-process gauges and counters read at scrape time."""
+
+        def per_member(read: Callable[[PoolMember], float]) -> Callable[[], metrics.Samples]:
+            return lambda: [((str(m.index),), read(m)) for m in self._members]
+
+        for metric_type, name, documentation, read in (
+            (metrics.Gauge, "codex_pending_requests", "Requests awaiting a response", lambda m: m.client.pending_count),
+            (metrics.Gauge, "codex_notification_handlers", "Registered notification handlers", lambda m: m.client.handler_count),
+            (metrics.Gauge, "codex_inflight_requests", "In-flight requests routed to the process", lambda m: m.inflight),
+            (metrics.Gauge, "codex_active_turns", "Turns running on the process", lambda m: len(m.active_turns)),
+            (metrics.Gauge, "codex_stdin_queue_depth", "Frames waiting for the stdin writer", lambda m: m.process.queue_depth),
+            (metrics.Counter, "codex_stdin_bytes_total", "Bytes written to subprocess stdin", lambda m: m.process.bytes_written),
+            (metrics.Counter, "codex_stdin_flushes_total", "Coalesced stdin writes", lambda m: m.process.flushes),
+            (metrics.Counter, "codex_stdout_bytes_total", "Bytes read from subprocess stdout", lambda m: m.process.bytes_read),
+            (metrics.Counter, "codex_process_restarts_total", "Subprocess respawns", lambda m: m.process.restarts),
+            (metrics.Counter, "codex_process_crashes_total", "Unexpected subprocess exits", lambda m: m.crashes),
+            (metrics.Counter, "codex_process_recycles_total", "Subprocesses replaced by the watchdog", lambda m: m.recycles),
+            (metrics.Gauge, "codex_probe_rtt_seconds", "Last watchdog probe round trip", lambda m: m.probe_rtt or 0),
+            (metrics.Gauge, "codex_process_rss_bytes", "Resident memory of the subprocess tree", lambda m: m.rss_bytes or 0),
+        ):
+            registry.register(metric_type(name, documentation, ("process",), collect=per_member(read)))
+
+        registry.register(
+            metrics.Gauge(
+                "codex_standby_processes",
+                "Initialized standby processes ready for failover",
+                collect=lambda: [((), len(self._standbys))],
+            )
+        )
+
+    def method_cache_stats(self) -> Optional[dict]:
+        return self._method_cache.stats() if self._method_cache is not None else None
+
+    def turn_queue_stats(self) -> Optional[dict]:
+        return self._turn_queue.stats() if self._turn_queue is not None else None
+
+    def tenant_stats(self) -> Optional[dict]:
+        return self._scheduler.stats() if self._scheduler is not None else None
+
+    def stats(self) -> list[dict]:
+        """Per-process load counters."""
+        return [member.stats() for member in self._members]
+
+    def standby_stats(self) -> dict:
+        return {"ready": len(self._standbys), "target": self._standby_target}
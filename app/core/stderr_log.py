@@ -0,0 +1,134 @@
+import asyncio
+import re
+import time
+from collections import deque
+from typing import Optional
+import structlog
+
+from .transport import LineReader
+
+logger = structlog.get_logger(__name__)
+
+# Longest stderr line kept; longer lines are dropped by the reader
+MAX_STDERR_LINE_BYTES = 64 * 1024
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+# tracing / env_logger style level near the start of the line
+_LEVEL = re.compile(r"\b(TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL)\b")
+_PANIC = re.compile(r"panicked at|^thread '.*' panicked|^Error:", re.IGNORECASE)
+
+_LEVELS = {
+    "TRACE": "debug",
+    "DEBUG": "debug",
+    "INFO": "info",
+    "WARN": "warning",
+    "WARNING": "warning",
+    "ERROR": "error",
+    "FATAL": "error",
+}
+
+
+def detect_level(line: str) -> str:
+    """Classify an app-server stderr line as debug, info, warning or error."""
+    if _PANIC.search(line):
+        return "error"
+    match = _LEVEL.search(line, 0, 80)
+    if match is not None:
+        return _LEVELS[match.group(1)]
+    return "info"
+
+
+class StderrBuffer:
+    """Fixed-size ring buffer of app-server stderr lines.
+
+    A pump task drains the subprocess stderr pipe continuously so the
+    app-server never blocks on a full pipe. Lines are forwarded to
+    structlog at up to ``log_rate`` lines per second; the rest are only
+    kept in the buffer and reported as a suppressed count.
+    """
+
+    def __init__(self, max_lines: int = 1000, log_rate: float = 20.0):
+        self._lines: deque[dict] = deque(maxlen=max(max_lines, 1))
+        self._log_rate = log_rate
+        self._window_start = 0.0
+        self._window_count = 0
+        self._window_suppressed = 0
+        self.total_lines = 0
+        self.suppressed_lines = 0
+        self.dropped_lines = 0
+
+    async def pump(self, stream: asyncio.StreamReader, pid: Optional[int] = None) -> None:
+        """Read ``stream`` until EOF, recording every line."""
+        reader = LineReader(stream, max_line_bytes=MAX_STDERR_LINE_BYTES, chunk_size=64 * 1024)
+        try:
+            while True:
+                frame = await reader.read_frame()
+                if frame is None:
+                    break
+                self.append(frame.decode("utf-8", errors="replace"), pid)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("stderr pump failed", error=str(e))
+        finally:
+            self.dropped_lines += reader.oversized_frames
+            self._flush_suppressed()
+
+    def append(self, line: str, pid: Optional[int] = None) -> None:
+        text = _ANSI_ESCAPE.sub("", line).rstrip("\r\n")
+        if not text.strip():
+            return
+
+        level = detect_level(text)
+        self._lines.append({"time": time.time(), "pid": pid, "level": level, "text": text})
+        self.total_lines += 1
+        self._forward(level, text, pid)
+
+    def _forward(self, level: str, text: str, pid: Optional[int]) -> None:
+        if self._log_rate <= 0:
+            return
+
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._flush_suppressed()
+            self._window_start = now
+            self._window_count = 0
+
+        if self._window_count >= self._log_rate:
+            self._window_suppressed += 1
+            self.suppressed_lines += 1
+            return
+
+        self._window_count += 1
+        getattr(logger, level)("app-server stderr", pid=pid, line=text)
+
+    def _flush_suppressed(self) -> None:
+        if self._window_suppressed:
+            logger.warning("app-server stderr lines not logged", suppressed=self._window_suppressed)
+            self._window_suppressed = 0
+
+    def merge_older(self, older: "StderrBuffer") -> None:
+        """Put the lines of a replaced process's buffer before this one's."""
+        lines = list(older._lines) + list(self._lines)
+        self._lines.clear()
+        self._lines.extend(lines[-self._lines.maxlen:])
+        self.total_lines += older.total_lines
+        self.suppressed_lines += older.suppressed_lines
+        self.dropped_lines += older.dropped_lines
+
+    def tail(self, count: int) -> list[dict]:
+        """Return the last ``count`` lines, oldest first."""
+        if count <= 0:
+            return []
+        if count >= len(self._lines):
+            return list(self._lines)
+        return list(self._lines)[-count:]
+
+    def stats(self) -> dict:
+        return {
+            "buffered_lines": len(self._lines),
+            "capacity": self._lines.maxlen,
+            "total_lines": self.total_lines,
+            "suppressed_lines": self.suppressed_lines,
+            "dropped_lines": self.dropped_lines,
+        }
@@ -0,0 +1,378 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar
+from typing import Optional
+import structlog
+
+from . import metrics
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_TENANT = "default"
+
+# Tenant names beyond this many share OVERFLOW_TENANT, bounding state and metric labels
+MAX_TENANTS = 1000
+OVERFLOW_TENANT = "other"
+MAX_TENANT_NAME = 64
+
+# Turn IDs whose turn/completed arrived before bind(), kept to release the slot late
+MAX_EARLY_COMPLETIONS = 1024
+
+# Tenant of the HTTP request or WebSocket connection being handled
+current_tenant: ContextVar[str] = ContextVar("current_tenant", default=DEFAULT_TENANT)
+
+
+class TenantLimitError(RuntimeError):
+    """A tenant is over its turn rate, or its admission queue is full."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TenantResolver:
+    """Maps request headers to a tenant name.
+
+    An API key (``X-API-Key`` or ``Authorization: Bearer``) listed in
+    ``api_keys`` wins; otherwise the ``header`` value names the tenant;
+    otherwise the request belongs to ``default``. This only groups
+    callers for scheduling and does not authenticate them.
+    """
+
+    def __init__(self, header: str = "", api_keys: Optional[dict[str, str]] = None):
+        self._header = header.lower().encode("latin-1")
+        self._api_keys = api_keys or {}
+
+    def resolve(self, headers: list[tuple[bytes, bytes]]) -> str:
+        api_key = None
+        named = None
+        for name, value in headers:
+            if name == b"x-api-key":
+                api_key = value.decode("latin-1")
+            elif name == b"authorization" and value[:7].lower() == b"bearer ":
+                api_key = api_key or value[7:].decode("latin-1").strip()
+            elif self._header and name == self._header:
+                named = value.decode("latin-1").strip()
+
+        if api_key is not None and api_key in self._api_keys:
+            return self._api_keys[api_key]
+        if named:
+            return named[:MAX_TENANT_NAME]
+        return DEFAULT_TENANT
+
+
+class TenantMiddleware:
+    """ASGI middleware setting ``current_tenant`` for each request and connection.
+
+    Tasks started while handling the request (turn jobs, stream writers)
+    inherit the tenant with the rest of the context.
+    """
+
+    def __init__(self, app, resolver: TenantResolver):
+        self.app = app
+        self._resolver = resolver
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        token = current_tenant.set(self._resolver.resolve(scope.get("headers") or []))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_tenant.reset(token)
+
+
+class TenantPolicy:
+    """Scheduling limits of one tenant.
+
+    Args:
+        weight: Share of admissions under contention, relative to other tenants.
+        rate: Sustained ``turn/start`` calls per second; 0 = unlimited.
+        burst: Token bucket size, i.e. calls allowed at once above ``rate``.
+        max_running: Turns of the tenant running at once; 0 = unlimited.
+        max_queued: Turns waiting for admission before more are rejected.
+    """
+
+    def __init__(
+        self,
+        weight: float = 1.0,
+        rate: float = 0.0,
+        burst: int = 10,
+        max_running: int = 0,
+        max_queued: int = 100,
+    ):
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self.weight = weight
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_running = max_running
+        self.max_queued = max(max_queued, 0)
+
+    def updated(self, overrides: dict) -> "TenantPolicy":
+        """Copy with some fields replaced; unknown keys raise TypeError."""
+        fields = {
+            "weight": self.weight,
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_running": self.max_running,
+            "max_queued": self.max_queued,
+        }
+        fields.update(overrides)
+        return TenantPolicy(**fields)
+
+
+class _Tenant:
+    """Token bucket, running count and admission queue of one tenant."""
+
+    def __init__(self, name: str, policy: TenantPolicy, configured: bool):
+        self.name = name
+        self.policy = policy
+        self.configured = configured
+        self.tokens = float(policy.burst)
+        self.refilled_at = time.monotonic()
+        self.running = 0
+        # (waiter, start tag, enqueued at)
+        self.waiters: deque[tuple[asyncio.Future, float, float]] = deque()
+        self.last_finish = 0.0
+        self.admitted = 0
+        self.rejected = 0
+
+    def refill(self, now: float) -> None:
+        if self.policy.rate > 0:
+            self.tokens = min(
+                self.policy.burst,
+                self.tokens + (now - self.refilled_at) * self.policy.rate,
+            )
+        self.refilled_at = now
+
+    @property
+    def below_cap(self) -> bool:
+        return self.policy.max_running <= 0 or self.running < self.policy.max_running
+
+    @property
+    def idle(self) -> bool:
+        return (
+            self.running == 0
+            and not self.waiters
+            and (self.policy.rate <= 0 or self.tokens >= self.policy.burst)
+        )
+
+
+class TenantScheduler:
+    """Weighted fair admission of ``turn/start`` across tenants.
+
+    Each tenant has a token bucket (``rate``/``burst``), a cap on its
+    running turns and a bounded queue. At most ``max_running`` turns are
+    admitted at once overall (0 = no global cap). Waiting turns are
+    admitted by start-time fair queueing: a turn's start tag is the later
+    of the scheduler's virtual time and its tenant's previous finish tag,
+    each admission advances the tenant by ``1 / weight``, and the smallest
+    start tag goes next. A tenant sending a burst therefore queues behind
+    its own backlog while others keep their share.
+
+    A slot is held from admission until the turn's ``turn/completed``, or
+    at most ``hold_timeout`` seconds if that never arrives.
+    """
+
+    def __init__(
+        self,
+        default: TenantPolicy,
+        policies: Optional[dict[str, TenantPolicy]] = None,
+        max_running: int = 0,
+        hold_timeout: float = 300.0,
+    ):
+        self._default = default
+        self._policies = policies or {}
+        self._max_running = max_running
+        self._hold_timeout = hold_timeout
+        self._tenants: dict[str, _Tenant] = {}
+        self._running = 0
+        self._virtual = 0.0
+        # turnId -> (tenant, expiry)
+        self._holds: dict[str, tuple[_Tenant, asyncio.TimerHandle]] = {}
+        self._completed_early: OrderedDict[str, None] = OrderedDict()
+
+    def _tenant(self, name: str) -> _Tenant:
+        tenant = self._tenants.get(name)
+        if tenant is not None:
+            return tenant
+        if name not in self._policies and len(self._tenants) >= MAX_TENANTS:
+            self._forget_idle()
+            if len(self._tenants) >= MAX_TENANTS:
+                name = OVERFLOW_TENANT
+                tenant = self._tenants.get(name)
+                if tenant is not None:
+                    return tenant
+        policy = self._policies.get(name, self._default)
+        tenant = self._tenants[name] = _Tenant(name, policy, configured=name in self._policies)
+        return tenant
+
+    def key(self, name: str) -> str:
+        """Name the scheduler tracks ``name`` under; pass it to acquire, bind and release."""
+        return self._tenant(name).name
+
+    def _forget_idle(self) -> None:
+        now = time.monotonic()
+        for name, tenant in list(self._tenants.items()):
+            tenant.refill(now)
+            if not tenant.configured and tenant.idle:
+                del self._tenants[name]
+
+    async def acquire(self, name: str, timeout: Optional[float] = None) -> float:
+        """Wait for admission of one turn of tenant ``name``; returns the seconds queued.
+
+        Raises:
+            TenantLimitError: If the tenant is over its rate, its queue is
+                full, or ``timeout`` passes before admission.
+        """
+        tenant = self._tenant(name)
+        policy = tenant.policy
+        now = time.monotonic()
+        can_run = (self._max_running <= 0 or self._running < self._max_running) and tenant.below_cap
+
+        if not (can_run and not tenant.waiters) and len(tenant.waiters) >= policy.max_queued:
+            self._reject(tenant, "queue_full")
+            raise TenantLimitError(
+                f"Tenant {tenant.name} already has {len(tenant.waiters)} turns waiting for admission"
+            )
+
+        tenant.refill(now)
+        if policy.rate > 0:
+            if tenant.tokens < 1:
+                self._reject(tenant, "rate")
+                retry_after = (1 - tenant.tokens) / policy.rate
+                raise TenantLimitError(
+                    f"Tenant {tenant.name} is over its rate of {policy.rate:g} turns/s",
+                    retry_after=retry_after,
+                )
+            tenant.tokens -= 1
+
+        start = max(self._virtual, tenant.last_finish)
+        tenant.last_finish = start + 1 / policy.weight
+
+        if can_run and not tenant.waiters:
+            self._virtual = start
+            self._admit(tenant)
+            metrics.tenant_queue_wait.observe(0.0, tenant=tenant.name)
+            return 0.0
+
+        waiter = asyncio.get_event_loop().create_future()
+        entry = (waiter, start, now)
+        tenant.waiters.append(entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done():
+                # Admitted just as we gave up; hand the slot on
+                self.release(tenant.name)
+            else:
+                waiter.cancel()
+                tenant.waiters.remove(entry)
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject(tenant, "timeout")
+                raise TenantLimitError(f"Timed out waiting for admission of tenant {tenant.name}")
+            raise
+
+        waited = time.monotonic() - now
+        metrics.tenant_queue_wait.observe(waited, tenant=tenant.name)
+        return waited
+
+    def _reject(self, tenant: _Tenant, reason: str) -> None:
+        tenant.rejected += 1
+        metrics.tenant_rejections.inc(tenant=tenant.name, reason=reason)
+
+    def _admit(self, tenant: _Tenant) -> None:
+        tenant.running += 1
+        tenant.admitted += 1
+        self._running += 1
+
+    def _dispatch(self) -> None:
+        """Admit waiting turns, smallest start tag first, while capacity lasts."""
+        while self._max_running <= 0 or self._running < self._max_running:
+            best: Optional[_Tenant] = None
+            for tenant in self._tenants.values():
+                while tenant.waiters and tenant.waiters[0][0].done():
+                    tenant.waiters.popleft()
+                if not tenant.waiters or not tenant.below_cap:
+                    continue
+                if best is None or tenant.waiters[0][1] < best.waiters[0][1]:
+                    best = tenant
+            if best is None:
+                return
+            waiter, start, _ = best.waiters.popleft()
+            self._virtual = start
+            self._admit(best)
+            waiter.set_result(None)
+
+    def bind(self, name: str, turn_id: str) -> None:
+        """Hold the tenant's slot until ``turn_id`` completes."""
+        tenant = self._tenant(name)
+        if turn_id in self._completed_early:
+            # turn/completed overtook the turn/start response
+            del self._completed_early[turn_id]
+            self.release(tenant.name)
+            return
+        expiry = asyncio.get_event_loop().call_later(self._hold_timeout, self._expire, turn_id)
+        self._holds[turn_id] = (tenant, expiry)
+
+    def turn_completed(self, turn_id: str) -> None:
+        hold = self._holds.pop(turn_id, None)
+        if hold is None:
+            self._completed_early[turn_id] = None
+            while len(self._completed_early) > MAX_EARLY_COMPLETIONS:
+                self._completed_early.popitem(last=False)
+            return
+        tenant, expiry = hold
+        expiry.cancel()
+        self.release(tenant.name)
+
+    def _expire(self, turn_id: str) -> None:
+        hold = self._holds.pop(turn_id, None)
+        if hold is not None:
+            logger.warning("Releasing tenant slot held past the turn timeout", tenant=hold[0].name, turn_id=turn_id)
+            self.release(hold[0].name)
+
+    def release(self, name: str) -> None:
+        """Free a running slot of the tenant and admit waiting turns."""
+        tenant = self._tenants.get(name)
+        if tenant is None or tenant.running == 0:
+            return
+        tenant.running -= 1
+        self._running -= 1
+        self._dispatch()
+
+    def register_metrics(self, registry: metrics.MetricsRegistry = metrics.registry) -> None:
+        """Expose per-tenant running and queued turns read at scrape time."""
+        for name, documentation, read in (
+            ("codex_tenant_running_turns", "Admitted turns of the tenant still running", lambda t: t.running),
+            ("codex_tenant_queued_turns", "Turns of the tenant waiting for admission", lambda t: len(t.waiters)),
+        ):
+            registry.register(
+                metrics.Gauge(
+                    name,
+                    documentation,
+                    ("tenant",),
+                    collect=lambda read=read: [((t.name,), read(t)) for t in list(self._tenants.values())],
+                )
+            )
+
+    def stats(self) -> dict:
+        return {
+            "max_running": self._max_running,
+            "running": self._running,
+            "queued": sum(len(tenant.waiters) for tenant in self._tenants.values()),
+            "tenants": {
+                tenant.name: {
+                    "running": tenant.running,
+                    "queued": len(tenant.waiters),
+                    "admitted": tenant.admitted,
+                    "rejected": tenant.rejected,
+                    "tokens": None if tenant.policy.rate <= 0 else math.floor(tenant.tokens),
+                }
+                for tenant in self._tenants.values()
+            },
+        }
@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from typing import Optional
+import structlog
+
+from .jsonrpc_client import notification_scope
+
+logger = structlog.get_logger(__name__)
+
+# Notifications that change what thread/read returns for their thread
+INVALIDATING_NOTIFICATIONS = ("thread/started", "turn/started", "turn/completed", "item/completed")
+
+# Bridge calls whose success changes the stored thread named in params or result
+INVALIDATING_METHODS = (
+    "thread/resume",
+    "thread/fork",
+    "thread/rollback",
+    "thread/archive",
+    "thread/unarchive",
+    "turn/start",
+)
+
+
+class ThreadReadCache:
+    """Size-bounded LRU cache of thread/read results.
+
+    Keyed by ``(threadId, includeTurns)`` and invalidated per thread by
+    notifications and by bridge calls that modify the thread. Reads take a
+    token before calling the app-server so a result that raced with an
+    invalidation is not stored.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, bool], dict] = OrderedDict()
+        self._clock = 0
+        self._invalidated_at: OrderedDict[str, int] = OrderedDict()
+        self._invalidated_floor = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def attach(self, client) -> None:
+        """Subscribe to notifications and call results that invalidate entries."""
+        for method in INVALIDATING_NOTIFICATIONS:
+            client.on_notification(method, self._on_notification)
+        for method in INVALIDATING_METHODS:
+            client.on_result(method, self._on_result)
+
+    def _on_notification(self, params: dict) -> None:
+        thread_id, _ = notification_scope(params)
+        if thread_id is not None:
+            self.invalidate(thread_id)
+
+    def _on_result(self, params: dict, result: dict) -> None:
+        thread_id = params.get("threadId")
+        if thread_id is not None:
+            self.invalidate(thread_id)
+        result_thread = result.get("thread")
+        if isinstance(result_thread, dict) and result_thread.get("id"):
+            self.invalidate(result_thread["id"])
+
+    def token(self) -> int:
+        """Version to pass to put() for a read that starts now."""
+        return self._clock
+
+    def get(self, thread_id: str, include_turns: bool) -> Optional[dict]:
+        if not self.enabled:
+            return None
+
+        key = (thread_id, include_turns)
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, thread_id: str, include_turns: bool, result: dict, token: int) -> None:
+        """Store a result unless the thread was invalidated after ``token``."""
+        if not self.enabled:
+            return
+        if self._invalidated_floor > token or self._invalidated_at.get(thread_id, -1) > token:
+            return
+
+        key = (thread_id, include_turns)
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, thread_id: str) -> None:
+        """Drop both entries of a thread and fence in-flight reads."""
+        self._clock += 1
+        self._invalidated_at[thread_id] = self._clock
+        self._invalidated_at.move_to_end(thread_id)
+        while len(self._invalidated_at) > max(self._max_entries, 1) * 4:
+            _, version = self._invalidated_at.popitem(last=False)
+            self._invalidated_floor = max(self._invalidated_floor, version)
+
+        removed = self._entries.pop((thread_id, False), None) is not None
+        removed = self._entries.pop((thread_id, True), None) is not None or removed
+        if removed:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
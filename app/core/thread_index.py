@@ -0,0 +1,330 @@
+import asyncio
+import bisect
+import heapq
+import time
+from typing import Iterator, Optional
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Every thread source thread/list knows; the seed asks for all of them
+SOURCE_KINDS = (
+    "cli",
+    "vscode",
+    "exec",
+    "appServer",
+    "subAgent",
+    "subAgentReview",
+    "subAgentCompact",
+    "subAgentThreadSpawn",
+    "subAgentOther",
+    "unknown",
+)
+
+# What thread/list lists when no sourceKinds are given: interactive sources
+DEFAULT_SOURCE_KINDS = ("cli", "vscode")
+
+# The app-server records threads its clients start as vscode sessions; used
+# for bridge-started threads whose notification or result omits ``source``
+STARTED_SOURCE_KIND = "vscode"
+
+_SUB_AGENT_KINDS = {
+    "review": "subAgentReview",
+    "compact": "subAgentCompact",
+    "thread_spawn": "subAgentThreadSpawn",
+    "threadSpawn": "subAgentThreadSpawn",
+    "other": "subAgentOther",
+}
+
+# Bridge calls whose result carries the current, non-archived thread
+UPSERTING_METHODS = ("thread/start", "thread/fork", "thread/resume", "thread/unarchive", "thread/rollback")
+
+SEED_RETRY_MAX_DELAY = 30.0
+
+
+def source_kind(thread: dict) -> str:
+    """Map a thread's ``source`` to the ``sourceKinds`` value thread/list filters on."""
+    source = thread.get("source")
+    if isinstance(source, str):
+        return source if source in SOURCE_KINDS else "unknown"
+    if isinstance(source, dict) and "subAgent" in source:
+        sub_agent = source["subAgent"]
+        if isinstance(sub_agent, dict) and sub_agent:
+            sub_agent = next(iter(sub_agent))
+        return _SUB_AGENT_KINDS.get(sub_agent, "subAgent")
+    return "unknown"
+
+
+def _started_kind(thread: dict) -> str:
+    return source_kind(thread) if thread.get("source") is not None else STARTED_SOURCE_KIND
+
+
+def _kind_matches(kind: str, kinds: set[str]) -> bool:
+    return kind in kinds or ("subAgent" in kinds and kind.startswith("subAgent"))
+
+
+def encode_cursor(key: tuple[int, str]) -> str:
+    return f"{-key[0]}:{key[1]}"
+
+
+def decode_cursor(cursor: str) -> tuple[int, str]:
+    """Inverse of encode_cursor; raises ValueError for anything else."""
+    created, sep, thread_id = cursor.partition(":")
+    if not sep or not thread_id:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return (-int(created), thread_id)
+
+
+def _keys_from(order: list[tuple[int, str]], start: int) -> Iterator[tuple[int, str]]:
+    for index in range(start, len(order)):
+        yield order[index]
+
+
+class _Entry:
+    __slots__ = ("thread", "key", "kind", "archived")
+
+    def __init__(self, thread: dict, key: tuple[int, str], kind: str, archived: bool):
+        self.thread = thread
+        self.key = key
+        self.kind = kind
+        self.archived = archived
+
+
+class ThreadIndex:
+    """In-process index of stored threads, newest first by ``createdAt``.
+
+    Seeded once by paging through ``thread/list`` for every source kind,
+    archived and not, then kept current from ``thread/started`` and the
+    results of the bridge's own thread calls. Keys are kept in one sorted
+    list per (archived, source kind), so listing bisects into the lists
+    the filters select and merges them, instead of an app-server scan of
+    rollout files. Only ``model_providers`` filters by looking at entries.
+    Threads written by other app-server clients after the seed are not
+    seen until the bridge restarts.
+    """
+
+    def __init__(self, client, page_size: int = 200):
+        self._client = client
+        self._page_size = page_size
+        self._entries: dict[str, _Entry] = {}
+        # (archived, kind) -> (-createdAt, threadId) ascending, i.e. newest first
+        self._order: dict[tuple[bool, str], list[tuple[int, str]]] = {}
+        # Archive state of threads the seed has not reached yet
+        self._archived_overrides: dict[str, bool] = {}
+        self._ready = asyncio.Event()
+        self._seed_task: Optional[asyncio.Task] = None
+        self.seed_seconds: Optional[float] = None
+        self.seed_pages = 0
+        self.lookups = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def attach(self, client) -> None:
+        """Follow new threads and bridge calls that change a thread's listing."""
+        client.on_notification("thread/started", self._on_thread_started)
+        for method in UPSERTING_METHODS:
+            client.on_result(method, self._on_thread_result)
+        client.on_result("thread/archive", self._on_archived)
+        client.on_result("turn/start", self._on_turn_started)
+
+    async def start(self) -> None:
+        """Seed from thread/list in the background."""
+        self._seed_task = asyncio.create_task(self._seed_loop())
+
+    async def stop(self) -> None:
+        if self._seed_task is not None:
+            self._seed_task.cancel()
+            await asyncio.gather(self._seed_task, return_exceptions=True)
+            self._seed_task = None
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for the seed; False if still loading."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    # -- seeding ------------------------------------------------------------
+
+    async def _seed_loop(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                await self._seed()
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Thread index seed failed", error=str(e), retry_in=delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, SEED_RETRY_MAX_DELAY)
+
+    async def _seed(self) -> None:
+        started = time.monotonic()
+        for archived in (False, True):
+            cursor = None
+            while True:
+                params = {
+                    "limit": self._page_size,
+                    "sourceKinds": list(SOURCE_KINDS),
+                    "archived": archived,
+                }
+                if cursor is not None:
+                    params["cursor"] = cursor
+                result = await self._client.call("thread/list", params)
+                self.seed_pages += 1
+                for thread in result.get("data") or []:
+                    # Live updates that arrived during the seed are newer
+                    if isinstance(thread, dict) and thread.get("id") and thread["id"] not in self._entries:
+                        archived_now = self._archived_overrides.pop(thread["id"], archived)
+                        self._insert(thread, archived_now, source_kind(thread))
+                cursor = result.get("nextCursor")
+                if not cursor:
+                    break
+
+        self._archived_overrides.clear()
+        self.seed_seconds = time.monotonic() - started
+        self._ready.set()
+        logger.info(
+            "Thread index seeded",
+            threads=len(self._entries),
+            pages=self.seed_pages,
+            seconds=round(self.seed_seconds, 3),
+        )
+
+    # -- live updates -------------------------------------------------------
+
+    def _on_thread_started(self, params: dict) -> None:
+        thread = params.get("thread")
+        if isinstance(thread, dict) and thread.get("id"):
+            self.upsert(thread, archived=False, kind=_started_kind(thread))
+
+    def _on_thread_result(self, params: dict, result: dict) -> None:
+        thread = result.get("thread")
+        if isinstance(thread, dict) and thread.get("id"):
+            self.upsert(thread, archived=False, kind=_started_kind(thread))
+
+    def _on_archived(self, params: dict, result: dict) -> None:
+        thread_id = params.get("threadId")
+        if thread_id is None:
+            return
+        entry = self._entries.get(thread_id)
+        if entry is not None:
+            self._move(entry, True, entry.kind, entry.key)
+        elif not self.ready:
+            self._archived_overrides[thread_id] = True
+
+    def _on_turn_started(self, params: dict, result: dict) -> None:
+        entry = self._entries.get(params.get("threadId"))
+        if entry is None:
+            return
+        entry.thread["updatedAt"] = int(time.time())
+        if not entry.thread.get("preview"):
+            for part in params.get("input") or []:
+                if isinstance(part, dict) and part.get("type") == "text" and part.get("text"):
+                    entry.thread["preview"] = part["text"]
+                    break
+
+    def upsert(self, thread: dict, archived: bool, kind: Optional[str] = None) -> None:
+        """Add a thread or merge newer fields into its summary.
+
+        ``kind`` is used for a new thread and defaults to the kind of its
+        ``source``; a known thread changes kind only with a new ``source``.
+        """
+        entry = self._entries.get(thread["id"])
+        if entry is None:
+            self._insert(thread, archived, kind or source_kind(thread))
+            return
+
+        entry.thread.update((key, value) for key, value in thread.items() if key != "turns")
+        kind = source_kind(entry.thread) if entry.thread.get("source") is not None else entry.kind
+        self._move(entry, archived, kind, self._key(entry.thread))
+
+    def _insert(self, thread: dict, archived: bool, kind: str) -> None:
+        summary = {key: value for key, value in thread.items() if key != "turns"}
+        key = self._key(summary)
+        self._entries[summary["id"]] = _Entry(summary, key, kind, archived)
+        bisect.insort(self._order.setdefault((archived, kind), []), key)
+
+    def _move(self, entry: _Entry, archived: bool, kind: str, key: tuple[int, str]) -> None:
+        if (archived, kind, key) == (entry.archived, entry.kind, entry.key):
+            return
+        order = self._order[(entry.archived, entry.kind)]
+        index = bisect.bisect_left(order, entry.key)
+        if index < len(order) and order[index] == entry.key:
+            del order[index]
+        entry.archived, entry.kind, entry.key = archived, kind, key
+        bisect.insort(self._order.setdefault((archived, kind), []), key)
+
+    @staticmethod
+    def _key(thread: dict) -> tuple[int, str]:
+        created = thread.get("createdAt")
+        if not isinstance(created, (int, float)):
+            created = thread.get("updatedAt")
+        if not isinstance(created, (int, float)):
+            created = time.time()
+            thread["createdAt"] = int(created)
+        return (-int(created), thread["id"])
+
+    # -- queries ------------------------------------------------------------
+
+    def list(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        model_providers: Optional[list[str]] = None,
+        source_kinds: Optional[list[str]] = None,
+        archived: bool = False,
+        created_after: Optional[int] = None,
+        created_before: Optional[int] = None,
+    ) -> tuple[list[dict], Optional[str]]:
+        """One page of threads newest first, and the cursor of the next page.
+
+        ``created_after`` is inclusive and ``created_before`` exclusive (Unix
+        seconds). Empty ``model_providers`` match all; empty ``source_kinds``
+        match DEFAULT_SOURCE_KINDS, as in thread/list.
+        """
+        self.lookups += 1
+        after = decode_cursor(cursor) if cursor else None
+        providers = set(model_providers or ())
+        kinds = set(source_kinds or DEFAULT_SOURCE_KINDS)
+
+        runs = []
+        for (list_archived, kind), order in self._order.items():
+            if list_archived != archived or not _kind_matches(kind, kinds):
+                continue
+            start = 0
+            if after is not None:
+                start = bisect.bisect_right(order, after)
+            if created_before is not None:
+                # createdAt < before  <=>  -createdAt >= 1 - before
+                start = max(start, bisect.bisect_left(order, (1 - created_before, "")))
+            runs.append(_keys_from(order, start))
+
+        page: list[dict] = []
+        last_key = None
+        for key in heapq.merge(*runs):
+            if created_after is not None and -key[0] < created_after:
+                break
+            entry = self._entries[key[1]]
+            if providers and entry.thread.get("modelProvider") not in providers:
+                continue
+            if len(page) == limit:
+                return page, encode_cursor(last_key)
+            page.append(dict(entry.thread, sourceKind=entry.kind, archived=entry.archived))
+            last_key = key
+        return page, None
+
+    def stats(self) -> dict:
+        archived = sum(1 for entry in self._entries.values() if entry.archived)
+        return {
+            "ready": self.ready,
+            "threads": len(self._entries) - archived,
+            "archived": archived,
+            "seed_pages": self.seed_pages,
+            "seed_seconds": round(self.seed_seconds, 3) if self.seed_seconds is not None else None,
+            "lookups": self.lookups,
+        }
@@ -0,0 +1,103 @@
+import asyncio
+from typing import Optional
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Bytes requested from the stream per read
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+
+class LineReader:
+    """Newline-delimited frame reader over an asyncio StreamReader.
+
+    Reads large chunks into a single buffer and scans only the newly
+    arrived bytes for the delimiter, so a multi-MB line is neither
+    rescanned nor rebuilt per chunk. ``max_line_bytes`` of 0 means
+    unbounded; oversized lines are skipped instead of killing the reader.
+    """
+
+    def __init__(
+        self,
+        stream: asyncio.StreamReader,
+        max_line_bytes: int = 0,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self._stream = stream
+        self._max_line_bytes = max_line_bytes
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._start = 0
+        self._scan_from = 0
+        self._discarding = False
+        self.bytes_read = 0
+        self.frames_read = 0
+        self.oversized_frames = 0
+
+    def _compact(self) -> None:
+        """Drop consumed bytes once they dominate the buffer."""
+        if self._start and self._start * 2 >= len(self._buffer):
+            del self._buffer[: self._start]
+            self._scan_from -= self._start
+            self._start = 0
+
+    def _next_frame(self) -> Optional[bytes]:
+        """Pop the next complete, non-empty frame from the buffer."""
+        while True:
+            index = self._buffer.find(b"\n", self._scan_from)
+            if index < 0:
+                self._scan_from = len(self._buffer)
+                return None
+
+            start = self._start
+            self._start = self._scan_from = index + 1
+
+            if self._discarding:
+                self._discarding = False
+                continue
+
+            if self._max_line_bytes and index - start > self._max_line_bytes:
+                self.oversized_frames += 1
+                logger.error("Dropping oversized message", size=index - start)
+                continue
+
+            frame = bytes(self._buffer[start:index])
+            if frame.strip():
+                self.frames_read += 1
+                return frame
+
+    async def read_frame(self) -> Optional[bytes]:
+        """Return the next line without its delimiter, or None at EOF."""
+        while True:
+            frame = self._next_frame()
+            if frame is not None:
+                self._compact()
+                return frame
+
+            pending = len(self._buffer) - self._start
+            if self._max_line_bytes and pending > self._max_line_bytes:
+                if not self._discarding:
+                    self.oversized_frames += 1
+                    logger.error("Dropping oversized message", size=pending)
+                self._discarding = True
+                del self._buffer[:]
+                self._start = self._scan_from = 0
+            else:
+                self._compact()
+
+            chunk = await self._stream.read(self._chunk_size)
+            if not chunk:
+                return self._flush_tail()
+
+            self.bytes_read += len(chunk)
+            self._buffer += chunk
+
+    def _flush_tail(self) -> Optional[bytes]:
+        """Return an unterminated final line at EOF, if any."""
+        tail = bytes(self._buffer[self._start :])
+        del self._buffer[:]
+        self._start = self._scan_from = 0
+        if self._discarding or not tail.strip():
+            return None
+        self.frames_read += 1
+        return tail
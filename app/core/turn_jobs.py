@@ -0,0 +1,169 @@
+import asyncio
+import time
+import uuid
+from typing import Optional
+import structlog
+
+from .admission import TurnAdmission
+from .blobs import BlobStore
+from .jsonrpc_client import JsonRpcError
+from .process_manager import ProcessUnavailableError
+from .tenants import TenantLimitError
+from .turn_runner import run_turn
+from ..config import settings
+
+logger = structlog.get_logger(__name__)
+
+
+class TurnJobQueueFullError(ProcessUnavailableError):
+    """Too many turn jobs are queued or retained."""
+
+
+class TurnJob:
+    """A submitted turn tracked until its result expires."""
+
+    def __init__(self, params: dict):
+        self.id = f"job_{uuid.uuid4().hex}"
+        self.params = params
+        self.status = "queued"  # "queued", "running", "completed", "failed"
+        self.result: Optional[dict] = None
+        self.error: Optional[dict] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.done = asyncio.Event()
+        self.waiter: Optional[asyncio.Future] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class TurnJobManager:
+    """In-memory table of asynchronous turn jobs.
+
+    Jobs run through a FIFO admission queue bounded by
+    ``settings.max_running_turns``; finished jobs are evicted after
+    ``settings.turn_job_ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        client,
+        admission: Optional[TurnAdmission] = None,
+        blobs: Optional[BlobStore] = None,
+    ):
+        self._client = client
+        self._admission = admission or TurnAdmission(settings.max_running_turns)
+        self._blobs = blobs
+        self._jobs: dict[str, TurnJob] = {}
+        self._sweeper_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the background TTL sweeper."""
+        if self._sweeper_task is None:
+            self._sweeper_task = asyncio.create_task(self._sweeper_loop())
+
+    async def stop(self) -> None:
+        """Cancel the sweeper and any unfinished jobs."""
+        tasks = [job.task for job in self._jobs.values() if job.task is not None]
+        if self._sweeper_task is not None:
+            tasks.append(self._sweeper_task)
+            self._sweeper_task = None
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._jobs.clear()
+
+    def submit(self, params: dict) -> TurnJob:
+        """Queue a turn and return its job immediately."""
+        self.evict_expired()
+        if len(self._jobs) >= settings.max_turn_jobs:
+            raise TurnJobQueueFullError("Too many turn jobs")
+
+        job = TurnJob(params)
+        job.waiter = self._admission.enqueue()
+        job.task = asyncio.create_task(self._run(job))
+        self._jobs[job.id] = job
+
+        logger.info("Turn job submitted", job_id=job.id, thread_id=params.get("threadId"))
+        return job
+
+    def get(self, job_id: str) -> Optional[TurnJob]:
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: TurnJob, timeout: float) -> TurnJob:
+        """Long-poll until the job finishes or the timeout passes."""
+        if timeout > 0 and not job.done.is_set():
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    def queue_position(self, job: TurnJob) -> Optional[int]:
+        if job.status != "queued" or job.waiter is None:
+            return None
+        return self._admission.position(job.waiter)
+
+    async def _run(self, job: TurnJob) -> None:
+        try:
+            await self._admission.acquire(job.waiter)
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = {"message": "Job cancelled"}
+            job.done.set()
+            raise
+
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = await run_turn(self._client, job.params, blobs=self._blobs)
+            job.status = "completed"
+        except asyncio.TimeoutError:
+            job.status = "failed"
+            job.error = {"message": f"Turn completion timeout after {settings.request_timeout}s"}
+        except JsonRpcError as e:
+            job.status = "failed"
+            job.error = e.to_dict()
+        except TenantLimitError as e:
+            job.status = "failed"
+            job.error = {"message": str(e)}
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = {"message": "Job cancelled"}
+            raise
+        except Exception as e:
+            logger.error("Turn job error", job_id=job.id, error=str(e))
+            job.status = "failed"
+            job.error = {"message": str(e)}
+        finally:
+            self._admission.release()
+            job.finished_at = time.time()
+            job.task = None
+            job.done.set()
+            logger.info("Turn job finished", job_id=job.id, status=job.status)
+
+    def evict_expired(self) -> int:
+        """Drop finished jobs older than the TTL."""
+        cutoff = time.time() - settings.turn_job_ttl
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        return len(expired)
+
+    async def _sweeper_loop(self) -> None:
+        interval = max(1.0, min(settings.turn_job_ttl / 2, 60.0))
+        while True:
+            await asyncio.sleep(interval)
+            evicted = self.evict_expired()
+            if evicted:
+                logger.debug("Evicted expired turn jobs", count=evicted)
+
+    def stats(self) -> dict:
+        return {
+            "jobs": len(self._jobs),
+            **self._admission.stats(),
+        }
@@ -0,0 +1,213 @@
+import asyncio
+import time
+from typing import Optional
+import structlog
+
+from . import metrics
+from .blobs import BlobStore, ItemSpiller
+from ..config import settings
+
+logger = structlog.get_logger(__name__)
+
+INTERRUPT_TIMEOUT = 10.0
+
+# turn/interrupt calls still in flight, kept referenced until they finish
+_interrupts: set[asyncio.Task] = set()
+
+
+class TurnTimer:
+    """Records turn duration and time-to-first-item metrics for one turn."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._first_item_seen = False
+
+    def item_seen(self) -> None:
+        if not self._first_item_seen:
+            self._first_item_seen = True
+            metrics.turn_first_item.observe(time.perf_counter() - self.started)
+
+    def finished(self, status: str) -> None:
+        metrics.turn_duration.observe(time.perf_counter() - self.started, status=status)
+
+
+def interrupt_turn(client, thread_id: str, turn_id: str, reason: str) -> None:
+    """Send ``turn/interrupt`` in the background for a turn nobody waits for."""
+    logger.info("Interrupting abandoned turn", thread_id=thread_id, turn_id=turn_id, reason=reason)
+    metrics.turn_interrupts.inc(reason=reason)
+    task = asyncio.create_task(_send_interrupt(client, thread_id, turn_id))
+    _interrupts.add(task)
+    task.add_done_callback(_interrupts.discard)
+
+
+async def _send_interrupt(client, thread_id: str, turn_id: str) -> None:
+    try:
+        await client.call(
+            "turn/interrupt",
+            {"threadId": thread_id, "turnId": turn_id},
+            timeout=INTERRUPT_TIMEOUT,
+        )
+    except Exception as e:
+        logger.warning("turn/interrupt failed", thread_id=thread_id, turn_id=turn_id, error=str(e))
+
+
+async def start_turn(client, params: dict, timeout: float) -> dict:
+    """Send ``turn/start``; if the caller is cancelled first, interrupt the turn it creates.
+
+    The request may already be with the app-server, so it is left to finish
+    rather than cancelled, and its turn is interrupted once the ID is known.
+    A ProcessPool does the same for a turn whose response arrives after
+    ``timeout``, which raises TimeoutError here.
+    """
+    start = asyncio.ensure_future(client.call("turn/start", params, timeout=timeout))
+    try:
+        return await asyncio.shield(start)
+    except asyncio.CancelledError:
+        thread_id = params["threadId"]
+
+        def on_started(future: asyncio.Future) -> None:
+            if future.cancelled() or future.exception() is not None:
+                return
+            turn_id = future.result().get("turn", {}).get("id")
+            if turn_id:
+                interrupt_turn(client, thread_id, turn_id, "cancelled")
+
+        start.add_done_callback(on_started)
+        raise
+
+
+async def run_turn(
+    client,
+    params: dict,
+    timeout: Optional[float] = None,
+    blobs: Optional[BlobStore] = None,
+) -> dict:
+    """Start a turn and wait for its turn/completed notification.
+
+    Args:
+        client: ProcessPool or JsonRpcClient to send ``turn/start`` through.
+        params: ``turn/start`` params; must include ``threadId``.
+        timeout: Deadline in seconds for starting the turn, including any wait
+            behind earlier turns of the thread, and for its completion
+            (defaults to settings.request_timeout).
+        blobs: Store for item fields over the turn's memory budget; without
+            one they are truncated.
+
+    Returns:
+        The ``turn/completed`` params with this turn's items merged into
+        ``turn.items``, or the ``turn/start`` result if no turn ID came back.
+        Large item fields are cut to a preview and listed in ``item.spilled``.
+
+    Raises:
+        asyncio.TimeoutError: If the turn does not complete in time.
+
+    When the deadline passes or the caller is cancelled, the turn is
+    interrupted so the app-server stops working on it.
+    """
+    if timeout is None:
+        timeout = settings.request_timeout
+
+    thread_id = params["threadId"]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+
+    # Track state for matching the completion notification
+    turn_state = {"expected_id": None, "completed": None}
+    collected_items: list = []
+    completion_event = asyncio.Event()
+    timer = TurnTimer()
+    spiller = ItemSpiller(
+        blobs,
+        max_chars=settings.item_field_max_chars,
+        budget=settings.turn_item_budget,
+        preview_chars=settings.item_preview_chars,
+    )
+
+    async def on_turn_completed(notification_params: dict) -> None:
+        """Handle turn/completed notification."""
+        turn = notification_params.get("turn", {})
+        turn_id = turn.get("id")
+
+        # Match by turn ID if we have it
+        if turn_state["expected_id"] is not None:
+            if turn_id == turn_state["expected_id"]:
+                turn_state["completed"] = notification_params
+                completion_event.set()
+        else:
+            # Store for later verification (shouldn't normally happen)
+            turn_state["completed"] = notification_params
+            completion_event.set()
+
+    async def on_item_completed(notification_params: dict) -> None:
+        """Handle item/completed notification - collect items."""
+        item = spiller.apply(notification_params.get("item", {}))
+        collected_items.append((notification_params.get("turnId"), item))
+        timer.item_seen()
+
+    def on_item_started(notification_params: dict) -> None:
+        timer.item_seen()
+
+    # Register thread-scoped handlers before starting turn to avoid race conditions
+    client.on_notification("turn/completed", on_turn_completed, thread_id=thread_id)
+    client.on_notification("item/completed", on_item_completed, thread_id=thread_id)
+    client.on_notification("item/started", on_item_started, thread_id=thread_id)
+
+    try:
+        # Start the turn - returns immediately with inProgress status
+        result = await start_turn(client, params, timeout)
+        turn_state["expected_id"] = result.get("turn", {}).get("id")
+
+        if not turn_state["expected_id"]:
+            # No turn ID returned, return immediate result
+            logger.warning("turn/start returned no turn ID")
+            return result
+
+        # Check if we already got the completion (unlikely but possible)
+        if turn_state["completed"] is not None:
+            completed_id = turn_state["completed"].get("turn", {}).get("id")
+            if completed_id != turn_state["expected_id"]:
+                turn_state["completed"] = None
+                completion_event.clear()
+
+        # Wait for turn/completed notification
+        if turn_state["completed"] is None:
+            try:
+                await asyncio.wait_for(
+                    completion_event.wait(),
+                    timeout=max(deadline - loop.time(), 0),
+                )
+            except asyncio.TimeoutError:
+                logger.error(
+                    "turn/start timeout waiting for completion",
+                    turn_id=turn_state["expected_id"],
+                    timeout=timeout,
+                )
+                timer.finished("timeout")
+                interrupt_turn(client, thread_id, turn_state["expected_id"], "timeout")
+                raise
+            except asyncio.CancelledError:
+                timer.finished("cancelled")
+                interrupt_turn(client, thread_id, turn_state["expected_id"], "cancelled")
+                raise
+
+        # Merge items of this turn into the turn response
+        items = [
+            item
+            for item_turn_id, item in collected_items
+            if item_turn_id in (None, turn_state["expected_id"])
+        ]
+        completed_turn = turn_state["completed"].get("turn", {})
+        if items and not completed_turn.get("items"):
+            completed_turn["items"] = items
+            turn_state["completed"]["turn"] = completed_turn
+        elif completed_turn.get("items") and spiller.enabled:
+            completed_turn["items"] = [spiller.apply(item) for item in completed_turn["items"]]
+
+        timer.finished(completed_turn.get("status", "unknown"))
+        return turn_state["completed"]
+
+    finally:
+        # Always clean up the notification handlers
+        client.remove_notification_handler("turn/completed", on_turn_completed, thread_id=thread_id)
+        client.remove_notification_handler("item/completed", on_item_completed, thread_id=thread_id)
+        client.remove_notification_handler("item/started", on_item_started, thread_id=thread_id)
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from typing import Optional
+import structlog
+
+from .jsonrpc_client import JsonRpcError
+from .process_manager import ProcessUnavailableError
+from .process_pool import PoolMember, ProcessPool
+from ..config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Cheap request answered from app-server memory
+PROBE_METHOD = "thread/loaded/list"
+
+
+class Watchdog:
+    """Probe pool members and recycle hung or bloated app-servers.
+
+    Every ``settings.watchdog_interval`` seconds each member gets a
+    ``thread/loaded/list`` probe and its RSS is read from ``/proc``. A
+    member whose probes time out ``settings.watchdog_max_failures`` times
+    in a row is recycled at once; one over the RSS or turns-served limit
+    is drained first.
+    """
+
+    def __init__(self, pool: ProcessPool):
+        self._pool = pool
+        self._task: Optional[asyncio.Task] = None
+        self._recycling: set[asyncio.Task] = set()
+        self.probes = 0
+        self.probe_failures = 0
+
+    async def start(self) -> None:
+        if self._task is None and settings.watchdog_interval > 0:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        tasks = list(self._recycling)
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.watchdog_interval)
+            members = [m for m in self._pool.members if not (m.restarting or m.draining)]
+            await asyncio.gather(*(self.check(member) for member in members))
+
+    async def check(self, member: PoolMember) -> None:
+        """Probe one member and recycle it if it crossed a threshold."""
+        if not await self._probe(member):
+            return
+
+        member.rss_bytes = member.process.rss_bytes()
+        reason = self._recycle_reason(member)
+        if reason is None:
+            return
+
+        drain_timeout = 0.0 if reason == "unresponsive" else settings.recycle_drain_timeout
+        task = asyncio.create_task(self._pool.recycle(member, reason, drain_timeout))
+        self._recycling.add(task)
+        task.add_done_callback(self._recycling.discard)
+
+    async def _probe(self, member: PoolMember) -> bool:
+        """Measure the probe round trip; False if the member went away meanwhile."""
+        self.probes += 1
+        started = time.perf_counter()
+        try:
+            await member.client.call(PROBE_METHOD, {}, timeout=settings.watchdog_probe_timeout)
+        except asyncio.TimeoutError:
+            self.probe_failures += 1
+            member.probe_failures += 1
+            member.probe_rtt = time.perf_counter() - started
+            logger.warning(
+                "App-server probe timed out",
+                process=member.index,
+                failures=member.probe_failures,
+            )
+            return True
+        except JsonRpcError:
+            # An error answer still proves the process is responsive
+            pass
+        except ProcessUnavailableError:
+            return False
+
+        member.probe_rtt = time.perf_counter() - started
+        member.probe_failures = 0
+        return True
+
+    def _recycle_reason(self, member: PoolMember) -> Optional[str]:
+        if member.probe_failures >= settings.watchdog_max_failures:
+            return "unresponsive"
+        max_rss = settings.recycle_max_rss_mb * 1024 * 1024
+        if max_rss and member.rss_bytes is not None and member.rss_bytes > max_rss:
+            return "rss"
+        if settings.recycle_max_turns and member.turns_served >= settings.recycle_max_turns:
+            return "turns"
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._task is not None,
+            "interval": settings.watchdog_interval,
+            "probes": self.probes,
+            "probe_failures": self.probe_failures,
+            "recycling": len(self._recycling),
+        }
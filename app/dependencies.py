@@ -1,35 +1,118 @@
 from typing import Optional
-from .core import ProcessManager, JsonRpcClient
+from .core import ProcessPool
+from .core.approvals import ApprovalEngine
+from .core.blobs import BlobStore
+from .core.event_store import EventStore
+from .core.thread_cache import ThreadReadCache
+from .core.thread_index import ThreadIndex
+from .core.turn_jobs import TurnJobManager
+from .core.watchdog import Watchdog
 from .config import settings
 
 # Global instances (initialized during app lifespan)
-_process_manager: Optional[ProcessManager] = None
-_jsonrpc_client: Optional[JsonRpcClient] = None
+_process_pool: Optional[ProcessPool] = None
+_turn_job_manager: Optional[TurnJobManager] = None
+_thread_cache: Optional[ThreadReadCache] = None
+_approval_engine: Optional[ApprovalEngine] = None
+_watchdog: Optional[Watchdog] = None
+_thread_index: Optional[ThreadIndex] = None
+_event_store: Optional[EventStore] = None
+_blob_store: Optional[BlobStore] = None
 
 
-def get_process_manager() -> ProcessManager:
-    """Get the ProcessManager instance."""
-    if _process_manager is None:
-        raise RuntimeError("ProcessManager not initialized")
-    return _process_manager
+def get_process_pool() -> ProcessPool:
+    """Get the ProcessPool instance."""
+    if _process_pool is None:
+        raise RuntimeError("ProcessPool not initialized")
+    return _process_pool
 
 
-def get_jsonrpc_client() -> JsonRpcClient:
-    """Get the JsonRpcClient instance."""
-    if _jsonrpc_client is None:
-        raise RuntimeError("JsonRpcClient not initialized")
-    return _jsonrpc_client
+def get_jsonrpc_client() -> ProcessPool:
+    """Get the JSON-RPC client (the pool routes calls by thread affinity)."""
+    return get_process_pool()
 
 
-def set_instances(process_manager: ProcessManager, jsonrpc_client: JsonRpcClient) -> None:
+def get_turn_job_manager() -> TurnJobManager:
+    """Get the TurnJobManager instance."""
+    if _turn_job_manager is None:
+        raise RuntimeError("TurnJobManager not initialized")
+    return _turn_job_manager
+
+
+def get_thread_cache() -> ThreadReadCache:
+    """Get the ThreadReadCache instance."""
+    if _thread_cache is None:
+        raise RuntimeError("ThreadReadCache not initialized")
+    return _thread_cache
+
+
+def get_approval_engine() -> ApprovalEngine:
+    """Get the ApprovalEngine instance."""
+    if _approval_engine is None:
+        raise RuntimeError("ApprovalEngine not initialized")
+    return _approval_engine
+
+
+def get_watchdog() -> Watchdog:
+    """Get the Watchdog instance."""
+    if _watchdog is None:
+        raise RuntimeError("Watchdog not initialized")
+    return _watchdog
+
+
+def get_thread_index() -> ThreadIndex:
+    """Get the ThreadIndex instance."""
+    if _thread_index is None:
+        raise RuntimeError("ThreadIndex not initialized")
+    return _thread_index
+
+
+def get_event_store() -> EventStore:
+    """Get the EventStore instance (only set when the store is enabled)."""
+    if _event_store is None:
+        raise RuntimeError("EventStore not initialized")
+    return _event_store
+
+
+def get_blob_store() -> BlobStore:
+    """Get the BlobStore instance (only set when blob_max_disk_mb > 0)."""
+    if _blob_store is None:
+        raise RuntimeError("BlobStore not initialized")
+    return _blob_store
+
+
+def set_instances(
+    process_pool: ProcessPool,
+    turn_job_manager: TurnJobManager,
+    thread_cache: ThreadReadCache,
+    approval_engine: ApprovalEngine,
+    watchdog: Watchdog,
+    thread_index: ThreadIndex,
+    event_store: Optional[EventStore] = None,
+    blob_store: Optional[BlobStore] = None,
+) -> None:
     """Set global instances (called during app startup)."""
-    global _process_manager, _jsonrpc_client
-    _process_manager = process_manager
-    _jsonrpc_client = jsonrpc_client
+    global _process_pool, _turn_job_manager, _thread_cache, _approval_engine, _watchdog
+    global _thread_index, _event_store, _blob_store
+    _process_pool = process_pool
+    _turn_job_manager = turn_job_manager
+    _thread_cache = thread_cache
+    _approval_engine = approval_engine
+    _watchdog = watchdog
+    _thread_index = thread_index
+    _event_store = event_store
+    _blob_store = blob_store
 
 
 def clear_instances() -> None:
     """Clear global instances (called during app shutdown)."""
-    global _process_manager, _jsonrpc_client
-    _process_manager = None
-    _jsonrpc_client = None
+    global _process_pool, _turn_job_manager, _thread_cache, _approval_engine, _watchdog
+    global _thread_index, _event_store, _blob_store
+    _process_pool = None
+    _turn_job_manager = None
+    _thread_cache = None
+    _approval_engine = None
+    _watchdog = None
+    _thread_index = None
+    _event_store = None
+    _blob_store = None
@@ -1,12 +1,35 @@
+import asyncio
 from contextlib import asynccontextmanager
 import structlog
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from .config import settings
-from .core import ProcessManager, JsonRpcClient
+from .core import ProcessPool, metrics
+from .core.admission import ThreadTurnQueue
+from .core.approvals import ApprovalEngine, ApprovalPolicy
+from .core.blobs import BlobStore
+from .core.event_store import EventStore
+from .core.method_cache import MethodCache
+from .core.tenants import TenantMiddleware, TenantPolicy, TenantResolver, TenantScheduler
+from .core.thread_cache import ThreadReadCache
+from .core.thread_index import ThreadIndex
+from .core.turn_jobs import TurnJobManager
+from .core.watchdog import Watchdog
 from .dependencies import set_instances, clear_instances
-from .routers import thread_router, turn_router, skill_router
+from .routers import (
+    thread_router,
+    threads_router,
+    turn_router,
+    skill_router,
+    debug_router,
+    approvals_router,
+    history_router,
+    blobs_router,
+    rpc_router,
+    ws_router,
+)
 
 # Configure structured logging
 structlog.configure(
@@ -31,27 +54,106 @@ async def lifespan(app: FastAPI):
     """Manage application lifecycle - start/stop codex subprocess."""
     logger.info("Starting Codex Agent Server")
 
-    # Create and start process manager
-    process_manager = ProcessManager(
+    # Create process pool
+    process_pool = ProcessPool(
+        size=settings.pool_size,
         codex_path=settings.codex_path,
         client_name=settings.client_name,
         client_title=settings.client_title,
         client_version=settings.client_version,
+        standby=settings.standby_processes,
     )
 
-    # Create JSON-RPC client
-    jsonrpc_client = JsonRpcClient(process_manager)
+    # Memoize read-mostly methods (skills/list, model/list, config/read)
+    process_pool.set_method_cache(MethodCache(settings.method_cache_ttls))
 
-    try:
-        # Start subprocess and initialize
-        await process_manager.start()
-        await process_manager.initialize(timeout=settings.initialization_timeout)
+    # One running turn per thread; later turn/start calls wait in FIFO order
+    process_pool.set_turn_queue(
+        ThreadTurnQueue(settings.thread_turn_queue_depth, hold_timeout=settings.request_timeout)
+    )
+
+    # Weighted fair admission of turns across tenants, with per-tenant limits
+    default_policy = TenantPolicy(
+        weight=settings.tenant_weight,
+        rate=settings.tenant_rate,
+        burst=settings.tenant_burst,
+        max_running=settings.tenant_max_running,
+        max_queued=settings.tenant_max_queued,
+    )
+    tenant_scheduler = TenantScheduler(
+        default_policy,
+        {name: default_policy.updated(overrides) for name, overrides in settings.tenant_policies.items()},
+        max_running=settings.max_concurrent_turns,
+        hold_timeout=settings.request_timeout,
+    )
+    process_pool.set_tenant_scheduler(tenant_scheduler)
+    tenant_scheduler.register_metrics()
+
+    process_pool.register_metrics()
+
+    # Answer approval requests from the app-server by policy
+    approval_engine = ApprovalEngine(
+        ApprovalPolicy(
+            default=settings.approval_default,
+            command_allowlist=settings.approval_command_allowlist,
+            command_denylist=settings.approval_command_denylist,
+            writable_roots=settings.approval_writable_roots,
+        ),
+        ask_timeout=settings.approval_timeout,
+    )
+    approval_engine.attach(process_pool)
+
+    # Temp-file store for item fields over the per-turn memory budget
+    blob_store = None
+    if settings.item_field_max_chars > 0 and settings.blob_max_disk_mb > 0:
+        blob_store = BlobStore(
+            settings.blob_dir,
+            ttl=settings.blob_ttl,
+            max_bytes=settings.blob_max_disk_mb * 1024 * 1024,
+        )
+
+    # Create asynchronous turn job table
+    turn_job_manager = TurnJobManager(process_pool, blobs=blob_store)
+
+    # Create thread/read cache
+    thread_cache = ThreadReadCache(max_entries=settings.thread_cache_size)
+
+    # Sorted thread listing, kept current from notifications and call results
+    thread_index = ThreadIndex(process_pool, page_size=settings.thread_index_page_size)
+    thread_index.attach(process_pool)
+
+    # Probe for hung processes and recycle bloated ones
+    watchdog = Watchdog(process_pool)
+
+    # Record completed turns and items for history queries
+    event_store = None
+    if settings.event_store_path:
+        event_store = EventStore(
+            settings.event_store_path,
+            batch_size=settings.event_store_batch_size,
+            flush_interval=settings.event_store_flush_interval,
+        )
+        event_store.attach(process_pool)
+
+    lag_monitor = asyncio.create_task(metrics.monitor_event_loop_lag())
 
-        # Start message reader
-        await jsonrpc_client.start()
+    # Spawn, initialize and attach readers for all pooled processes while
+    # the rest of the server starts up
+    pool_start = asyncio.create_task(process_pool.start())
+
+    try:
+        if blob_store is not None:
+            await blob_store.start()
+        await turn_job_manager.start()
+        thread_cache.attach(process_pool)
+        if event_store is not None:
+            await event_store.start()
+        await pool_start
+        await watchdog.start()
+        await thread_index.start()
 
         # Set global instances
-        set_instances(process_manager, jsonrpc_client)
+        set_instances(process_pool, turn_job_manager, thread_cache, approval_engine, watchdog, thread_index, event_store, blob_store)
 
         logger.info("Codex Agent Server ready")
         yield
@@ -59,9 +161,18 @@ async def lifespan(app: FastAPI):
     finally:
         logger.info("Shutting down Codex Agent Server")
 
-        # Stop client and process
-        await jsonrpc_client.stop()
-        await process_manager.stop()
+        lag_monitor.cancel()
+        pool_start.cancel()
+
+        # Stop jobs, then all clients and processes
+        await watchdog.stop()
+        await thread_index.stop()
+        await turn_job_manager.stop()
+        await process_pool.stop()
+        if event_store is not None:
+            await event_store.stop()
+        if blob_store is not None:
+            await blob_store.stop()
 
         # Clear global instances
         clear_instances()
@@ -86,22 +197,66 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Tag each request and WebSocket connection with its tenant for turn scheduling
+app.add_middleware(
+    TenantMiddleware,
+    resolver=TenantResolver(settings.tenant_header, settings.tenant_api_keys),
+)
+
 # Include routers
 app.include_router(thread_router)
+app.include_router(threads_router)
 app.include_router(turn_router)
 app.include_router(skill_router)
+app.include_router(approvals_router)
+app.include_router(debug_router)
+app.include_router(history_router)
+app.include_router(blobs_router)
+app.include_router(rpc_router)
+app.include_router(ws_router)
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    from .dependencies import get_process_manager
+    from .dependencies import (
+        get_process_pool,
+        get_turn_job_manager,
+        get_thread_cache,
+        get_approval_engine,
+        get_watchdog,
+        get_thread_index,
+        get_event_store,
+        get_blob_store,
+    )
+
+    try:
+        event_store = get_event_store().stats()
+    except RuntimeError:
+        event_store = None
+
+    try:
+        blobs = get_blob_store().stats()
+    except RuntimeError:
+        blobs = None
 
     try:
-        pm = get_process_manager()
+        pool = get_process_pool()
         return {
             "status": "healthy",
-            "codex_alive": pm.is_alive,
+            "codex_alive": pool.is_alive,
+            "processes": pool.stats(),
+            "standbys": pool.standby_stats(),
+            "watchdog": get_watchdog().stats(),
+            "thread_index": get_thread_index().stats(),
+            "turn_jobs": get_turn_job_manager().stats(),
+            "thread_cache": get_thread_cache().stats(),
+            "method_cache": pool.method_cache_stats(),
+            "turn_queue": pool.turn_queue_stats(),
+            "tenants": pool.tenant_stats(),
+            "approvals": get_approval_engine().stats(),
+            "event_store": event_store,
+            "blobs": blobs,
         }
     except RuntimeError:
         return {
@@ -110,6 +265,15 @@ async def health_check():
         }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint() -> PlainTextResponse:
+    """Prometheus text-format metrics."""
+    return PlainTextResponse(
+        metrics.registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -121,8 +285,24 @@ async def root():
             "thread/resume": "POST /api/thread/resume",
             "thread/fork": "POST /api/thread/fork",
             "thread/read": "POST /api/thread/read",
+            "thread/list": "GET /api/threads",
+            "thread/loaded/list": "GET /api/threads/loaded",
             "turn/start": "POST /api/turn/start",
+            "turn/stream": "POST /api/turn/stream",
+            "turn/submit": "POST /api/turn/submit",
+            "turn/jobs": "GET /api/turn/jobs/{job_id}",
+            "turn/queue": "GET /api/turn/queue/{thread_id}",
             "skills/list": "POST /api/skills/list",
             "skills/config/write": "POST /api/skills/config/write",
+            "approvals/policy": "GET|POST /api/approvals/policy",
+            "approvals/pending": "GET /api/approvals/pending",
+            "approvals/answer": "POST /api/approvals/{approval_id}",
+            "debug/stderr": "GET /api/debug/stderr?tail=N",
+            "history/turns": "GET /api/history/threads/{thread_id}/turns",
+            "history/items": "GET /api/history/threads/{thread_id}/items",
+            "history/search": "GET /api/history/search?q=",
+            "blobs": "GET /api/blobs/{blob_id}",
+            "rpc/batch": "POST /api/rpc/batch",
+            "ws": "WS /ws",
         },
     }
@@ -1,22 +1,59 @@
-from .jsonrpc import JsonRpcRequest, JsonRpcResponse, JsonRpcError, JsonRpcNotification
-from .thread import Thread, ThreadStartParams, ThreadResumeParams, ThreadForkParams, ThreadReadParams
-from .turn import Turn, TurnInput, TurnStartParams
+from .jsonrpc import (
+    JsonRpcRequest,
+    JsonRpcResponse,
+    JsonRpcError,
+    JsonRpcNotification,
+    RpcCall,
+    RpcBatchEntry,
+    RpcBatchResponse,
+)
+from .thread import (
+    Thread,
+    ThreadStartParams,
+    ThreadResumeParams,
+    ThreadForkParams,
+    ThreadReadParams,
+    ThreadSummary,
+    ThreadListResponse,
+    ThreadLoadedListResponse,
+)
+from .turn import Turn, TurnInput, TurnStartParams, TurnJobStatus, TurnQueueState
 from .skill import Skill, SkillsListParams, SkillsConfigWriteParams
+from .approvals import ApprovalPolicyParams, ApprovalAnswer, PendingApproval
+from .debug import StderrLine, StderrTailResponse
+from .history import HistoryTurn, HistoryItem, HistoryTurnsResponse, HistoryItemsResponse
 
 __all__ = [
     "JsonRpcRequest",
     "JsonRpcResponse",
     "JsonRpcError",
     "JsonRpcNotification",
+    "RpcCall",
+    "RpcBatchEntry",
+    "RpcBatchResponse",
     "Thread",
     "ThreadStartParams",
     "ThreadResumeParams",
     "ThreadForkParams",
     "ThreadReadParams",
+    "ThreadSummary",
+    "ThreadListResponse",
+    "ThreadLoadedListResponse",
     "Turn",
     "TurnInput",
     "TurnStartParams",
+    "TurnJobStatus",
+    "TurnQueueState",
     "Skill",
     "SkillsListParams",
     "SkillsConfigWriteParams",
+    "ApprovalPolicyParams",
+    "ApprovalAnswer",
+    "PendingApproval",
+    "StderrLine",
+    "StderrTailResponse",
+    "HistoryTurn",
+    "HistoryItem",
+    "HistoryTurnsResponse",
+    "HistoryItemsResponse",
 ]
@@ -0,0 +1,54 @@
+from typing import Optional, List, Any, Literal
+from pydantic import BaseModel
+
+
+class ApprovalPolicyParams(BaseModel):
+    """Per-thread override of the approval policy; unset fields inherit the global policy."""
+
+    threadId: str
+    default: Optional[Literal["accept", "decline", "ask"]] = None
+    commandAllowlist: Optional[List[str]] = None
+    commandDenylist: Optional[List[str]] = None
+    writableRoots: Optional[List[str]] = None
+
+
+class ApprovalPolicyResponse(BaseModel):
+    """Effective approval policy."""
+
+    threadId: Optional[str] = None
+    default: str
+    commandAllowlist: List[str]
+    commandDenylist: List[str]
+    writableRoots: List[str]
+
+
+class ApprovalAnswer(BaseModel):
+    """Client answer to a pending approval.
+
+    ``decision`` answers command and file-change approvals (and picks the
+    accept/decline option of tool/requestUserInput); ``answers`` is passed
+    through verbatim for tool/requestUserInput.
+    """
+
+    decision: Optional[Literal["accept", "decline"]] = None
+    acceptSettings: Optional[dict] = None
+    answers: Optional[dict] = None
+
+
+class PendingApproval(BaseModel):
+    """An approval request waiting for an interactive client."""
+
+    approvalId: str
+    kind: str  # "command", "fileChange", "userInput"
+    method: str
+    threadId: Optional[str] = None
+    turnId: Optional[str] = None
+    itemId: Optional[str] = None
+    createdAt: float
+    params: Any = None
+
+
+class PendingApprovalsResponse(BaseModel):
+    """Response from GET /api/approvals/pending."""
+
+    data: List[PendingApproval]
@@ -0,0 +1,27 @@
+from typing import Optional, List
+from pydantic import BaseModel
+
+
+class StderrLine(BaseModel):
+    """One line the app-server wrote to stderr."""
+
+    time: float
+    pid: Optional[int] = None
+    level: str  # "debug", "info", "warning", "error"
+    text: str
+
+
+class ProcessStderr(BaseModel):
+    """Buffered stderr of one pooled app-server process."""
+
+    process: int
+    totalLines: int
+    suppressedLines: int
+    droppedLines: int
+    lines: List[StderrLine]
+
+
+class StderrTailResponse(BaseModel):
+    """Response from GET /api/debug/stderr."""
+
+    data: List[ProcessStderr]
@@ -0,0 +1,41 @@
+from typing import Optional, List, Any
+from pydantic import BaseModel
+
+
+class HistoryTurn(BaseModel):
+    """A completed turn from the event store (without its items)."""
+
+    seq: int
+    threadId: str
+    turnId: str
+    status: Optional[str] = None
+    completedAt: float
+    turn: Any
+
+
+class HistoryItem(BaseModel):
+    """A completed item from the event store."""
+
+    seq: int
+    threadId: str
+    turnId: Optional[str] = None
+    itemId: Optional[str] = None
+    type: Optional[str] = None
+    status: Optional[str] = None
+    completedAt: float
+    item: Any
+    snippet: Optional[str] = None  # search results only
+
+
+class HistoryTurnsResponse(BaseModel):
+    """Response from GET /api/history/threads/{thread_id}/turns."""
+
+    data: List[HistoryTurn]
+    nextCursor: Optional[int] = None
+
+
+class HistoryItemsResponse(BaseModel):
+    """Response from the history item listing and search endpoints."""
+
+    data: List[HistoryItem]
+    nextCursor: Optional[int] = None
@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, List, Optional
 from pydantic import BaseModel
 
 
@@ -31,3 +31,23 @@ class JsonRpcNotification(BaseModel):
 
     method: str
     params: dict = {}
+
+
+class RpcCall(BaseModel):
+    """One entry of a POST /api/rpc/batch request."""
+
+    method: str
+    params: Optional[dict] = None
+
+
+class RpcBatchEntry(BaseModel):
+    """Outcome of one batched call: ``result`` or ``error``."""
+
+    result: Optional[Any] = None
+    error: Optional[JsonRpcError] = None
+
+
+class RpcBatchResponse(BaseModel):
+    """Response from POST /api/rpc/batch, in request order."""
+
+    data: List[RpcBatchEntry]
@@ -65,3 +65,25 @@ class ThreadReadResponse(BaseModel):
     """Response from thread/read."""
 
     thread: Thread
+
+
+class ThreadSummary(Thread):
+    """Thread as listed by GET /api/threads."""
+
+    cwd: Optional[str] = None
+    source: Optional[Any] = None
+    sourceKind: str = "unknown"
+    archived: bool = False
+
+
+class ThreadListResponse(BaseModel):
+    """One page of GET /api/threads."""
+
+    data: List[ThreadSummary]
+    nextCursor: Optional[str] = None
+
+
+class ThreadLoadedListResponse(BaseModel):
+    """Thread ids loaded in the app-server processes."""
+
+    data: List[str]
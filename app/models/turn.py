@@ -56,3 +56,26 @@ class TurnStartResponse(BaseModel):
     """Response from turn/start."""
 
     turn: Turn
+
+
+class TurnQueueState(BaseModel):
+    """Running turn of a thread and the turn/start calls queued behind it."""
+
+    threadId: str
+    busy: bool
+    turnId: Optional[str] = None
+    runningFor: Optional[float] = None  # seconds
+    queued: List[float] = []  # seconds each queued call has waited, in queue order
+
+
+class TurnJobStatus(BaseModel):
+    """State of an asynchronous turn job."""
+
+    jobId: str
+    status: str  # "queued", "running", "completed", "failed"
+    queuePosition: Optional[int] = None
+    createdAt: float
+    startedAt: Optional[float] = None
+    finishedAt: Optional[float] = None
+    turn: Optional[Turn] = None
+    error: Optional[dict] = None
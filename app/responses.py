@@ -0,0 +1,56 @@
+from typing import Any, Optional
+from fastapi import Query
+from fastapi.responses import Response
+from pydantic import BaseModel, ValidationError
+import structlog
+
+from .core.codec import get_codec
+from .config import settings
+
+logger = structlog.get_logger(__name__)
+
+_codec = get_codec(settings.json_codec)
+
+
+class PassthroughResponse(Response):
+    """JSON response encoded straight from the app-server result.
+
+    Skips building the route's Pydantic model and FastAPI's
+    ``response_model`` validation, so large results are encoded once.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return _codec.dumps(content)
+
+
+def passthrough_query(
+    passthrough: Optional[bool] = Query(
+        None,
+        description="Return the app-server result as is, without response model validation",
+    ),
+) -> Optional[bool]:
+    return passthrough
+
+
+def use_passthrough(method: str, requested: Optional[bool]) -> bool:
+    """Per-request choice, falling back to ``settings.passthrough_methods``."""
+    if requested is not None:
+        return requested
+    return method in settings.passthrough_methods
+
+
+def passthrough_response(result: dict, model: type[BaseModel]) -> PassthroughResponse:
+    """Send ``result`` unvalidated, checking it against ``model`` in debug mode."""
+    if settings.passthrough_validate:
+        try:
+            model.model_validate(result)
+        except ValidationError as e:
+            logger.warning(
+                "Passthrough result does not match response model",
+                model=model.__name__,
+                errors=e.error_count(),
+                error=str(e).splitlines()[0],
+            )
+    return PassthroughResponse(result)
@@ -1,5 +1,22 @@
-from .thread import router as thread_router
+from .thread import router as thread_router, threads_router
 from .turn import router as turn_router
 from .skill import router as skill_router
+from .approvals import router as approvals_router
+from .debug import router as debug_router
+from .history import router as history_router
+from .blobs import router as blobs_router
+from .rpc import router as rpc_router
+from .ws import router as ws_router
 
-__all__ = ["thread_router", "turn_router", "skill_router"]
+__all__ = [
+    "thread_router",
+    "threads_router",
+    "turn_router",
+    "skill_router",
+    "approvals_router",
+    "debug_router",
+    "history_router",
+    "blobs_router",
+    "rpc_router",
+    "ws_router",
+]
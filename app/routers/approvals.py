@@ -0,0 +1,90 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+import structlog
+
+from ..dependencies import get_approval_engine
+from ..core.approvals import ApprovalEngine, ApprovalPolicy
+from ..models.approvals import (
+    ApprovalAnswer,
+    ApprovalPolicyParams,
+    ApprovalPolicyResponse,
+    PendingApproval,
+    PendingApprovalsResponse,
+)
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/api/approvals", tags=["approvals"])
+
+
+def _policy_response(policy: ApprovalPolicy, thread_id: Optional[str] = None) -> ApprovalPolicyResponse:
+    return ApprovalPolicyResponse(
+        threadId=thread_id,
+        default=policy.default,
+        commandAllowlist=list(policy.command_allowlist),
+        commandDenylist=list(policy.command_denylist),
+        writableRoots=list(policy.writable_roots),
+    )
+
+
+@router.get("/policy", response_model=ApprovalPolicyResponse)
+async def get_policy(
+    threadId: Optional[str] = Query(None, description="Effective policy for this thread"),
+    engine: ApprovalEngine = Depends(get_approval_engine),
+) -> ApprovalPolicyResponse:
+    """Get the global approval policy, or the effective one of a thread."""
+    return _policy_response(engine.policy_for(threadId), threadId)
+
+
+@router.post("/policy", response_model=ApprovalPolicyResponse)
+async def set_policy(
+    params: ApprovalPolicyParams,
+    engine: ApprovalEngine = Depends(get_approval_engine),
+) -> ApprovalPolicyResponse:
+    """Override approval rules for one thread."""
+    try:
+        policy = engine.set_thread_policy(
+            params.threadId,
+            default=params.default,
+            command_allowlist=params.commandAllowlist,
+            command_denylist=params.commandDenylist,
+            writable_roots=params.writableRoots,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _policy_response(policy, params.threadId)
+
+
+@router.delete("/policy/{thread_id}")
+async def clear_policy(
+    thread_id: str,
+    engine: ApprovalEngine = Depends(get_approval_engine),
+) -> dict:
+    """Drop a thread's override so it follows the global policy again."""
+    return {"removed": engine.clear_thread_policy(thread_id)}
+
+
+@router.get("/pending", response_model=PendingApprovalsResponse)
+async def list_pending(
+    threadId: Optional[str] = Query(None),
+    engine: ApprovalEngine = Depends(get_approval_engine),
+) -> PendingApprovalsResponse:
+    """List approval requests waiting for an interactive client."""
+    return PendingApprovalsResponse(
+        data=[PendingApproval(**approval.to_event()) for approval in engine.pending(threadId)]
+    )
+
+
+@router.post("/{approval_id}")
+async def answer_approval(
+    approval_id: str,
+    answer: ApprovalAnswer,
+    engine: ApprovalEngine = Depends(get_approval_engine),
+) -> dict:
+    """Answer a pending approval sent on an interactive turn stream."""
+    if answer.decision is None and answer.answers is None:
+        raise HTTPException(status_code=400, detail="Provide a decision or answers")
+
+    if not engine.resolve(approval_id, answer.model_dump(exclude_none=True)):
+        raise HTTPException(status_code=404, detail=f"Approval not pending: {approval_id}")
+    return {"approvalId": approval_id, "answered": True}
@@ -0,0 +1,108 @@
+import asyncio
+import re
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import StreamingResponse
+import structlog
+
+from ..dependencies import get_blob_store
+from ..core.blobs import BlobStore
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/api/blobs", tags=["blobs"])
+
+CHUNK_BYTES = 256 * 1024
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _store() -> BlobStore:
+    try:
+        return get_blob_store()
+    except RuntimeError:
+        raise HTTPException(status_code=404, detail="Blob store is disabled")
+
+
+def _parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """First and last byte of a single ``bytes=`` range, or None to send everything.
+
+    Raises HTTPException(416) for a range outside the blob.
+    """
+    match = _RANGE.match(header.strip())
+    if match is None:
+        # Multiple or unknown ranges: ignore the header as RFC 9110 allows
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail=f"Range not satisfiable: {header}",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+async def _read_file(path: str, start: int, length: int) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    # Open before streaming so a blob evicted meanwhile can still be read
+    f = await loop.run_in_executor(None, open, path, "rb")
+    try:
+        await loop.run_in_executor(None, f.seek, start)
+        while length > 0:
+            chunk = await loop.run_in_executor(None, f.read, min(CHUNK_BYTES, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+@router.get("/{blob_id}")
+async def blob_get(
+    blob_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    store: BlobStore = Depends(_store),
+) -> StreamingResponse:
+    """Stream an item field that was moved out of a turn result.
+
+    Supports a single ``Range: bytes=first-last`` (or ``bytes=-suffix``)
+    for reading large outputs piece by piece.
+    """
+    blob = await store.get(blob_id)
+    if blob is None:
+        raise HTTPException(status_code=404, detail=f"Blob not found: {blob_id}")
+
+    size = blob.size
+    byte_range = _parse_range(range_header, size) if range_header and size else None
+    start, end = byte_range if byte_range is not None else (0, size - 1)
+    headers = {"Accept-Ranges": "bytes", "Content-Length": str(end - start + 1)}
+    if byte_range is not None:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    try:
+        body = _read_file(blob.path, start, end - start + 1)
+        # Fail here, not mid-stream, if the file is already gone
+        first = await body.__anext__() if size else b""
+    except (FileNotFoundError, StopAsyncIteration):
+        raise HTTPException(status_code=404, detail=f"Blob not found: {blob_id}")
+
+    async def stream() -> AsyncIterator[bytes]:
+        yield first
+        async for chunk in body:
+            yield chunk
+
+    return StreamingResponse(
+        stream(),
+        status_code=206 if byte_range is not None else 200,
+        media_type="text/plain; charset=utf-8",
+        headers=headers,
+    )
@@ -0,0 +1,39 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+import structlog
+
+from ..dependencies import get_process_pool
+from ..core.process_pool import ProcessPool
+from ..models.debug import ProcessStderr, StderrLine, StderrTailResponse
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/api/debug", tags=["debug"])
+
+
+@router.get("/stderr", response_model=StderrTailResponse)
+async def stderr_tail(
+    tail: int = Query(100, ge=1, description="Most recent lines to return per process"),
+    process: Optional[int] = Query(None, ge=0, description="Only this pool member"),
+    pool: ProcessPool = Depends(get_process_pool),
+) -> StderrTailResponse:
+    """Return the latest app-server stderr lines from the ring buffers."""
+    members = pool.members
+    if process is not None:
+        members = [member for member in members if member.index == process]
+        if not members:
+            raise HTTPException(status_code=404, detail=f"No such process: {process}")
+
+    data = []
+    for member in members:
+        buffer = member.process.stderr
+        data.append(
+            ProcessStderr(
+                process=member.index,
+                totalLines=buffer.total_lines,
+                suppressedLines=buffer.suppressed_lines,
+                droppedLines=buffer.dropped_lines,
+                lines=[StderrLine(**line) for line in buffer.tail(tail)],
+            )
+        )
+    return StderrTailResponse(data=data)
@@ -0,0 +1,77 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+import structlog
+
+from ..dependencies import get_event_store
+from ..core.event_store import EventStore
+from ..models.history import HistoryItem, HistoryItemsResponse, HistoryTurn, HistoryTurnsResponse
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/api/history", tags=["history"])
+
+
+def _store() -> EventStore:
+    try:
+        return get_event_store()
+    except RuntimeError:
+        raise HTTPException(status_code=503, detail="Event store is disabled (set CODEX_EVENT_STORE_PATH)")
+
+
+def _next_cursor(rows: list[dict], limit: int) -> Optional[int]:
+    return rows[-1]["seq"] if len(rows) == limit else None
+
+
+@router.get("/threads/{thread_id}/turns", response_model=HistoryTurnsResponse)
+async def history_turns(
+    thread_id: str,
+    cursor: int = Query(0, ge=0, description="nextCursor of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    status: Optional[str] = Query(None, description="e.g. completed, failed, interrupted"),
+    store: EventStore = Depends(_store),
+) -> HistoryTurnsResponse:
+    """Page through the completed turns of a thread, oldest first."""
+    rows = await store.turns(thread_id, after=cursor, limit=limit, status=status)
+    return HistoryTurnsResponse(
+        data=[HistoryTurn(**row) for row in rows],
+        nextCursor=_next_cursor(rows, limit),
+    )
+
+
+@router.get("/threads/{thread_id}/items", response_model=HistoryItemsResponse)
+async def history_items(
+    thread_id: str,
+    cursor: int = Query(0, ge=0, description="nextCursor of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    type: Optional[str] = Query(None, description="Item type, e.g. commandExecution or fileChange"),
+    turnId: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    store: EventStore = Depends(_store),
+) -> HistoryItemsResponse:
+    """Page through the completed items of a thread, oldest first."""
+    rows = await store.items(
+        thread_id, after=cursor, limit=limit, item_type=type, turn_id=turnId, status=status
+    )
+    return HistoryItemsResponse(
+        data=[HistoryItem(**row) for row in rows],
+        nextCursor=_next_cursor(rows, limit),
+    )
+
+
+@router.get("/search", response_model=HistoryItemsResponse)
+async def history_search(
+    q: str = Query(..., min_length=1, description="Words that must all appear in the item text, as substrings, ignoring case"),
+    threadId: Optional[str] = Query(None),
+    type: Optional[str] = Query(None, description="Item type, e.g. agentMessage"),
+    limit: int = Query(50, ge=1, le=500),
+    store: EventStore = Depends(_store),
+) -> HistoryItemsResponse:
+    """Search the text of stored agent and user messages, newest first."""
+    q = q.strip()
+    if not q:
+        raise HTTPException(status_code=400, detail="Search query is empty")
+    try:
+        rows = await store.search(q, thread_id=threadId, item_type=type, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return HistoryItemsResponse(data=[HistoryItem(**row) for row in rows])
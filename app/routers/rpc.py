@@ -0,0 +1,52 @@
+import asyncio
+from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException
+import structlog
+
+from ..dependencies import get_jsonrpc_client
+from ..core.gateway import error_response, method_allowed, method_not_allowed
+from ..core.process_pool import ProcessPool
+from ..models.jsonrpc import RpcBatchEntry, RpcBatchResponse, RpcCall
+from ..config import settings
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(prefix="/api/rpc", tags=["rpc"])
+
+
+@router.post("/batch", response_model=RpcBatchResponse)
+async def rpc_batch(
+    calls: List[RpcCall] = Body(...),
+    client: ProcessPool = Depends(get_jsonrpc_client),
+) -> RpcBatchResponse:
+    """Send many JSON-RPC calls in one request.
+
+    All allowed calls are written to the app-server at once and run
+    concurrently; results come back in request order, each with its own
+    ``result`` or ``error``. Methods outside ``rpc_allowed_methods`` fail
+    individually without being sent.
+    """
+    if not calls:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(calls) > settings.rpc_batch_max_calls:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch has {len(calls)} calls; the limit is {settings.rpc_batch_max_calls}",
+        )
+
+    async def run(call: RpcCall) -> dict:
+        if not method_allowed(call.method):
+            return method_not_allowed(None, call.method)
+        try:
+            return {"result": await client.call(call.method, call.params or {}, timeout=settings.request_timeout)}
+        except Exception as e:
+            return error_response(None, e)
+
+    responses = await asyncio.gather(*(run(call) for call in calls))
+    failed = sum(1 for response in responses if "error" in response)
+    if failed:
+        logger.info("rpc/batch finished with errors", calls=len(calls), failed=failed)
+
+    return RpcBatchResponse(
+        data=[RpcBatchEntry(result=response.get("result"), error=response.get("error")) for response in responses]
+    )
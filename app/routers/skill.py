@@ -1,13 +1,17 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException
 import structlog
 
 from ..dependencies import get_jsonrpc_client
-from ..core.jsonrpc_client import JsonRpcClient, JsonRpcError
+from ..core.jsonrpc_client import JsonRpcError
+from ..core.process_manager import ProcessUnavailableError
+from ..core.process_pool import ProcessPool
 from ..models.skill import (
     SkillsListParams,
     SkillsListResponse,
     SkillsConfigWriteParams,
 )
+from ..responses import passthrough_query, passthrough_response, use_passthrough
 
 logger = structlog.get_logger(__name__)
 
@@ -17,7 +21,8 @@ router = APIRouter(prefix="/api/skills", tags=["skills"])
 @router.post("/list", response_model=SkillsListResponse)
 async def skills_list(
     params: SkillsListParams,
-    client: JsonRpcClient = Depends(get_jsonrpc_client),
+    client: ProcessPool = Depends(get_jsonrpc_client),
+    passthrough: Optional[bool] = Depends(passthrough_query),
 ) -> SkillsListResponse:
     """List available skills."""
     try:
@@ -25,10 +30,15 @@ async def skills_list(
             "skills/list",
             params.model_dump(exclude_none=True),
         )
+        if use_passthrough("skills/list", passthrough):
+            return passthrough_response(result, SkillsListResponse)
         return SkillsListResponse(**result)
     except JsonRpcError as e:
         logger.error("skills/list failed", error=e.message, code=e.code)
         raise HTTPException(status_code=400, detail=e.to_dict())
+    except ProcessUnavailableError as e:
+        logger.error("skills/list unavailable", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error("skills/list error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -37,7 +47,7 @@ async def skills_list(
 @router.post("/config/write")
 async def skills_config_write(
     params: SkillsConfigWriteParams,
-    client: JsonRpcClient = Depends(get_jsonrpc_client),
+    client: ProcessPool = Depends(get_jsonrpc_client),
 ) -> dict:
     """Enable or disable a skill by path."""
     try:
@@ -49,6 +59,9 @@ async def skills_config_write(
     except JsonRpcError as e:
         logger.error("skills/config/write failed", error=e.message, code=e.code)
         raise HTTPException(status_code=400, detail=e.to_dict())
+    except ProcessUnavailableError as e:
+        logger.error("skills/config/write unavailable", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error("skills/config/write error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 import structlog
 
-from ..dependencies import get_jsonrpc_client
-from ..core.jsonrpc_client import JsonRpcClient, JsonRpcError
+from ..dependencies import get_jsonrpc_client, get_thread_cache, get_thread_index
+from ..core.jsonrpc_client import JsonRpcError
+from ..core.process_manager import ProcessUnavailableError
+from ..core.process_pool import ProcessPool
+from ..core.thread_cache import ThreadReadCache
+from ..core.thread_index import ThreadIndex, source_kind
 from ..models.thread import (
     ThreadStartParams,
     ThreadStartResponse,
@@ -12,17 +17,23 @@ from ..models.thread import (
     ThreadForkResponse,
     ThreadReadParams,
     ThreadReadResponse,
+    ThreadListResponse,
+    ThreadLoadedListResponse,
 )
+from ..responses import passthrough_query, passthrough_response, use_passthrough
+from ..config import settings
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/api/thread", tags=["thread"])
+threads_router = APIRouter(prefix="/api/threads", tags=["thread"])
 
 
 @router.post("/start", response_model=ThreadStartResponse)
 async def thread_start(
     params: ThreadStartParams,
-    client: JsonRpcClient = Depends(get_jsonrpc_client),
+    client: ProcessPool = Depends(get_jsonrpc_client),
+    passthrough: Optional[bool] = Depends(passthrough_query),
 ) -> ThreadStartResponse:
     """Create a new conversation thread."""
     try:
@@ -30,10 +41,15 @@ async def thread_start(
             "thread/start",
             params.model_dump(exclude_none=True),
         )
+        if use_passthrough("thread/start", passthrough):
+            return passthrough_response(result, ThreadStartResponse)
         return ThreadStartResponse(**result)
     except JsonRpcError as e:
         logger.error("thread/start failed", error=e.message, code=e.code)
         raise HTTPException(status_code=400, detail=e.to_dict())
+    except ProcessUnavailableError as e:
+        logger.error("thread/start unavailable", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error("thread/start error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -42,7 +58,8 @@ async def thread_start(
 @router.post("/resume", response_model=ThreadResumeResponse)
 async def thread_resume(
     params: ThreadResumeParams,
-    client: JsonRpcClient = Depends(get_jsonrpc_client),
+    client: ProcessPool = Depends(get_jsonrpc_client),
+    passthrough: Optional[bool] = Depends(passthrough_query),
 ) -> ThreadResumeResponse:
     """Resume an existing thread."""
     try:
@@ -50,10 +67,15 @@ async def thread_resume(
             "thread/resume",
             params.model_dump(exclude_none=True),
         )
+        if use_passthrough("thread/resume", passthrough):
+            return passthrough_response(result, ThreadResumeResponse)
         return ThreadResumeResponse(**result)
     except JsonRpcError as e:
         logger.error("thread/resume failed", error=e.message, code=e.code)
         raise HTTPException(status_code=400, detail=e.to_dict())
+    except ProcessUnavailableError as e:
+        logger.error("thread/resume unavailable", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error("thread/resume error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -62,7 +84,8 @@ async def thread_resume(
 @router.post("/fork", response_model=ThreadForkResponse)
 async def thread_fork(
     params: ThreadForkParams,
-    client: JsonRpcClient = Depends(get_jsonrpc_client),
+    client: ProcessPool = Depends(get_jsonrpc_client),
+    passthrough: Optional[bool] = Depends(passthrough_query),
 ) -> ThreadForkResponse:
     """Fork a thread into a new thread."""
     try:
@@ -70,10 +93,15 @@ async def thread_fork(
             "thread/fork",
             params.model_dump(exclude_none=True),
         )
+        if use_passthrough("thread/fork", passthrough):
+            return passthrough_response(result, ThreadForkResponse)
         return ThreadForkResponse(**result)
     except JsonRpcError as e:
         logger.error("thread/fork failed", error=e.message, code=e.code)
         raise HTTPException(status_code=400, detail=e.to_dict())
+    except ProcessUnavailableError as e:
+        logger.error("thread/fork unavailable", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error("thread/fork error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
@@ -82,18 +110,123 @@ async def thread_fork(
 @router.post("/read", response_model=ThreadReadResponse)
 async def thread_read(
     params: ThreadReadParams,
-    client: JsonRpcClient = Depends(get_jsonrpc_client),
+    client: ProcessPool = Depends(get_jsonrpc_client),
+    cache: ThreadReadCache = Depends(get_thread_cache),
+    passthrough: Optional[bool] = Depends(passthrough_query),
 ) -> ThreadReadResponse:
-    """Read a stored thread without resuming."""
+    """Read a stored thread without resuming.
+
+    Results are served from the thread/read cache until a notification or
+    bridge call touches the thread.
+    """
+    raw = use_passthrough("thread/read", passthrough)
     try:
+        cached = cache.get(params.threadId, params.includeTurns)
+        if cached is not None:
+            return passthrough_response(cached, ThreadReadResponse) if raw else ThreadReadResponse(**cached)
+
+        token = cache.token()
         result = await client.call(
             "thread/read",
             params.model_dump(exclude_none=True),
         )
+        cache.put(params.threadId, params.includeTurns, result, token)
+        if raw:
+            return passthrough_response(result, ThreadReadResponse)
         return ThreadReadResponse(**result)
     except JsonRpcError as e:
         logger.error("thread/read failed", error=e.message, code=e.code)
         raise HTTPException(status_code=400, detail=e.to_dict())
+    except ProcessUnavailableError as e:
+        logger.error("thread/read unavailable", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error("thread/read error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@threads_router.get("", response_model=ThreadListResponse)
+async def thread_list(
+    cursor: Optional[str] = Query(None, description="nextCursor of the previous page"),
+    limit: int = Query(50, ge=1, le=1000),
+    modelProvider: Optional[List[str]] = Query(None, description="Repeat to match any of several"),
+    sourceKinds: Optional[List[str]] = Query(None, description="e.g. cli, vscode, appServer; default cli, vscode"),
+    archived: bool = Query(False, description="List archived threads instead of active ones"),
+    createdAfter: Optional[int] = Query(None, description="Unix seconds, inclusive"),
+    createdBefore: Optional[int] = Query(None, description="Unix seconds, exclusive"),
+    index: ThreadIndex = Depends(get_thread_index),
+    client: ProcessPool = Depends(get_jsonrpc_client),
+) -> ThreadListResponse:
+    """List stored threads newest first from the bridge's thread index.
+
+    The index is seeded from thread/list at startup. Until the seed
+    finishes, and for cursors handed out by thread/list meanwhile, pages
+    come from thread/list directly after waiting up to
+    ``thread_index_wait`` seconds.
+    """
+    if await index.wait_ready(settings.thread_index_wait):
+        try:
+            data, next_cursor = index.list(
+                cursor=cursor,
+                limit=limit,
+                model_providers=modelProvider,
+                source_kinds=sourceKinds,
+                archived=archived,
+                created_after=createdAfter,
+                created_before=createdBefore,
+            )
+            return ThreadListResponse(data=data, nextCursor=next_cursor)
+        except ValueError as e:
+            if not cursor:
+                raise HTTPException(status_code=400, detail=str(e))
+
+    if createdAfter is not None or createdBefore is not None:
+        raise HTTPException(
+            status_code=503,
+            detail="Thread index is still loading; createdAfter and createdBefore are unavailable",
+            headers={"Retry-After": "1"},
+        )
+
+    params: dict = {"limit": limit, "archived": archived}
+    if cursor:
+        params["cursor"] = cursor
+    if modelProvider:
+        params["modelProviders"] = modelProvider
+    if sourceKinds:
+        params["sourceKinds"] = sourceKinds
+    try:
+        result = await client.call("thread/list", params)
+    except JsonRpcError as e:
+        logger.error("thread/list failed", error=e.message, code=e.code)
+        raise HTTPException(status_code=400, detail=e.to_dict())
+    except ProcessUnavailableError as e:
+        logger.error("thread/list unavailable", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("thread/list error", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+    data = [
+        dict(thread, sourceKind=source_kind(thread), archived=archived)
+        for thread in result.get("data") or []
+        if isinstance(thread, dict)
+    ]
+    return ThreadListResponse(data=data, nextCursor=result.get("nextCursor"))
+
+
+@threads_router.get("/loaded", response_model=ThreadLoadedListResponse)
+async def thread_loaded_list(
+    client: ProcessPool = Depends(get_jsonrpc_client),
+) -> ThreadLoadedListResponse:
+    """List thread ids loaded in memory across all app-server processes."""
+    try:
+        return ThreadLoadedListResponse(data=await client.loaded_threads())
+    except JsonRpcError as e:
+        logger.error("thread/loaded/list failed", error=e.message, code=e.code)
+        raise HTTPException(status_code=400, detail=e.to_dict())
+    except ProcessUnavailableError as e:
+        logger.error("thread/loaded/list unavailable", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("thread/loaded/list error", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
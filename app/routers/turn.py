@@ -1,107 +1,438 @@
 import asyncio
-from fastapi import APIRouter, Depends, HTTPException
+import json
+import math
+from typing import Any, AsyncIterator, Awaitable, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
 import structlog
 
-from ..dependencies import get_jsonrpc_client
-from ..core.jsonrpc_client import JsonRpcClient, JsonRpcError
-from ..models.turn import TurnStartParams, TurnStartResponse
+from ..dependencies import get_approval_engine, get_blob_store, get_jsonrpc_client, get_turn_job_manager
+from ..core.admission import ThreadBusyError
+from ..core.approvals import ApprovalEngine
+from ..core.blobs import BlobStore
+from ..core.coalesce import DeltaCoalescer
+from ..core.jsonrpc_client import JsonRpcError, notification_scope
+from ..core.process_manager import ProcessUnavailableError
+from ..core.process_pool import ProcessPool
+from ..core.tenants import TenantLimitError
+from ..core.turn_jobs import TurnJob, TurnJobManager
+from ..core.turn_runner import TurnTimer, interrupt_turn, run_turn, start_turn
+from ..models.turn import TurnStartParams, TurnStartResponse, TurnJobStatus, TurnQueueState
+from ..responses import passthrough_query, passthrough_response, use_passthrough
 from ..config import settings
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/api/turn", tags=["turn"])
 
+# Notifications forwarded to streaming clients
+STREAM_METHODS = (
+    "turn/started",
+    "turn/completed",
+    "turn/diff/updated",
+    "turn/plan/updated",
+    "item/started",
+    "item/completed",
+    "item/agentMessage/delta",
+    "item/plan/delta",
+    "item/reasoning/summaryTextDelta",
+    "item/reasoning/summaryPartAdded",
+    "item/reasoning/textDelta",
+    "item/commandExecution/outputDelta",
+    "item/fileChange/outputDelta",
+    "error",
+)
+
+# Interval between SSE keep-alive comments while the turn is quiet
+SSE_KEEPALIVE_INTERVAL = 15.0
+
+
+def _job_status(jobs: TurnJobManager, job: TurnJob) -> TurnJobStatus:
+    return TurnJobStatus(
+        jobId=job.id,
+        status=job.status,
+        queuePosition=jobs.queue_position(job),
+        createdAt=job.created_at,
+        startedAt=job.started_at,
+        finishedAt=job.finished_at,
+        turn=job.result.get("turn") if job.result else None,
+        error=job.error,
+    )
+
+
+def _blob_store() -> Optional[BlobStore]:
+    try:
+        return get_blob_store()
+    except RuntimeError:
+        return None
+
+
+def request_deadline(
+    x_request_timeout: Optional[float] = Header(
+        None,
+        gt=0,
+        description="Seconds before the bridge gives up on the turn and interrupts it",
+    ),
+) -> float:
+    """Per-request deadline from ``X-Request-Timeout``, capped at ``request_timeout``."""
+    if x_request_timeout is None:
+        return settings.request_timeout
+    return min(x_request_timeout, settings.request_timeout)
+
+
+async def _wait_for_disconnect(request: Request) -> None:
+    """Return once the client has closed the connection.
+
+    The request body has already been read, so the only message left on
+    ``receive`` is ``http.disconnect``.
+    """
+    while True:
+        message = await request.receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def _unless_disconnected(request: Request, work: Awaitable[Any]) -> Any:
+    """Await ``work``, cancelling it and raising ClientDisconnect if the client leaves first."""
+    task = asyncio.ensure_future(work)
+    disconnected = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise ClientDisconnect()
+        return task.result()
+    finally:
+        disconnected.cancel()
+        if not task.done():
+            task.cancel()
+
+
+def _tenant_limited(e: TenantLimitError) -> HTTPException:
+    headers = {"Retry-After": str(math.ceil(e.retry_after))} if e.retry_after is not None else None
+    return HTTPException(status_code=429, detail=str(e), headers=headers)
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 
 @router.post("/start", response_model=TurnStartResponse)
 async def turn_start(
     params: TurnStartParams,
-    client: JsonRpcClient = Depends(get_jsonrpc_client),
+    request: Request,
+    deadline: float = Depends(request_deadline),
+    client: ProcessPool = Depends(get_jsonrpc_client),
+    passthrough: Optional[bool] = Depends(passthrough_query),
+    blobs: Optional[BlobStore] = Depends(_blob_store),
 ) -> TurnStartResponse:
     """Start a new turn and wait for completion.
 
     This endpoint starts a turn and waits for the turn/completed notification
-    before returning the full response with all items.
+    before returning the full response with all items. While another turn
+    runs on the thread the call waits its turn, or answers 409 when
+    ``thread_turn_queue_depth`` callers are already waiting. Calls over
+    the tenant's rate or queue limit answer 429.
+
+    Item fields over the turn's memory budget are cut to a preview and
+    listed in ``item.spilled``; fetch the rest from ``GET /api/blobs/{id}``.
+
+    If the client disconnects, or ``X-Request-Timeout`` seconds pass, the
+    turn is interrupted instead of running on unattended.
     """
     try:
-        params_dict = params.model_dump(exclude_none=True)
-
-        # Track state for matching the completion notification
-        turn_state = {"expected_id": None, "completed": None}
-        collected_items: list = []
-        completion_event = asyncio.Event()
-
-        async def on_turn_completed(notification_params: dict) -> None:
-            """Handle turn/completed notification."""
-            turn = notification_params.get("turn", {})
-            turn_id = turn.get("id")
-
-            # Match by turn ID if we have it
-            if turn_state["expected_id"] is not None:
-                if turn_id == turn_state["expected_id"]:
-                    turn_state["completed"] = notification_params
-                    completion_event.set()
-            else:
-                # Store for later verification (shouldn't normally happen)
-                turn_state["completed"] = notification_params
-                completion_event.set()
-
-        async def on_item_completed(notification_params: dict) -> None:
-            """Handle item/completed notification - collect items."""
-            item = notification_params.get("item", {})
-            collected_items.append(item)
-
-        # Register handlers before starting turn to avoid race conditions
-        client.on_notification("turn/completed", on_turn_completed)
-        client.on_notification("item/completed", on_item_completed)
+        result = await _unless_disconnected(
+            request,
+            run_turn(client, params.model_dump(exclude_none=True), timeout=deadline, blobs=blobs),
+        )
+        if use_passthrough("turn/start", passthrough):
+            return passthrough_response(result, TurnStartResponse)
+        return TurnStartResponse(**result)
 
-        try:
-            # Start the turn - returns immediately with inProgress status
-            result = await client.call("turn/start", params_dict)
-            turn_state["expected_id"] = result.get("turn", {}).get("id")
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Turn completion timeout after {deadline}s",
+        )
+    except ClientDisconnect:
+        logger.info("turn/start client disconnected", thread_id=params.threadId)
+        raise HTTPException(status_code=499, detail="Client closed request")
+    except ThreadBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except TenantLimitError as e:
+        raise _tenant_limited(e)
+    except JsonRpcError as e:
+        logger.error("turn/start failed", error=e.message, code=e.code)
+        raise HTTPException(status_code=400, detail=e.to_dict())
+    except ProcessUnavailableError as e:
+        logger.error("turn/start unavailable", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error("turn/start error", error=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
 
-            if not turn_state["expected_id"]:
-                # No turn ID returned, return immediate result
-                logger.warning("turn/start returned no turn ID")
-                return TurnStartResponse(**result)
 
-            # Check if we already got the completion (unlikely but possible)
-            if turn_state["completed"] is not None:
-                completed_id = turn_state["completed"].get("turn", {}).get("id")
-                if completed_id == turn_state["expected_id"]:
-                    return TurnStartResponse(**turn_state["completed"])
+@router.post("/stream")
+async def turn_stream(
+    params: TurnStartParams,
+    request: Request,
+    interactive_approvals: bool = Query(
+        False,
+        alias="interactiveApprovals",
+        description="Send approvals no policy rule decides as approval/request events",
+    ),
+    coalesce_ms: Optional[float] = Query(
+        None,
+        alias="coalesceMs",
+        ge=0,
+        description="Merge consecutive deltas of an item within this many ms (0 = off)",
+    ),
+    deadline: float = Depends(request_deadline),
+    client: ProcessPool = Depends(get_jsonrpc_client),
+    approvals: ApprovalEngine = Depends(get_approval_engine),
+) -> StreamingResponse:
+    """Start a new turn and stream its events as Server-Sent Events.
 
-            # Wait for turn/completed notification
-            await asyncio.wait_for(
-                completion_event.wait(),
-                timeout=settings.request_timeout,
-            )
+    The first event is ``turn/start`` with the initial turn, followed by
+    ``turn/*``, ``item/*`` and delta notifications as they arrive. The
+    stream ends after ``turn/completed`` for this turn.
 
-            # Merge collected items into the turn response
-            completed_turn = turn_state["completed"].get("turn", {})
-            if collected_items and not completed_turn.get("items"):
-                completed_turn["items"] = collected_items
-                turn_state["completed"]["turn"] = completed_turn
+    With ``interactiveApprovals`` the stream also carries
+    ``approval/request`` events; answer them with
+    ``POST /api/approvals/{approvalId}`` before ``approval_timeout``.
 
-            return TurnStartResponse(**turn_state["completed"])
+    Runs of small deltas for the same item are merged for up to
+    ``coalesceMs`` (default ``delta_coalesce_ms``) before being sent.
 
-        finally:
-            # Always clean up the notification handlers
-            client.remove_notification_handler("turn/completed", on_turn_completed)
-            client.remove_notification_handler("item/completed", on_item_completed)
+    The turn is interrupted if the client disconnects before it completes
+    or ``X-Request-Timeout`` seconds pass. A client that falls
+    ``sse_send_queue`` events behind gets an ``error`` event and the
+    stream ends, interrupting the turn too.
+    """
+    params_dict = params.model_dump(exclude_none=True)
+    thread_id = params.threadId
+    turn_state: dict = {"expected_id": None, "done": False}
+    queue: asyncio.Queue = asyncio.Queue()
+    overflowed = False
+    timer = TurnTimer()
 
+    def enqueue(method: str, event: dict) -> None:
+        nonlocal overflowed
+        if overflowed:
+            return
+        if queue.qsize() >= settings.sse_send_queue:
+            # Slow consumer: end the stream instead of buffering without bound
+            overflowed = True
+            queue.put_nowait(None)
+            return
+        queue.put_nowait((method, event))
+
+    window = settings.delta_coalesce_ms if coalesce_ms is None else coalesce_ms
+    coalescer = DeltaCoalescer(
+        enqueue,
+        window=window / 1000,
+        max_bytes=settings.delta_coalesce_bytes,
+    )
+
+    def on_thread_event(method: str, notification_params: dict) -> None:
+        if method in STREAM_METHODS:
+            if method.startswith("item/"):
+                timer.item_seen()
+            coalescer.push(method, notification_params)
+
+    def on_turn_event(method: str, notification_params: dict) -> None:
+        # Thread-scoped handler already sees notifications carrying a threadId
+        if notification_scope(notification_params)[0] is None:
+            on_thread_event(method, notification_params)
+
+    def on_approval_request(event: dict) -> None:
+        coalescer.push("approval/request", event)
+
+    def remove_handlers() -> None:
+        coalescer.close()
+        client.remove_notification_handler("*", on_thread_event, thread_id=thread_id)
+        if turn_state["expected_id"]:
+            client.remove_notification_handler("*", on_turn_event, turn_id=turn_state["expected_id"])
+        if interactive_approvals:
+            approvals.remove_asker(thread_id, on_approval_request)
+
+    # Register thread-scoped handler before starting turn to avoid race conditions
+    client.on_notification("*", on_thread_event, thread_id=thread_id)
+    if interactive_approvals:
+        approvals.add_asker(thread_id, on_approval_request)
+
+    try:
+        result = await _unless_disconnected(request, start_turn(client, params_dict, deadline))
+    except ClientDisconnect:
+        remove_handlers()
+        logger.info("turn/stream client disconnected before start", thread_id=thread_id)
+        raise HTTPException(status_code=499, detail="Client closed request")
     except asyncio.TimeoutError:
-        logger.error(
-            "turn/start timeout waiting for completion",
-            turn_id=turn_state.get("expected_id"),
-            timeout=settings.request_timeout,
-        )
-        raise HTTPException(
-            status_code=504,
-            detail=f"Turn completion timeout after {settings.request_timeout}s",
-        )
+        remove_handlers()
+        raise HTTPException(status_code=504, detail=f"Turn start timeout after {deadline}s")
+    except ThreadBusyError as e:
+        remove_handlers()
+        raise HTTPException(status_code=409, detail=str(e))
+    except TenantLimitError as e:
+        remove_handlers()
+        raise _tenant_limited(e)
     except JsonRpcError as e:
-        logger.error("turn/start failed", error=e.message, code=e.code)
+        remove_handlers()
+        logger.error("turn/stream failed", error=e.message, code=e.code)
         raise HTTPException(status_code=400, detail=e.to_dict())
+    except ProcessUnavailableError as e:
+        remove_handlers()
+        logger.error("turn/stream unavailable", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        logger.error("turn/start error", error=str(e))
+        remove_handlers()
+        logger.error("turn/stream error", error=str(e))
         raise HTTPException(status_code=500, detail=str(e))
+
+    turn_state["expected_id"] = result.get("turn", {}).get("id")
+    if turn_state["expected_id"]:
+        # Some turn notifications (e.g. turn/plan/updated) only carry a turnId
+        client.on_notification("*", on_turn_event, turn_id=turn_state["expected_id"])
+
+    async def event_stream() -> AsyncIterator[str]:
+        loop = asyncio.get_event_loop()
+        ends_at = loop.time() + deadline
+        # Sending to a closed connection may not fail, so watch for the disconnect
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(request))
+        abandoned = "disconnect"
+        try:
+            yield _sse_event("turn/start", result)
+            if not turn_state["expected_id"]:
+                logger.warning("turn/start returned no turn ID")
+                return
+
+            while True:
+                remaining = ends_at - loop.time()
+                if remaining <= 0:
+                    logger.error(
+                        "turn/stream timeout waiting for completion",
+                        turn_id=turn_state["expected_id"],
+                        timeout=deadline,
+                    )
+                    timer.finished("timeout")
+                    abandoned = "timeout"
+                    yield _sse_event(
+                        "error",
+                        {"message": f"Turn completion timeout after {deadline}s"},
+                    )
+                    return
+
+                if disconnected.done():
+                    logger.info("turn/stream client disconnected", turn_id=turn_state["expected_id"])
+                    return
+
+                if not queue.empty():
+                    entry = queue.get_nowait()
+                else:
+                    getter = asyncio.ensure_future(queue.get())
+                    await asyncio.wait(
+                        {getter, disconnected},
+                        timeout=min(SSE_KEEPALIVE_INTERVAL, remaining),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    if not getter.done():
+                        getter.cancel()
+                        if not disconnected.done():
+                            yield ": keep-alive\n\n"
+                        continue
+                    entry = getter.result()
+
+                if entry is None:
+                    logger.warning(
+                        "turn/stream client too slow",
+                        turn_id=turn_state["expected_id"],
+                        queued=settings.sse_send_queue,
+                    )
+                    timer.finished("slow_client")
+                    abandoned = "slow_client"
+                    yield _sse_event(
+                        "error",
+                        {"message": f"Client fell {settings.sse_send_queue} events behind"},
+                    )
+                    return
+                method, notification_params = entry
+
+                # Skip the tail of an earlier turn this one queued behind
+                if method != "approval/request":
+                    event_turn_id = notification_scope(notification_params)[1]
+                    if event_turn_id not in (None, turn_state["expected_id"]):
+                        continue
+
+                yield _sse_event(method, notification_params)
+
+                if method == "turn/completed":
+                    completed_turn = notification_params.get("turn", {})
+                    if completed_turn.get("id") == turn_state["expected_id"]:
+                        timer.finished(completed_turn.get("status", "unknown"))
+                        turn_state["done"] = True
+                        return
+        finally:
+            disconnected.cancel()
+            remove_handlers()
+            if turn_state["expected_id"] and not turn_state["done"]:
+                interrupt_turn(client, thread_id, turn_state["expected_id"], abandoned)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/submit", response_model=TurnJobStatus, status_code=202)
+async def turn_submit(
+    params: TurnStartParams,
+    jobs: TurnJobManager = Depends(get_turn_job_manager),
+) -> TurnJobStatus:
+    """Queue a turn and return its job id immediately.
+
+    The turn is admitted FIFO once fewer than ``max_running_turns`` turns
+    are running; poll ``GET /api/turn/jobs/{job_id}`` for the result.
+    """
+    try:
+        job = jobs.submit(params.model_dump(exclude_none=True))
+        return _job_status(jobs, job)
+    except ProcessUnavailableError as e:
+        logger.error("turn/submit unavailable", error=str(e))
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=TurnJobStatus)
+async def turn_job(
+    job_id: str,
+    wait: float = Query(0.0, ge=0.0, description="Seconds to long-poll for completion"),
+    jobs: TurnJobManager = Depends(get_turn_job_manager),
+) -> TurnJobStatus:
+    """Get a turn job, optionally waiting until it finishes."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Turn job not found: {job_id}")
+
+    await jobs.wait(job, min(wait, settings.turn_job_max_wait))
+    return _job_status(jobs, job)
+
+
+@router.get("/queue/{thread_id}", response_model=TurnQueueState)
+async def turn_queue(
+    thread_id: str,
+    client: ProcessPool = Depends(get_jsonrpc_client),
+) -> TurnQueueState:
+    """Show the running turn of a thread and how long queued turns have waited."""
+    state = client.turn_queue.state(thread_id) if client.turn_queue is not None else None
+    if state is None:
+        return TurnQueueState(threadId=thread_id, busy=False)
+    return TurnQueueState(
+        threadId=thread_id,
+        busy=True,
+        turnId=state["turn_id"],
+        runningFor=state["running_for"],
+        queued=state["queued"],
+    )
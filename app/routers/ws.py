@@ -0,0 +1,123 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
+import structlog
+
+from ..dependencies import get_jsonrpc_client
+from ..core import metrics
+from ..core.codec import get_codec
+from ..core.gateway import INVALID_REQUEST, PARSE_ERROR, GatewaySession
+from ..core.process_pool import ProcessPool
+from ..config import settings
+
+logger = structlog.get_logger(__name__)
+
+router = APIRouter(tags=["websocket"])
+
+# Connections currently served by the gateway
+_sessions: set[GatewaySession] = set()
+
+
+@router.websocket("/ws")
+async def websocket_gateway(
+    websocket: WebSocket,
+    coalesce_ms: Optional[float] = Query(
+        None,
+        alias="coalesceMs",
+        ge=0,
+        description="Merge consecutive deltas of an item within this many ms (0 = off)",
+    ),
+    client: ProcessPool = Depends(get_jsonrpc_client),
+) -> None:
+    """Multiplexed JSON-RPC over one WebSocket.
+
+    Each frame is a JSON-RPC request (``id``, ``method``, ``params``)
+    forwarded to the app-server; up to ``ws_max_inflight`` run at once and
+    responses come back in completion order. Notifications of subscribed
+    threads are pushed as ``{"method", "params"}`` frames, with runs of
+    small deltas merged for up to ``coalesceMs``.
+    """
+    await websocket.accept()
+    codec = get_codec(settings.json_codec)
+    outbound: asyncio.Queue = asyncio.Queue()
+    overflowed = False
+
+    def send(message: dict) -> None:
+        nonlocal overflowed
+        if overflowed:
+            return
+        if outbound.qsize() >= settings.ws_send_queue:
+            # Slow consumer: close instead of buffering without bound
+            overflowed = True
+            outbound.put_nowait(None)
+            return
+        outbound.put_nowait(message)
+
+    window = settings.delta_coalesce_ms if coalesce_ms is None else coalesce_ms
+    session = GatewaySession(client, send, coalesce_window=window / 1000)
+    inflight = asyncio.Semaphore(settings.ws_max_inflight)
+    calls: set[asyncio.Task] = set()
+
+    async def run_call(message: dict) -> None:
+        try:
+            response = await session.handle(message)
+            if response is not None:
+                send(response)
+        finally:
+            inflight.release()
+
+    async def read_loop() -> None:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            data = frame.get("text") or frame.get("bytes") or b""
+            try:
+                message = codec.loads(data)
+            except ValueError:
+                send({"id": None, "error": {"code": PARSE_ERROR, "message": "Parse error"}})
+                continue
+            if isinstance(message, list):
+                send({"id": None, "error": {"code": INVALID_REQUEST, "message": "Batches are not supported"}})
+                continue
+
+            # Stop reading while the connection has too many calls in flight
+            await inflight.acquire()
+            task = asyncio.create_task(run_call(message))
+            calls.add(task)
+            task.add_done_callback(calls.discard)
+
+    async def write_loop() -> None:
+        while True:
+            message = await outbound.get()
+            if message is None:
+                logger.warning("WebSocket send queue full, closing", queued=outbound.qsize())
+                await websocket.close(code=1013, reason="Send queue full")
+                return
+            await websocket.send_text(codec.dumps(message).decode())
+
+    _sessions.add(session)
+    metrics.ws_connections.set(len(_sessions))
+    reader = asyncio.create_task(read_loop())
+    writer = asyncio.create_task(write_loop())
+    try:
+        done, _ = await asyncio.wait({reader, writer}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                logger.error("WebSocket gateway error", error=str(error))
+    finally:
+        session.close()
+        _sessions.discard(session)
+        metrics.ws_connections.set(len(_sessions))
+
+        tasks = [reader, writer, *calls]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(
+            "WebSocket closed",
+            calls=session.calls,
+            threads=len(session.threads),
+            **session.coalescer.stats(),
+        )
@@ -0,0 +1,76 @@
+"""Notification dispatch cost versus number of concurrent turns.
+
+Registers the same per-turn subscriptions ``turn_start`` uses for K
+concurrent turns, then times routing ``item/completed`` notifications
+through ``JsonRpcClient._handle_message``. Compares thread-scoped
+subscriptions with the legacy layout where every turn registers a
+global handler and filters by itself.
+
+Usage:
+    PYTHONPATH=. python benchmarks/dispatch_bench.py [--notifications N]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core import JsonRpcClient, ProcessManager
+
+TURN_COUNTS = (1, 10, 100, 250, 500, 1000)
+
+
+def _register_turns(client: JsonRpcClient, turns: int, scoped: bool) -> None:
+    for index in range(turns):
+        thread_id = f"thr_{index}"
+
+        async def on_item_completed(params: dict, thread_id: str = thread_id) -> None:
+            if params.get("threadId") == thread_id:
+                pass
+
+        async def on_turn_completed(params: dict, thread_id: str = thread_id) -> None:
+            if params.get("threadId") == thread_id:
+                pass
+
+        scope = {"thread_id": thread_id} if scoped else {}
+        client.on_notification("item/completed", on_item_completed, **scope)
+        client.on_notification("turn/completed", on_turn_completed, **scope)
+
+
+async def _measure(turns: int, notifications: int, scoped: bool) -> float:
+    client = JsonRpcClient(ProcessManager())
+    _register_turns(client, turns, scoped)
+
+    messages = [
+        {
+            "method": "item/completed",
+            "params": {
+                "threadId": f"thr_{i % turns}",
+                "turnId": f"turn_{i % turns}",
+                "item": {"type": "agentMessage", "id": f"item_{i}", "text": "ok"},
+            },
+        }
+        for i in range(notifications)
+    ]
+
+    start = time.perf_counter()
+    for message in messages:
+        await client._handle_message(message)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / notifications * 1e6
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notifications", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'turns':>6} {'scoped us/notif':>16} {'global us/notif':>16}")
+    for turns in TURN_COUNTS:
+        scoped = await _measure(turns, args.notifications, scoped=True)
+        legacy = await _measure(turns, args.notifications, scoped=False)
+        print(f"{turns:>6} {scoped:>16.2f} {legacy:>16.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""Scriptable stand-in for ``codex app-server``.
+
+Speaks the same newline-delimited JSON-RPC over stdio without a model
+backend, so the bridge can be benchmarked on a plain Linux box. Point the
+bridge at it with ``CODEX_CODEX_PATH=benchmarks/fake_app_server.py``.
+
+Behaviour is configured with environment variables (the bridge only
+passes ``app-server`` on the command line):
+
+    FAKE_CODEX_LATENCY_MS         delay before answering any request (0)
+    FAKE_CODEX_ITEMS              agent items per turn (1)
+    FAKE_CODEX_DELTAS             deltas streamed per item (8)
+    FAKE_CODEX_DELTA_BYTES        bytes per delta (16)
+    FAKE_CODEX_DELTA_INTERVAL_MS  delay between deltas (5)
+    FAKE_CODEX_OUTPUT_BYTES       aggregatedOutput of one commandExecution item per turn (0 = none)
+    FAKE_CODEX_TURNS_PER_THREAD   stored turns returned by thread/read includeTurns (2)
+    FAKE_CODEX_CRASH_AFTER_TURNS  exit with status 1 mid-way through the N-th turn (0 = never)
+    FAKE_CODEX_STDERR_LINES       tracing-style log lines written to stderr per turn (0)
+    FAKE_CODEX_APPROVALS          approval requests sent per turn: comma list of
+                                  command, file, input ("")
+    FAKE_CODEX_APPROVAL_COMMAND   command of the commandExecution approval ("git status")
+    FAKE_CODEX_STORED_THREADS     threads on "disk" before start, paged by thread/list (0)
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+LATENCY = _env_int("FAKE_CODEX_LATENCY_MS", 0) / 1000
+ITEMS = _env_int("FAKE_CODEX_ITEMS", 1)
+DELTAS = _env_int("FAKE_CODEX_DELTAS", 8)
+DELTA_BYTES = _env_int("FAKE_CODEX_DELTA_BYTES", 16)
+DELTA_INTERVAL = _env_int("FAKE_CODEX_DELTA_INTERVAL_MS", 5) / 1000
+OUTPUT_BYTES = _env_int("FAKE_CODEX_OUTPUT_BYTES", 0)
+TURNS_PER_THREAD = _env_int("FAKE_CODEX_TURNS_PER_THREAD", 2)
+CRASH_AFTER_TURNS = _env_int("FAKE_CODEX_CRASH_AFTER_TURNS", 0)
+STDERR_LINES = _env_int("FAKE_CODEX_STDERR_LINES", 0)
+APPROVALS = [kind for kind in os.environ.get("FAKE_CODEX_APPROVALS", "").split(",") if kind]
+APPROVAL_COMMAND = os.environ.get("FAKE_CODEX_APPROVAL_COMMAND", "git status")
+STORED_THREADS = _env_int("FAKE_CODEX_STORED_THREADS", 0)
+
+METHOD_NOT_FOUND = -32601
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:12]}"
+
+
+class FakeAppServer:
+    def __init__(self):
+        self.initialized = False
+        self.threads: dict[str, dict] = {}
+        self.loaded: set[str] = set()
+        self.archived: set[str] = set()
+        start = int(time.time()) - STORED_THREADS * 60
+        for index in range(STORED_THREADS):
+            thread_id = f"thr_stored_{index:06d}"
+            self.threads[thread_id] = {
+                "id": thread_id,
+                "preview": f"stored thread {index}",
+                "modelProvider": "openai" if index % 2 else "fake",
+                "createdAt": start + index * 60,
+                "updatedAt": start + index * 60,
+                "source": "cli" if index % 3 else "vscode",
+            }
+        self.turns: dict[str, asyncio.Task] = {}
+        self.turns_started = 0
+        self._out = sys.stdout.buffer
+        self._next_request_id = 1
+        self._server_requests: dict[int, asyncio.Future] = {}
+
+    def send(self, message: dict) -> None:
+        self._out.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        self._out.flush()
+
+    def notify(self, method: str, params: dict) -> None:
+        self.send({"method": method, "params": params})
+
+    def respond(self, request_id, result: dict) -> None:
+        self.send({"id": request_id, "result": result})
+
+    def error(self, request_id, code: int, message: str) -> None:
+        self.send({"id": request_id, "error": {"code": code, "message": message}})
+
+    async def request(self, method: str, params: dict) -> dict:
+        """Send a server-initiated request and wait for the client's response."""
+        request_id = self._next_request_id
+        self._next_request_id += 1
+        future = asyncio.get_event_loop().create_future()
+        self._server_requests[request_id] = future
+        self.send({"id": request_id, "method": method, "params": params})
+        return await future
+
+    def on_response(self, message: dict) -> None:
+        future = self._server_requests.pop(message.get("id"), None)
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    def _thread(self, params: dict) -> dict:
+        now = int(time.time())
+        thread = {
+            "id": _new_id("thr"),
+            "preview": "",
+            "modelProvider": params.get("modelProvider", "fake"),
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        self.threads[thread["id"]] = thread
+        self.loaded.add(thread["id"])
+        return thread
+
+    def _stored_turns(self, thread_id: str) -> list:
+        return [
+            {
+                "id": f"turn_{thread_id}_{index}",
+                "status": "completed",
+                "items": [{"type": "agentMessage", "id": f"item_{index}", "text": "x" * DELTA_BYTES * DELTAS}],
+                "error": None,
+            }
+            for index in range(TURNS_PER_THREAD)
+        ]
+
+    async def handle(self, message: dict) -> None:
+        method = message.get("method")
+        request_id = message.get("id")
+        params = message.get("params") or {}
+
+        if request_id is None:
+            return  # notifications such as "initialized"
+
+        if LATENCY:
+            await asyncio.sleep(LATENCY)
+
+        if method == "initialize":
+            if self.initialized:
+                return self.error(request_id, -32600, "Already initialized")
+            self.initialized = True
+            return self.respond(request_id, {"userAgent": "fake-codex-app-server/0.0.0"})
+
+        if not self.initialized:
+            return self.error(request_id, -32600, "Not initialized")
+
+        handler = getattr(self, "rpc_" + method.replace("/", "_"), None)
+        if handler is None:
+            return self.error(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+        handler(request_id, params)
+
+    def rpc_thread_start(self, request_id, params: dict) -> None:
+        thread = self._thread(params)
+        self.respond(request_id, {"thread": thread})
+        self.notify("thread/started", {"thread": thread})
+
+    def rpc_thread_fork(self, request_id, params: dict) -> None:
+        self.rpc_thread_start(request_id, params)
+
+    def rpc_thread_resume(self, request_id, params: dict) -> None:
+        thread_id = params.get("threadId")
+        thread = self.threads.setdefault(thread_id, {"id": thread_id, "preview": ""})
+        self.loaded.add(thread_id)
+        self.respond(request_id, {"thread": thread})
+
+    def rpc_thread_read(self, request_id, params: dict) -> None:
+        thread_id = params.get("threadId")
+        thread = dict(self.threads.get(thread_id, {"id": thread_id, "preview": ""}))
+        if params.get("includeTurns"):
+            thread["turns"] = self._stored_turns(thread_id)
+        self.respond(request_id, {"thread": thread})
+
+    def rpc_thread_list(self, request_id, params: dict) -> None:
+        archived = bool(params.get("archived"))
+        providers = params.get("modelProviders") or None
+        threads = sorted(
+            (
+                thread
+                for thread in self.threads.values()
+                if (thread["id"] in self.archived) == archived
+                and (providers is None or thread.get("modelProvider") in providers)
+            ),
+            key=lambda t: (t.get("createdAt", 0), t["id"]),
+            reverse=True,
+        )
+        offset = int(params.get("cursor") or 0)
+        limit = params.get("limit") or 25
+        page = threads[offset:offset + limit]
+        next_cursor = str(offset + limit) if offset + limit < len(threads) else None
+        self.respond(request_id, {"data": page, "nextCursor": next_cursor})
+
+    def rpc_thread_loaded_list(self, request_id, params: dict) -> None:
+        self.respond(request_id, {"data": sorted(self.loaded)})
+
+    def rpc_thread_archive(self, request_id, params: dict) -> None:
+        self.loaded.discard(params.get("threadId"))
+        self.archived.add(params.get("threadId"))
+        self.respond(request_id, {})
+
+    def rpc_thread_unarchive(self, request_id, params: dict) -> None:
+        self.archived.discard(params.get("threadId"))
+        self.rpc_thread_resume(request_id, params)
+
+    def rpc_thread_rollback(self, request_id, params: dict) -> None:
+        self.rpc_thread_resume(request_id, params)
+
+    def rpc_turn_start(self, request_id, params: dict) -> None:
+        thread_id = params.get("threadId")
+        turn = {"id": _new_id("turn"), "status": "inProgress", "items": [], "error": None}
+        self.respond(request_id, {"turn": turn})
+        self.turns_started += 1
+        self.turns[turn["id"]] = asyncio.create_task(self._run_turn(thread_id, turn))
+
+    def rpc_turn_interrupt(self, request_id, params: dict) -> None:
+        task = self.turns.get(params.get("turnId"))
+        if task is not None:
+            task.cancel()
+        self.respond(request_id, {})
+
+    def rpc_model_list(self, request_id, params: dict) -> None:
+        self.respond(request_id, {"data": [{"id": "fake-model", "model": "fake-model", "isDefault": True}], "nextCursor": None})
+
+    def rpc_skills_list(self, request_id, params: dict) -> None:
+        cwds = params.get("cwds") or [os.getcwd()]
+        self.respond(request_id, {"data": [{"cwd": cwd, "skills": [], "errors": []} for cwd in cwds]})
+
+    def rpc_skills_config_write(self, request_id, params: dict) -> None:
+        self.respond(request_id, {})
+
+    def rpc_config_read(self, request_id, params: dict) -> None:
+        self.respond(request_id, {"config": {"model": "fake-model"}})
+
+    def rpc_command_exec(self, request_id, params: dict) -> None:
+        self.respond(request_id, {"exitCode": 0, "stdout": "", "stderr": ""})
+
+    async def _run_turn(self, thread_id: str, turn: dict) -> None:
+        scope = {"threadId": thread_id, "turnId": turn["id"]}
+        self.notify("turn/started", {"threadId": thread_id, "turn": turn})
+        for index in range(STDERR_LINES):
+            level = "WARN" if index % 10 == 9 else "INFO"
+            sys.stderr.write(f"2026-01-01T00:00:00Z  {level} codex_core::turn: turn={turn['id']} step={index}\n")
+        sys.stderr.flush()
+        status = "completed"
+        try:
+            for kind in APPROVALS:
+                await self._approval(kind, scope)
+
+            if OUTPUT_BYTES:
+                item = {
+                    "type": "commandExecution",
+                    "id": _new_id("item"),
+                    "command": "make test",
+                    "cwd": "/workspace",
+                    "status": "completed",
+                    "aggregatedOutput": ("ok\n" * (OUTPUT_BYTES // 3 + 1))[:OUTPUT_BYTES],
+                    "exitCode": 0,
+                }
+                self.notify("item/started", {**scope, "item": {**item, "status": "inProgress", "aggregatedOutput": ""}})
+                self.notify("item/completed", {**scope, "item": item})
+
+            for _ in range(ITEMS):
+                item_id = _new_id("item")
+                self.notify("item/started", {**scope, "item": {"type": "agentMessage", "id": item_id, "text": ""}})
+                delta = "x" * DELTA_BYTES
+                for index in range(DELTAS):
+                    if DELTA_INTERVAL:
+                        await asyncio.sleep(DELTA_INTERVAL)
+                    if CRASH_AFTER_TURNS and self.turns_started >= CRASH_AFTER_TURNS and index == DELTAS // 2:
+                        os._exit(1)
+                    self.notify("item/agentMessage/delta", {**scope, "itemId": item_id, "delta": delta})
+                self.notify(
+                    "item/completed",
+                    {**scope, "item": {"type": "agentMessage", "id": item_id, "text": delta * DELTAS}},
+                )
+        except asyncio.CancelledError:
+            status = "interrupted"
+        finally:
+            self.turns.pop(turn["id"], None)
+            self.notify(
+                "turn/completed",
+                {"threadId": thread_id, "turn": {**turn, "status": status}},
+            )
+
+    async def _approval(self, kind: str, scope: dict) -> None:
+        item_id = _new_id("item")
+        if kind == "input":
+            await self.request(
+                "tool/requestUserInput",
+                {
+                    **scope,
+                    "itemId": item_id,
+                    "questions": [
+                        {
+                            "id": "approve",
+                            "header": "Approve",
+                            "question": "Run the fake tool?",
+                            "options": [{"label": "Accept"}, {"label": "Decline"}],
+                        }
+                    ],
+                },
+            )
+            return
+
+        if kind == "command":
+            item = {"type": "commandExecution", "id": item_id, "command": APPROVAL_COMMAND, "cwd": "/workspace"}
+            method = "item/commandExecution/requestApproval"
+        else:
+            item = {
+                "type": "fileChange",
+                "id": item_id,
+                "changes": [{"path": "/workspace/README.md", "kind": "update", "diff": ""}],
+            }
+            method = "item/fileChange/requestApproval"
+
+        self.notify("item/started", {**scope, "item": {**item, "status": "inProgress"}})
+        response = await self.request(method, {**scope, "itemId": item_id, "reason": "fake approval"})
+        decision = response.get("result", {}).get("decision")
+        self.notify(
+            "item/completed",
+            {**scope, "item": {**item, "status": "completed" if decision == "accept" else "declined"}},
+        )
+
+
+async def main() -> None:
+    server = FakeAppServer()
+    loop = asyncio.get_event_loop()
+    reader = asyncio.StreamReader(limit=2**30)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        if not line.strip():
+            continue
+        message = json.loads(line)
+        if "method" not in message and message.get("id") is not None:
+            server.on_response(message)
+        else:
+            asyncio.create_task(server.handle(message))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
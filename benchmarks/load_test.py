@@ -0,0 +1,258 @@
+"""End-to-end load test of the HTTP bridge against the fake app-server.
+
+Starts the bridge under uvicorn with ``CODEX_CODEX_PATH`` pointing at
+``benchmarks/fake_app_server.py``, drives one route with concurrent
+clients and reports throughput, latency percentiles and the RSS of the
+bridge and its app-server children. Fake app-server behaviour is
+configured through the ``FAKE_CODEX_*`` environment variables (see
+fake_app_server.py); bridge settings through ``CODEX_*`` as usual.
+
+Scenarios:
+    thread-start   POST /api/thread/start
+    thread-read    POST /api/thread/read (includeTurns) on one thread
+    skills-list    POST /api/skills/list
+    turn           POST /api/turn/start, one thread per client
+    stream         POST /api/turn/stream read to the end, one thread per client
+
+Requires httpx (``pip install httpx``).
+
+Usage:
+    PYTHONPATH=. python benchmarks/load_test.py [--scenario turn] [--concurrency 32] [--requests 2000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+FAKE_APP_SERVER = Path(__file__).resolve().parent / "fake_app_server.py"
+
+SCENARIOS = ("thread-start", "thread-read", "skills-list", "turn", "stream")
+TURN_INPUT = [{"type": "text", "text": "benchmark"}]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _rss_kib(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _children(pid: int) -> list[int]:
+    children: list[int] = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def _rss(pid: int) -> tuple[int, int]:
+    """RSS in KiB of the bridge process and the sum of its children."""
+    return _rss_kib(pid), sum(_rss_kib(child) for child in _children(pid))
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _start_bridge(port: int, pool_size: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update(
+        {
+            "CODEX_CODEX_PATH": str(FAKE_APP_SERVER),
+            "CODEX_POOL_SIZE": str(pool_size),
+            "CODEX_LOG_LEVEL": env.get("CODEX_LOG_LEVEL", "WARNING"),
+            "PYTHONPATH": str(ROOT),
+        }
+    )
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+
+
+async def _wait_healthy(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = await client.get("/health")
+            if response.status_code == 200 and response.json().get("codex_alive"):
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("bridge did not become healthy")
+
+
+async def _new_thread(client: httpx.AsyncClient) -> str:
+    response = await client.post("/api/thread/start", json={})
+    response.raise_for_status()
+    return response.json()["thread"]["id"]
+
+
+async def _request(client: httpx.AsyncClient, scenario: str, thread_id: str) -> int:
+    if scenario == "thread-start":
+        response = await client.post("/api/thread/start", json={})
+    elif scenario == "thread-read":
+        response = await client.post("/api/thread/read", json={"threadId": thread_id, "includeTurns": True})
+    elif scenario == "skills-list":
+        response = await client.post("/api/skills/list", json={})
+    elif scenario == "turn":
+        response = await client.post("/api/turn/start", json={"threadId": thread_id, "input": TURN_INPUT})
+    else:
+        async with client.stream(
+            "POST", "/api/turn/stream", json={"threadId": thread_id, "input": TURN_INPUT}
+        ) as response:
+            async for _ in response.aiter_bytes():
+                pass
+    return response.status_code
+
+
+async def _run(args: argparse.Namespace, bridge: subprocess.Popen, port: int) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=args.timeout
+    ) as client:
+        await _wait_healthy(client)
+        rss_idle = _rss(bridge.pid)
+
+        # One thread per client so turn scenarios do not contend for a thread
+        shared = await _new_thread(client)
+        if args.scenario in ("turn", "stream"):
+            threads = [await _new_thread(client) for _ in range(args.concurrency)]
+        else:
+            threads = [shared] * args.concurrency
+
+        latencies: list[float] = []
+        statuses: dict[int, int] = {}
+        remaining = {"warmup": args.warmup, "requests": args.requests}
+        peak = list(rss_idle)
+
+        async def sample_rss() -> None:
+            while True:
+                bridge_rss, children_rss = _rss(bridge.pid)
+                peak[0] = max(peak[0], bridge_rss)
+                peak[1] = max(peak[1], children_rss)
+                await asyncio.sleep(0.1)
+
+        async def worker(thread_id: str) -> None:
+            while remaining["warmup"] > 0:
+                remaining["warmup"] -= 1
+                await _request(client, args.scenario, thread_id)
+            while remaining["requests"] > 0:
+                remaining["requests"] -= 1
+                started = time.perf_counter()
+                try:
+                    status = await _request(client, args.scenario, thread_id)
+                except httpx.HTTPError:
+                    status = 0
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+
+        sampler = asyncio.create_task(sample_rss())
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(thread_id) for thread_id in threads))
+        elapsed = time.perf_counter() - started
+        sampler.cancel()
+
+        rss_after = _rss(bridge.pid)
+
+    latencies.sort()
+    return {
+        "scenario": args.scenario,
+        "concurrency": args.concurrency,
+        "pool_size": args.pool_size,
+        "requests": len(latencies),
+        "errors": sum(count for status, count in statuses.items() if not 200 <= status < 300),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 0.50) * 1000, 2),
+            "p90": round(_percentile(latencies, 0.90) * 1000, 2),
+            "p99": round(_percentile(latencies, 0.99) * 1000, 2),
+            "max": round((latencies[-1] if latencies else 0.0) * 1000, 2),
+        },
+        "rss_kib": {
+            "bridge_idle": rss_idle[0],
+            "bridge_peak": peak[0],
+            "bridge_after": rss_after[0],
+            "app_servers_peak": peak[1],
+        },
+    }
+
+
+def _print_report(report: dict) -> None:
+    latency = report["latency_ms"]
+    rss = report["rss_kib"]
+    print(f"scenario={report['scenario']} concurrency={report['concurrency']} pool_size={report['pool_size']}")
+    print(f"  requests   {report['requests']:>10} ({report['errors']} errors, statuses {report['statuses']})")
+    print(f"  throughput {report['throughput_rps']:>10.1f} req/s over {report['elapsed_s']}s")
+    print(
+        f"  latency    p50 {latency['p50']:.2f} ms  p90 {latency['p90']:.2f} ms  "
+        f"p99 {latency['p99']:.2f} ms  max {latency['max']:.2f} ms"
+    )
+    print(
+        f"  rss        bridge idle {rss['bridge_idle'] / 1024:.1f} MiB  peak {rss['bridge_peak'] / 1024:.1f} MiB  "
+        f"after {rss['bridge_after'] / 1024:.1f} MiB  app-servers peak {rss['app_servers_peak'] / 1024:.1f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS, default="turn")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request client timeout in seconds")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    port = _free_port()
+    bridge = _start_bridge(port, args.pool_size)
+    try:
+        report = asyncio.run(_run(args, bridge, port))
+    finally:
+        bridge.terminate()
+        try:
+            bridge.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            bridge.kill()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
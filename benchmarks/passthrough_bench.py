@@ -0,0 +1,114 @@
+"""CPU cost of validated versus passthrough responses per MB of payload.
+
+Serves a synthetic ``thread/read`` result with ``includeTurns`` through
+two FastAPI routes: one building ``ThreadReadResponse`` and validating it
+via ``response_model`` like the default routes, one answering with
+``PassthroughResponse``. Requests go through the ASGI app in-process, so
+the figures are bridge CPU time only.
+
+Usage:
+    PYTHONPATH=. python benchmarks/passthrough_bench.py [--sizes 0.1 1 10] [--requests N]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.models.thread import ThreadReadResponse
+from app.responses import PassthroughResponse
+
+
+def _thread_result(megabytes: float) -> dict:
+    """A thread whose turns hold about ``megabytes`` of item text."""
+    turns = []
+    size = 0
+    index = 0
+    while size < megabytes * 1024 * 1024:
+        text = f"line {index} " * 40
+        output = "drwxr-xr-x  5 user group 4096 Jan  1 00:00 src\n" * 20
+        turns.append(
+            {
+                "id": f"turn_{index}",
+                "status": "completed",
+                "items": [
+                    {"type": "userMessage", "id": f"item_{index}_0", "content": [{"type": "text", "text": "ls"}]},
+                    {
+                        "type": "commandExecution",
+                        "id": f"item_{index}_1",
+                        "command": "ls -la",
+                        "cwd": "/work",
+                        "status": "completed",
+                        "exitCode": 0,
+                        "aggregatedOutput": output,
+                    },
+                    {"type": "agentMessage", "id": f"item_{index}_2", "text": text},
+                ],
+                "error": None,
+            }
+        )
+        size += len(text) + len(output) + 200
+        index += 1
+    return {
+        "thread": {
+            "id": "thr_bench",
+            "preview": "ls",
+            "modelProvider": "openai",
+            "createdAt": 1730000000,
+            "updatedAt": 1730000100,
+            "turns": turns,
+        }
+    }
+
+
+def _app(result: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/validated", response_model=ThreadReadResponse)
+    async def validated() -> ThreadReadResponse:
+        return ThreadReadResponse(**result)
+
+    @app.post("/passthrough", response_model=ThreadReadResponse)
+    async def passthrough() -> PassthroughResponse:
+        return PassthroughResponse(result)
+
+    return app
+
+
+async def _measure(client: httpx.AsyncClient, path: str, requests: int) -> tuple[float, int]:
+    """CPU seconds per request and response size."""
+    response = await client.post(path)
+    started = time.process_time()
+    for _ in range(requests):
+        response = await client.post(path)
+    return (time.process_time() - started) / requests, len(response.content)
+
+
+async def _run(sizes: list[float], requests: int) -> None:
+    print(f"{'payload':>10} {'validated':>12} {'passthrough':>12} {'saved/MB':>10} {'speedup':>8}")
+    for megabytes in sizes:
+        app = _app(_thread_result(megabytes))
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            validated, body = await _measure(client, "/validated", requests)
+            passthrough, _ = await _measure(client, "/passthrough", requests)
+
+        mb = body / (1024 * 1024)
+        print(
+            f"{mb:>8.2f}MB {validated * 1000:>10.2f}ms {passthrough * 1000:>10.2f}ms "
+            f"{(validated - passthrough) * 1000 / mb:>8.2f}ms {validated / passthrough:>7.1f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.1, 1.0, 10.0], help="Payload sizes in MB")
+    parser.add_argument("--requests", type=int, default=10, help="Requests per route and size")
+    args = parser.parse_args()
+    asyncio.run(_run(args.sizes, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Messages/sec through the stdio framing and JSON codecs.
+
+Feeds newline-delimited JSON into an asyncio StreamReader and times
+decoding with ``LineReader`` for each available codec, next to the
+previous ``readline()`` + ``json.loads(line.decode().strip())`` path.
+Also times frame encoding for ``send_message``.
+
+Usage:
+    PYTHONPATH=. python benchmarks/transport_bench.py
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from app.core.codec import StdlibJsonCodec, get_codec, orjson
+from app.core.transport import LineReader
+
+SMALL_NOTIFICATION = {
+    "method": "item/agentMessage/delta",
+    "params": {"threadId": "thr_123", "turnId": "turn_456", "itemId": "item_1", "delta": "Hello"},
+}
+
+
+def _large_item(size: int) -> dict:
+    return {
+        "method": "item/completed",
+        "params": {
+            "threadId": "thr_123",
+            "turnId": "turn_456",
+            "item": {
+                "type": "commandExecution",
+                "id": "item_2",
+                "status": "completed",
+                "aggregatedOutput": ("line of build output\n" * (size // 21 + 1))[:size],
+            },
+        },
+    }
+
+
+def _codecs() -> list:
+    codecs = [StdlibJsonCodec]
+    if orjson is not None:
+        codecs.append(get_codec("orjson"))
+    return codecs
+
+
+def _stream(payload: bytes) -> asyncio.StreamReader:
+    stream = asyncio.StreamReader(limit=2**31)
+    stream.feed_data(payload)
+    stream.feed_eof()
+    return stream
+
+
+async def _legacy_decode(payload: bytes) -> int:
+    stream = _stream(payload)
+    count = 0
+    while True:
+        line = await stream.readline()
+        if not line:
+            return count
+        json.loads(line.decode().strip())
+        count += 1
+
+
+async def _framed_decode(payload: bytes, codec) -> int:
+    reader = LineReader(_stream(payload))
+    count = 0
+    while True:
+        frame = await reader.read_frame()
+        if frame is None:
+            return count
+        codec.loads(frame)
+        count += 1
+
+
+def _rate(count: int, elapsed: float) -> str:
+    return f"{count / elapsed:>12,.0f} msg/s"
+
+
+async def _bench_decode(label: str, message: dict, count: int) -> None:
+    payload = (json.dumps(message) + "\n").encode() * count
+    print(f"decode {label} ({len(payload) // count:,} bytes/msg, {count} msgs)")
+
+    start = time.perf_counter()
+    decoded = await _legacy_decode(payload)
+    print(f"  {'readline + json':<22}{_rate(decoded, time.perf_counter() - start)}")
+
+    for codec in _codecs():
+        start = time.perf_counter()
+        decoded = await _framed_decode(payload, codec)
+        print(f"  {'LineReader + ' + codec.name:<22}{_rate(decoded, time.perf_counter() - start)}")
+
+
+def _bench_encode(label: str, message: dict, count: int) -> None:
+    print(f"encode {label} ({count} msgs)")
+
+    start = time.perf_counter()
+    for _ in range(count):
+        (json.dumps(message) + "\n").encode()
+    print(f"  {'json.dumps + encode':<22}{_rate(count, time.perf_counter() - start)}")
+
+    for codec in _codecs():
+        start = time.perf_counter()
+        for _ in range(count):
+            codec.dumps_line(message)
+        print(f"  {codec.name + '.dumps_line':<22}{_rate(count, time.perf_counter() - start)}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--small", type=int, default=100000, help="small notifications")
+    parser.add_argument("--large", type=int, default=20, help="multi-MB items")
+    parser.add_argument("--large-size", type=int, default=4 * 1024 * 1024, help="bytes per large item")
+    args = parser.parse_args()
+
+    large = _large_item(args.large_size)
+    await _bench_decode("small notifications", SMALL_NOTIFICATION, args.small)
+    await _bench_decode("large items", large, args.large)
+    _bench_encode("small notifications", SMALL_NOTIFICATION, args.small)
+    _bench_encode("large items", large, args.large)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import ThreadBusyError, ThreadTurnQueue
+
+
+async def settle() -> None:
+    """Let woken waiters run past their wait_for/shield wrappers."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_waiters_are_admitted_in_arrival_order():
+    async def scenario():
+        queue = ThreadTurnQueue(max_queued=4, hold_timeout=60)
+        await queue.acquire("thr_1")
+        admitted = []
+
+        async def wait(name: str) -> None:
+            await queue.acquire("thr_1")
+            admitted.append(name)
+
+        tasks = [asyncio.ensure_future(wait(name)) for name in ("a", "b", "c")]
+        await settle()
+        assert len(queue.state("thr_1")["queued"]) == 3
+
+        for expected in (["a"], ["a", "b"], ["a", "b", "c"]):
+            queue.release("thr_1")
+            await settle()
+            assert admitted == expected
+        await asyncio.gather(*tasks)
+
+        queue.release("thr_1")
+        assert queue.state("thr_1") is None
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects_with_thread_busy():
+    async def scenario():
+        queue = ThreadTurnQueue(max_queued=1, hold_timeout=60)
+        await queue.acquire("thr_1")
+        waiting = asyncio.ensure_future(queue.acquire("thr_1"))
+        await settle()
+
+        with pytest.raises(ThreadBusyError):
+            await queue.acquire("thr_1")
+        assert queue.stats()["rejected"] == 1
+
+        # Other threads are unaffected
+        assert await queue.acquire("thr_2") == 0.0
+
+        queue.release("thr_1")
+        await waiting
+
+    asyncio.run(scenario())
+
+
+def test_zero_depth_answers_busy_at_once():
+    async def scenario():
+        queue = ThreadTurnQueue(max_queued=0, hold_timeout=60)
+        await queue.acquire("thr_1")
+        with pytest.raises(ThreadBusyError):
+            await queue.acquire("thr_1")
+
+    asyncio.run(scenario())
+
+
+def test_timed_out_waiter_leaves_the_queue():
+    async def scenario():
+        queue = ThreadTurnQueue(max_queued=4, hold_timeout=60)
+        await queue.acquire("thr_1")
+
+        with pytest.raises(ThreadBusyError):
+            await queue.acquire("thr_1", timeout=0.01)
+        assert queue.state("thr_1")["queued"] == []
+
+        queue.release("thr_1")
+        assert queue.state("thr_1") is None
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        queue = ThreadTurnQueue(max_queued=4, hold_timeout=60)
+        await queue.acquire("thr_1")
+        waiting = asyncio.ensure_future(queue.acquire("thr_1"))
+        await settle()
+
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert queue.state("thr_1")["queued"] == []
+
+    asyncio.run(scenario())
+
+
+def test_completion_before_bind_frees_the_thread():
+    async def scenario():
+        queue = ThreadTurnQueue(max_queued=4, hold_timeout=60)
+        await queue.acquire("thr_1")
+        queue.turn_completed("thr_1", "turn_1")
+        queue.bind("thr_1", "turn_1")
+
+        assert queue.state("thr_1") is None
+
+    asyncio.run(scenario())
+
+
+def test_completion_of_another_turn_keeps_the_slot():
+    async def scenario():
+        queue = ThreadTurnQueue(max_queued=4, hold_timeout=60)
+        await queue.acquire("thr_1")
+        queue.bind("thr_1", "turn_1")
+
+        queue.turn_completed("thr_1", "turn_0")
+        assert queue.state("thr_1")["turn_id"] == "turn_1"
+
+        queue.turn_completed("thr_1", "turn_1")
+        assert queue.state("thr_1") is None
+
+    asyncio.run(scenario())
+
+
+def test_slot_is_released_after_hold_timeout():
+    async def scenario():
+        queue = ThreadTurnQueue(max_queued=4, hold_timeout=0.01)
+        await queue.acquire("thr_1")
+        queue.bind("thr_1", "turn_1")
+
+        waited = await asyncio.wait_for(queue.acquire("thr_1"), timeout=1)
+        assert waited > 0
+
+    asyncio.run(scenario())
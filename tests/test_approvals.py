@@ -0,0 +1,300 @@
+import asyncio
+
+import pytest
+
+from app.core.approvals import (
+    COMMAND_APPROVAL,
+    FILE_CHANGE_APPROVAL,
+    ApprovalEngine,
+    ApprovalPolicy,
+    command_tokens,
+)
+from app.core.jsonrpc_client import METHOD_NOT_FOUND, JsonRpcClient
+
+
+class RecordingProcess:
+    """Stands in for ProcessManager; keeps what the client sends."""
+
+    def __init__(self):
+        self.sent: list[dict] = []
+
+    def send_reply(self, message: dict) -> None:
+        self.sent.append(message)
+
+
+def _policy(**fields) -> ApprovalPolicy:
+    fields.setdefault("command_allowlist", ["git status", "ls"])
+    fields.setdefault("command_denylist", ["git push"])
+    return ApprovalPolicy(**fields)
+
+
+# -- command prefixes -------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "git status",
+        "git status --short",
+        "/usr/bin/git status",
+        ["git", "status"],
+        ["bash", "-lc", "git status"],
+        ["/bin/bash", "-c", "ls -la"],
+        "bash -lc 'git status'",
+    ],
+)
+def test_allowlisted_commands_are_accepted(command):
+    assert _policy().decide_command(command) == "accept"
+
+
+@pytest.mark.parametrize("command", ["git push origin main", ["bash", "-lc", "git push"]])
+def test_denylisted_commands_are_declined(command):
+    assert _policy().decide_command(command) == "decline"
+
+
+def test_denylist_wins_over_allowlist():
+    policy = _policy(command_allowlist=["git"], command_denylist=["git push"])
+    assert policy.decide_command("git push") == "decline"
+    assert policy.decide_command("git log") == "accept"
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "git status && rm -rf /",
+        "git status; rm -rf /",
+        "git status || rm -rf /",
+        "git status | sh",
+        "git status $(rm -rf /)",
+        "git status `rm -rf /`",
+        "git status > /etc/passwd",
+        "git status < /dev/zero",
+        "git status & rm -rf /",
+        "git status\nrm -rf /",
+        ["git", "status", "&&", "rm", "-rf", "/"],
+        ["bash", "-lc", "git status && rm -rf /"],
+        "bash -lc 'git status | sh'",
+    ],
+)
+def test_chained_commands_never_match(command):
+    assert command_tokens(command) is None
+    assert _policy().decide_command(command) == "ask"
+
+
+def test_unrelated_commands_are_undecided():
+    policy = _policy()
+    assert policy.decide_command("git statusx") is None
+    assert policy.decide_command("rm -rf /") is None
+    assert policy.decide_command(None) is None
+    assert policy.decide_command("") is None
+
+
+@pytest.mark.parametrize("command", ["git status 'unterminated", "ls $(cat list)", "(ls)", "diff <(ls a) <(ls b)"])
+def test_unparsable_commands_must_be_asked(command):
+    assert _policy().decide_command(command) == "ask"
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "true && rm -rf /",
+        "ls; rm -rf /",
+        "ls | xargs rm -rf",
+        "ls\nrm -rf /",
+        "git status#; rm -rf /",
+        "sudo rm -rf /",
+        "env X=1 /bin/rm -rf /",
+        ["bash", "-lc", "echo; rm -rf /"],
+        ["sh", "-c", "rm -rf /", "arg0"],
+        "bash -lc 'bash -c \"rm -rf /\"'",
+        "git -C /x push --force",
+        "git --git-dir=/x/.git push",
+        "git -c user.name=x push",
+        "true && git -C /x push",
+    ],
+)
+def test_denylisted_commands_are_declined_wherever_they_run(command):
+    policy = _policy(default="accept", command_allowlist=["git", "ls"], command_denylist=["rm", "git push"])
+    assert policy.decide_command(command) == "decline"
+
+
+def test_quoted_operators_are_arguments():
+    policy = _policy(command_allowlist=["git commit"])
+    assert policy.decide_command("git commit -m 'fix a && b; c | d'") == "accept"
+    assert command_tokens("git commit -m 'a && b'") == ("git", "commit", "-m", "a && b")
+
+
+def test_chained_allowlisted_commands_are_not_accepted():
+    assert _policy().decide_command("git status && ls") == "ask"
+    assert _policy().decide_command("git status > out.txt") == "ask"
+
+
+# -- writable roots ---------------------------------------------------------
+
+
+def test_file_changes_inside_writable_roots_are_accepted():
+    policy = _policy(writable_roots=["/work/repo"])
+    assert policy.decide_file_change(["src/a.py", "/work/repo/b.py"], "/work/repo") == "accept"
+    assert policy.decide_file_change(["sub/../c.py"], "/work/repo") == "accept"
+
+
+@pytest.mark.parametrize(
+    "paths, cwd",
+    [
+        (["../outside.py"], "/work/repo"),
+        (["src/../../outside.py"], "/work/repo"),
+        (["/work/repo/../repo2/x.py"], None),
+        (["/work/repository/x.py"], None),
+        (["src/a.py", "/etc/passwd"], "/work/repo"),
+    ],
+)
+def test_file_changes_escaping_writable_roots_are_undecided(paths, cwd):
+    policy = _policy(writable_roots=["/work/repo"])
+    assert policy.decide_file_change(paths, cwd) is None
+
+
+def test_file_changes_without_roots_are_undecided():
+    assert _policy().decide_file_change(["a.py"], "/work") is None
+
+
+# -- engine -----------------------------------------------------------------
+
+
+def test_thread_policy_overrides_global_policy():
+    engine = ApprovalEngine(_policy(default="decline"))
+    engine.set_thread_policy("thr_1", default="accept", command_allowlist=["make"])
+
+    command = {"threadId": "thr_1", "itemId": "it_1", "command": "make test"}
+    assert engine._on_command_approval(command) == {"decision": "accept"}
+    # Fields not overridden come from the global policy
+    assert engine._on_command_approval(dict(command, command="git push")) == {"decision": "decline"}
+    assert engine._on_command_approval(dict(command, command="rm x")) == {"decision": "accept"}
+    assert engine._on_command_approval(dict(command, threadId="thr_2")) == {"decision": "decline"}
+
+    assert engine.clear_thread_policy("thr_1")
+    assert engine._on_command_approval(command) == {"decision": "decline"}
+
+
+def test_file_change_paths_come_from_the_started_item():
+    engine = ApprovalEngine(_policy(writable_roots=["/work"]))
+    engine._on_item_started(
+        {"item": {"type": "fileChange", "id": "it_1", "changes": [{"path": "/work/a.py"}]}}
+    )
+    assert engine._on_file_change_approval({"threadId": "thr_1", "itemId": "it_1"}) == {"decision": "accept"}
+
+
+def test_chained_commands_are_declined_under_accept_default():
+    engine = ApprovalEngine(_policy(default="accept", command_denylist=["rm"]))
+    assert engine._on_command_approval({"threadId": "thr_1", "command": "make && make install"}) == {
+        "decision": "decline"
+    }
+    assert engine._on_command_approval({"threadId": "thr_1", "command": "true && rm -rf /"}) == {"decision": "decline"}
+    assert engine._on_command_approval({"threadId": "thr_1", "command": "make"}) == {"decision": "accept"}
+
+
+def test_chained_commands_are_asked_of_an_attached_client():
+    async def scenario():
+        engine = ApprovalEngine(_policy(default="accept"))
+        events: list[dict] = []
+        engine.add_asker("thr_1", events.append)
+
+        pending = asyncio.ensure_future(
+            engine._on_command_approval({"threadId": "thr_1", "command": "make && make install"})
+        )
+        await asyncio.sleep(0)
+        assert len(events) == 1
+        engine.resolve(events[0]["approvalId"], {"decision": "accept"})
+        assert await pending == {"decision": "accept"}
+
+    asyncio.run(scenario())
+
+
+def test_ask_default_declines_without_a_client():
+    engine = ApprovalEngine(_policy(default="ask"))
+    assert engine._on_command_approval({"threadId": "thr_1", "command": "rm x"}) == {"decision": "decline"}
+
+
+def test_client_answer_is_returned():
+    async def scenario():
+        engine = ApprovalEngine(_policy(default="ask"))
+        events: list[dict] = []
+        engine.add_asker("thr_1", events.append)
+
+        pending = asyncio.ensure_future(engine._on_command_approval({"threadId": "thr_1", "command": "rm x"}))
+        await asyncio.sleep(0)
+        assert engine.resolve(events[0]["approvalId"], {"decision": "accept"})
+        assert await pending == {"decision": "accept"}
+        assert engine.pending() == []
+
+    asyncio.run(scenario())
+
+
+def test_unanswered_request_is_declined_on_timeout():
+    async def scenario():
+        engine = ApprovalEngine(_policy(default="ask"), ask_timeout=0.01)
+        events: list[dict] = []
+        engine.add_asker("thr_1", events.append)
+
+        answer = await engine._on_command_approval({"threadId": "thr_1", "command": "rm x"})
+        assert answer == {"decision": "decline"}
+        assert len(events) == 1
+        assert engine.pending() == []
+        assert not engine.resolve(events[0]["approvalId"], {"decision": "accept"})
+
+    asyncio.run(scenario())
+
+
+def test_unanswered_request_is_declined_when_client_goes_away():
+    async def scenario():
+        engine = ApprovalEngine(_policy(default="ask"))
+        events: list[dict] = []
+        engine.add_asker("thr_1", events.append)
+
+        pending = asyncio.ensure_future(engine._on_command_approval({"threadId": "thr_1", "command": "rm x"}))
+        await asyncio.sleep(0)
+        assert len(engine.pending("thr_1")) == 1
+        engine.remove_asker("thr_1", events.append)
+        assert await asyncio.wait_for(pending, timeout=1) == {"decision": "decline"}
+        assert engine.pending() == []
+
+    asyncio.run(scenario())
+
+
+# -- server requests --------------------------------------------------------
+
+
+def test_unhandled_server_request_answers_method_not_found():
+    async def scenario():
+        process = RecordingProcess()
+        client = JsonRpcClient(process)
+        ApprovalEngine(_policy()).attach(client)
+
+        await client._handle_message({"id": 7, "method": "item/unknown/request", "params": {}})
+        assert process.sent == [
+            {"id": 7, "error": {"code": METHOD_NOT_FOUND, "message": "Bridge does not handle item/unknown/request"}}
+        ]
+        assert METHOD_NOT_FOUND == -32601
+
+    asyncio.run(scenario())
+
+
+def test_attached_engine_answers_approval_requests():
+    async def scenario():
+        process = RecordingProcess()
+        client = JsonRpcClient(process)
+        ApprovalEngine(_policy()).attach(client)
+
+        await client._handle_message(
+            {"id": 1, "method": COMMAND_APPROVAL, "params": {"threadId": "thr_1", "command": "git status"}}
+        )
+        await client._handle_message(
+            {"id": 2, "method": COMMAND_APPROVAL, "params": {"threadId": "thr_1", "command": "git status | sh"}}
+        )
+        await client._handle_message({"id": 3, "method": FILE_CHANGE_APPROVAL, "params": {"threadId": "thr_1"}})
+        assert process.sent == [
+            {"id": 1, "result": {"decision": "accept"}},
+            {"id": 2, "result": {"decision": "decline"}},
+            {"id": 3, "result": {"decision": "decline"}},
+        ]
+
+    asyncio.run(scenario())
@@ -0,0 +1,41 @@
+import asyncio
+
+from app.core.coalesce import DeltaCoalescer
+
+
+def delta(text: str) -> dict:
+    return {"threadId": "thr_1", "turnId": "turn_1", "itemId": "item_1", "delta": text}
+
+
+def test_max_bytes_counts_utf8_bytes():
+    async def scenario():
+        emitted = []
+        coalescer = DeltaCoalescer(lambda method, params: emitted.append(params["delta"]), window=60, max_bytes=8)
+
+        # Three characters but nine bytes
+        coalescer.push("item/agentMessage/delta", delta("日本語"))
+        assert emitted == ["日本語"]
+
+        for text in ("abc", "def"):
+            coalescer.push("item/agentMessage/delta", delta(text))
+        assert emitted == ["日本語"]
+        coalescer.push("item/agentMessage/delta", delta("gh"))
+        assert emitted == ["日本語", "abcdefgh"]
+        coalescer.close()
+
+    asyncio.run(scenario())
+
+
+def test_other_notification_flushes_the_run_first():
+    async def scenario():
+        emitted = []
+        coalescer = DeltaCoalescer(lambda method, params: emitted.append(method), window=60)
+
+        coalescer.push("item/agentMessage/delta", delta("a"))
+        coalescer.push("item/agentMessage/delta", delta("b"))
+        coalescer.push("item/completed", {"threadId": "thr_1", "item": {"id": "item_1"}})
+
+        assert emitted == ["item/agentMessage/delta", "item/completed"]
+        assert coalescer.stats()["deltas_in"] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.core.event_store import EventStore
+
+TEXTS = ["Running the migration now", "100% done", "a_b test", "abc test", "Go to it"]
+
+
+async def _filled_store(path: str) -> EventStore:
+    store = EventStore(path, flush_interval=0.01)
+    await store.start()
+    for index, text in enumerate(TEXTS):
+        store._on_item_completed(
+            {"threadId": "thr_1", "turnId": "turn_1", "item": {"id": f"item_{index}", "type": "agentMessage", "text": text}}
+        )
+    await store._flush()
+    return store
+
+
+async def _texts(store: EventStore, query: str) -> list[str]:
+    return [row["item"]["text"] for row in await store.search(query)]
+
+
+@pytest.mark.parametrize("fts", [True, False])
+def test_search_matches_substrings(tmp_path, fts):
+    async def scenario():
+        store = await _filled_store(str(tmp_path / "events.db"))
+        store.fts = store.fts and fts
+        try:
+            assert await _texts(store, "migrat") == ["Running the migration now"]
+            assert await _texts(store, "MIGRATION running") == ["Running the migration now"]
+            assert await _texts(store, "100%") == ["100% done"]
+            assert await _texts(store, "a_b") == ["a_b test"]
+            assert await _texts(store, "go it") == ["Go to it"]
+            assert await _texts(store, "test ab") == ["abc test"]
+            with pytest.raises(ValueError):
+                await store.search("   ")
+        finally:
+            await store.stop()
+
+    asyncio.run(scenario())
+
+
+def test_word_tokenized_index_is_rebuilt(tmp_path):
+    path = str(tmp_path / "events.db")
+
+    async def fill():
+        store = await _filled_store(path)
+        await store.stop()
+
+    asyncio.run(fill())
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "DROP TABLE items_fts;"
+        "CREATE VIRTUAL TABLE items_fts USING fts5 (text, content='items', content_rowid='seq');"
+        "INSERT INTO items_fts (items_fts) VALUES ('rebuild');"
+    )
+    conn.close()
+
+    async def reopen():
+        store = EventStore(path)
+        await store.start()
+        try:
+            assert store.fts
+            assert await _texts(store, "migrat") == ["Running the migration now"]
+        finally:
+            await store.stop()
+
+    asyncio.run(reopen())
@@ -0,0 +1,43 @@
+import asyncio
+
+from app.core.method_cache import MethodCache
+
+
+def test_callers_get_independent_copies():
+    async def scenario():
+        cache = MethodCache({"model/list": 60})
+        calls = 0
+
+        async def fetch() -> dict:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"data": [{"id": "gpt-5"}]}
+
+        first, second = await asyncio.gather(
+            cache.call("model/list", {}, fetch),
+            cache.call("model/list", {}, fetch),
+        )
+        first["data"].append({"id": "mutated"})
+        third = await cache.call("model/list", {}, fetch)
+
+        assert calls == 1
+        assert second == third == {"data": [{"id": "gpt-5"}]}
+
+    asyncio.run(scenario())
+
+
+def test_invalidate_drops_cached_results():
+    async def scenario():
+        cache = MethodCache({"config/read": 60})
+        results = iter([{"value": 1}, {"value": 2}])
+
+        async def fetch() -> dict:
+            return next(results)
+
+        assert await cache.call("config/read", {}, fetch) == {"value": 1}
+        assert await cache.call("config/read", {}, fetch) == {"value": 1}
+        cache.invalidate("config/read")
+        assert await cache.call("config/read", {}, fetch) == {"value": 2}
+
+    asyncio.run(scenario())
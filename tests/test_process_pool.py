@@ -0,0 +1,245 @@
+import asyncio
+import itertools
+from typing import Callable, Optional
+
+import pytest
+
+from app.core.admission import ThreadBusyError, ThreadTurnQueue
+from app.core.process_pool import ProcessPool
+from app.core.tenants import TenantPolicy, TenantScheduler
+
+
+class ScriptedClient:
+    """Stands in for a member's JsonRpcClient.
+
+    ``turn/start`` answers with a new turn id, or raises ``error`` if set;
+    ``before_response(turn_id)`` runs first, e.g. to deliver turn/completed
+    ahead of the response. Notifications dispatched by the pool go to
+    ``handlers`` by method.
+    """
+
+    def __init__(self):
+        self.calls: list[tuple[str, dict]] = []
+        self.before_response: Optional[Callable[[str], None]] = None
+        self.delay = 0.0
+        self.error: Optional[Exception] = None
+        self.handlers: dict[str, Callable[[dict], None]] = {}
+        self.notifications: list[tuple[str, dict]] = []
+        self.is_closed = False
+        self._ids = itertools.count(1)
+
+    async def call(self, method: str, params: dict, timeout: float = 300.0) -> dict:
+        self.calls.append((method, params))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if method == "turn/start":
+            if self.error is not None:
+                raise self.error
+            turn_id = f"turn_{next(self._ids)}"
+            if self.before_response is not None:
+                self.before_response(turn_id)
+            return {"turn": {"id": turn_id, "status": "inProgress", "items": []}}
+        if method == "turn/interrupt":
+            return {}
+        return {"thread": {"id": params.get("threadId", "thr_1")}}
+
+    async def dispatch_notification(self, method: str, params: dict) -> None:
+        self.notifications.append((method, params))
+        handler = self.handlers.get(method)
+        if handler is not None:
+            handler(params)
+
+
+def make_pool() -> tuple[ProcessPool, ScriptedClient, Callable[[dict], None]]:
+    pool = ProcessPool(size=1)
+    member = pool.members[0]
+    client = ScriptedClient()
+    member.client = client
+    return pool, client, pool._make_turn_completed_handler(member)
+
+
+def make_gated_pool() -> tuple[ProcessPool, ScriptedClient, Callable[[dict], None], ThreadTurnQueue, TenantScheduler]:
+    pool, client, on_completed = make_pool()
+    queue = ThreadTurnQueue(max_queued=4, hold_timeout=60)
+    scheduler = TenantScheduler(TenantPolicy(), max_running=1)
+    pool.set_turn_queue(queue)
+    pool.set_tenant_scheduler(scheduler)
+    return pool, client, on_completed, queue, scheduler
+
+
+def completed(thread_id: str, turn_id: str, status: str = "completed") -> dict:
+    return {"threadId": thread_id, "turn": {"id": turn_id, "status": status, "items": []}}
+
+
+def test_turn_completed_before_response_is_not_counted_as_running():
+    async def scenario():
+        pool, client, on_completed = make_pool()
+        client.before_response = lambda turn_id: on_completed(completed("thr_1", turn_id))
+
+        for _ in range(20):
+            await pool.call("turn/start", {"threadId": "thr_1", "input": []})
+
+        member = pool.members[0]
+        assert member.active_turns == {}
+        assert member.load == 0
+
+    asyncio.run(scenario())
+
+
+def test_turn_completed_after_response_ends_the_turn():
+    async def scenario():
+        pool, client, on_completed = make_pool()
+        result = await pool.call("turn/start", {"threadId": "thr_1", "input": []})
+        turn_id = result["turn"]["id"]
+        member = pool.members[0]
+        assert member.active_turns == {turn_id: "thr_1"}
+
+        on_completed(completed("thr_1", turn_id))
+        assert member.active_turns == {}
+
+    asyncio.run(scenario())
+
+
+def test_turn_started_after_caller_timeout_is_interrupted():
+    async def scenario():
+        pool, client, _ = make_pool()
+        pool.set_turn_queue(ThreadTurnQueue(max_queued=4, hold_timeout=60))
+        client.delay = 0.05
+
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.call("turn/start", {"threadId": "thr_1", "input": []}, timeout=0.01)
+        await asyncio.sleep(0.2)
+
+        assert [method for method, _ in client.calls] == ["turn/start", "turn/interrupt"]
+        assert client.calls[1][1] == {"threadId": "thr_1", "turnId": "turn_1"}
+
+    asyncio.run(scenario())
+
+
+def test_failed_turn_start_releases_thread_and_tenant_slots():
+    async def scenario():
+        pool, client, _, queue, scheduler = make_gated_pool()
+        client.error = RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await pool.call("turn/start", {"threadId": "thr_1", "input": []})
+
+        assert queue.state("thr_1") is None
+        assert scheduler.stats()["running"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_turn_start_outliving_the_caller_holds_slots_until_completed():
+    async def scenario():
+        pool, client, on_completed, queue, scheduler = make_gated_pool()
+        client.delay = 0.05
+
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.call("turn/start", {"threadId": "thr_1", "input": []}, timeout=0.01)
+        # Still sending: the slots stay taken
+        assert queue.state("thr_1") is not None
+        assert scheduler.stats()["running"] == 1
+
+        await asyncio.sleep(0.1)
+        assert queue.state("thr_1")["turn_id"] == "turn_1"
+        assert scheduler.stats()["running"] == 1
+
+        on_completed(completed("thr_1", "turn_1", "interrupted"))
+        assert queue.state("thr_1") is None
+        assert scheduler.stats()["running"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_interrupts_the_started_turn():
+    async def scenario():
+        pool, client, _, queue, _ = make_gated_pool()
+        client.delay = 0.05
+
+        call = asyncio.ensure_future(pool.call("turn/start", {"threadId": "thr_1", "input": []}))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        await asyncio.sleep(0.1)
+
+        assert [method for method, _ in client.calls] == ["turn/start", "turn/interrupt"]
+        assert client.calls[1][1] == {"threadId": "thr_1", "turnId": "turn_1"}
+        assert queue.state("thr_1")["turn_id"] == "turn_1"
+
+    asyncio.run(scenario())
+
+
+def test_timeout_behind_a_running_turn_sends_nothing():
+    async def scenario():
+        pool, client, _, queue, scheduler = make_gated_pool()
+        await pool.call("turn/start", {"threadId": "thr_1", "input": []})
+
+        with pytest.raises(ThreadBusyError):
+            await pool.call("turn/start", {"threadId": "thr_1", "input": []}, timeout=0.01)
+
+        assert [method for method, _ in client.calls] == ["turn/start"]
+        state = queue.state("thr_1")
+        assert (state["turn_id"], state["queued"]) == ("turn_1", [])
+        assert scheduler.stats()["running"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_queued_turn_starts_once_the_running_one_completes():
+    async def scenario():
+        pool, client, on_completed, queue, _ = make_gated_pool()
+        await pool.call("turn/start", {"threadId": "thr_1", "input": []})
+        second = asyncio.ensure_future(pool.call("turn/start", {"threadId": "thr_1", "input": []}))
+        await asyncio.sleep(0.01)
+        assert not second.done()
+
+        on_completed(completed("thr_1", "turn_1"))
+        result = await asyncio.wait_for(second, timeout=1)
+
+        assert result["turn"]["id"] == "turn_2"
+        assert queue.state("thr_1")["turn_id"] == "turn_2"
+
+    asyncio.run(scenario())
+
+
+def test_restart_fails_running_turns_and_frees_their_slots(monkeypatch):
+    async def scenario():
+        pool, client, on_completed, queue, scheduler = make_gated_pool()
+        client.handlers["turn/completed"] = on_completed
+        member = pool.members[0]
+
+        async def failover(member) -> bool:
+            return True
+
+        async def resume_threads(member) -> None:
+            pass
+
+        monkeypatch.setattr(pool, "_failover", failover)
+        monkeypatch.setattr(pool, "_resume_threads", resume_threads)
+
+        await pool.call("turn/start", {"threadId": "thr_1", "input": []})
+        member.restarting = True
+        await pool._restart_member(member, "exited")
+
+        assert client.notifications == [
+            (
+                "turn/completed",
+                {
+                    "threadId": "thr_1",
+                    "turn": {
+                        "id": "turn_1",
+                        "status": "failed",
+                        "items": [],
+                        "error": {"message": "App-server process exited"},
+                    },
+                },
+            )
+        ]
+        assert member.active_turns == {}
+        assert not member.restarting
+        assert queue.state("thr_1") is None
+        assert scheduler.stats()["running"] == 0
+
+    asyncio.run(scenario())
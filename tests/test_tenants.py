@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+from app.core.tenants import TenantLimitError, TenantPolicy, TenantResolver, TenantScheduler
+
+
+async def settle() -> None:
+    """Let woken waiters run past their wait_for/shield wrappers."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_backlogged_tenant_does_not_starve_others():
+    async def scenario():
+        scheduler = TenantScheduler(TenantPolicy(), max_running=1)
+        await scheduler.acquire("a")
+        admitted = []
+
+        async def turn(name: str) -> None:
+            await scheduler.acquire(name)
+            admitted.append(name)
+            await asyncio.sleep(0)
+            scheduler.release(name)
+
+        tasks = [asyncio.ensure_future(turn("a")) for _ in range(3)]
+        await settle()
+        tasks += [asyncio.ensure_future(turn("b")) for _ in range(3)]
+        await settle()
+
+        scheduler.release("a")
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+
+        assert admitted == ["b", "a", "b", "a", "b", "a"]
+        assert scheduler.stats()["running"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_weight_sets_the_share_of_admissions():
+    async def scenario():
+        scheduler = TenantScheduler(
+            TenantPolicy(),
+            policies={"heavy": TenantPolicy(weight=2.0)},
+            max_running=1,
+        )
+        await scheduler.acquire("light")
+        admitted = []
+
+        async def turn(name: str) -> None:
+            await scheduler.acquire(name)
+            admitted.append(name)
+            await asyncio.sleep(0)
+            scheduler.release(name)
+
+        tasks = [asyncio.ensure_future(turn(name)) for name in ["heavy"] * 4 + ["light"] * 2]
+        await settle()
+
+        scheduler.release("light")
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+
+        assert admitted[:3].count("heavy") == 2
+        assert sorted(admitted) == ["heavy"] * 4 + ["light"] * 2
+
+    asyncio.run(scenario())
+
+
+def test_over_rate_is_rejected_with_retry_after():
+    async def scenario():
+        scheduler = TenantScheduler(TenantPolicy(rate=1.0, burst=2))
+        await scheduler.acquire("a")
+        await scheduler.acquire("a")
+
+        with pytest.raises(TenantLimitError) as e:
+            await scheduler.acquire("a")
+        assert 0 < e.value.retry_after <= 1.0
+        assert scheduler.stats()["tenants"]["a"]["rejected"] == 1
+
+        # Another tenant has its own bucket
+        assert await scheduler.acquire("b") == 0.0
+
+    asyncio.run(scenario())
+
+
+def test_full_tenant_queue_is_rejected():
+    async def scenario():
+        scheduler = TenantScheduler(TenantPolicy(max_running=1, max_queued=1))
+        await scheduler.acquire("a")
+        waiting = asyncio.ensure_future(scheduler.acquire("a"))
+        await settle()
+
+        with pytest.raises(TenantLimitError) as e:
+            await scheduler.acquire("a")
+        assert e.value.retry_after is None
+
+        scheduler.release("a")
+        await asyncio.wait_for(waiting, timeout=1)
+
+    asyncio.run(scenario())
+
+
+def test_timed_out_waiter_leaves_the_queue():
+    async def scenario():
+        scheduler = TenantScheduler(TenantPolicy(), max_running=1)
+        await scheduler.acquire("a")
+
+        with pytest.raises(TenantLimitError):
+            await scheduler.acquire("b", timeout=0.01)
+        assert scheduler.stats()["queued"] == 0
+
+        scheduler.release("a")
+        assert scheduler.stats()["running"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_waiter_admitted_as_it_is_cancelled_hands_the_slot_on():
+    async def scenario():
+        scheduler = TenantScheduler(TenantPolicy(), max_running=1)
+        await scheduler.acquire("a")
+        first = asyncio.ensure_future(scheduler.acquire("b"))
+        second = asyncio.ensure_future(scheduler.acquire("c"))
+        await settle()
+
+        scheduler.release("a")
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.wait_for(second, timeout=1)
+
+        stats = scheduler.stats()
+        assert stats["running"] == 1
+        assert stats["tenants"]["c"]["running"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_completion_before_bind_frees_the_slot():
+    async def scenario():
+        scheduler = TenantScheduler(TenantPolicy(), max_running=1)
+        await scheduler.acquire("a")
+        scheduler.turn_completed("turn_1")
+        scheduler.bind("a", "turn_1")
+
+        assert scheduler.stats()["running"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_is_released_after_hold_timeout():
+    async def scenario():
+        scheduler = TenantScheduler(TenantPolicy(), max_running=1, hold_timeout=0.01)
+        await scheduler.acquire("a")
+        scheduler.bind("a", "turn_1")
+
+        waited = await asyncio.wait_for(scheduler.acquire("b"), timeout=1)
+        assert waited > 0
+
+    asyncio.run(scenario())
+
+
+def test_resolver_prefers_mapped_api_key():
+    resolver = TenantResolver(header="X-Tenant-Id", api_keys={"k1": "acme"})
+
+    assert resolver.resolve([(b"x-tenant-id", b"other"), (b"x-api-key", b"k1")]) == "acme"
+    assert resolver.resolve([(b"authorization", b"Bearer k1")]) == "acme"
+    assert resolver.resolve([(b"x-tenant-id", b"other"), (b"x-api-key", b"unknown")]) == "other"
+    assert resolver.resolve([]) == "default"
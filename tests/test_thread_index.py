@@ -0,0 +1,67 @@
+from app.core.thread_index import ThreadIndex
+
+
+def make_index(threads: list[tuple[str, int, object, bool]]) -> ThreadIndex:
+    index = ThreadIndex(client=None)
+    for thread_id, created, source, archived in threads:
+        thread = {"id": thread_id, "createdAt": created}
+        if source is not None:
+            thread["source"] = source
+        index.upsert(thread, archived=archived)
+    return index
+
+
+def ids(page: list[dict]) -> list[str]:
+    return [thread["id"] for thread in page]
+
+
+def test_default_lists_interactive_sources_only():
+    index = make_index(
+        [
+            ("cli_1", 1, "cli", False),
+            ("vscode_1", 2, "vscode", False),
+            ("exec_1", 3, "exec", False),
+            ("review_1", 4, {"subAgent": "review"}, False),
+        ]
+    )
+    assert ids(index.list()[0]) == ["vscode_1", "cli_1"]
+    assert ids(index.list(source_kinds=["exec", "subAgent"])[0]) == ["review_1", "exec_1"]
+
+
+def test_bridge_started_threads_without_source_are_listed():
+    index = make_index([("cli_1", 1, "cli", False)])
+    index._on_thread_started({"thread": {"id": "started_1", "createdAt": 2}})
+    index._on_thread_result({}, {"thread": {"id": "forked_1", "createdAt": 3}})
+    # A result without source keeps the kind of a known thread
+    index._on_thread_result({}, {"thread": {"id": "cli_1", "createdAt": 1}})
+
+    page, _ = index.list()
+    assert ids(page) == ["forked_1", "started_1", "cli_1"]
+    assert [thread["sourceKind"] for thread in page] == ["vscode", "vscode", "cli"]
+
+
+def test_pages_merge_kinds_in_created_order():
+    threads = [(f"t{n:03d}", n, ("cli", "vscode", "exec")[n % 3], n % 5 == 0) for n in range(100)]
+    index = make_index(threads)
+    expected = [t[0] for t in sorted(threads, key=lambda t: -t[1]) if t[2] != "exec" and not t[3]]
+
+    listed, cursor = [], None
+    while True:
+        page, cursor = index.list(cursor=cursor, limit=7)
+        listed.extend(ids(page))
+        if cursor is None:
+            break
+    assert listed == expected
+
+
+def test_archiving_moves_a_thread_between_listings():
+    index = make_index([("a", 1, "cli", False), ("b", 2, "cli", False)])
+    index._on_archived({"threadId": "a"}, {})
+    assert ids(index.list()[0]) == ["b"]
+    assert ids(index.list(archived=True)[0]) == ["a"]
+
+
+def test_created_range_filters():
+    index = make_index([(f"t{n}", n, "cli", False) for n in range(10)])
+    page, _ = index.list(created_after=3, created_before=6)
+    assert ids(page) == ["t5", "t4", "t3"]